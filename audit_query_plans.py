@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Query plan audit for the issue listing filters.
+
+Builds the query the routes would run for every combination of filters (up to
+--max-filters at a time) and every listing sort order, runs EXPLAIN on it and
+flags full table scans and filesorts. Works on MySQL (EXPLAIN) and SQLite
+(EXPLAIN QUERY PLAN). Filter values are taken from the data where possible so
+the optimizer sees realistic selectivity. The summary lists the secondary
+indexes on issues that no audited query used; those are candidates to drop.
+"""
+
+import sys
+import os
+import argparse
+import re
+from itertools import combinations
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app import app, db
+from models import Issue, IssueTestCase, Tag
+from routes import ISSUE_SORT_KEYS, filter_issues
+
+# Filters the listing routes combine, with the column a sample value is taken from
+FILTER_COLUMNS = {
+    'status': Issue.status,
+    'severity': Issue.severity,
+    'release': Issue.release,
+    'platform': Issue.platform,
+    'build': Issue.build,
+    'target': Issue.target,
+    'reporter_name': Issue.reporter_name,
+    'test_case_id': IssueTestCase.test_case_id,
+    'tags': Tag.name,
+}
+
+def sample_values():
+    """Most common value of each filter column (a placeholder when the table is empty)"""
+    values = {}
+    for name, column in FILTER_COLUMNS.items():
+        row = db.session.query(column, db.func.count()).filter(column.isnot(None)).group_by(column).order_by(
+            db.func.count().desc()
+        ).first()
+        values[name] = str(row[0]) if row else 'x'
+    return values
+
+# Index name in an SQLite plan line, e.g. "SEARCH issues USING INDEX ix_issues_status_created_at (status=?)"
+SQLITE_INDEX = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+
+def issue_indexes():
+    """Names of the secondary indexes on the issues table"""
+    return {index['name'] for index in db.inspect(db.engine).get_indexes('issues')}
+
+def explain(query, filtered):
+    """
+    Return (plan rows, problems, index names used) for an ORM query;
+    an unfiltered primary key walk is not a problem
+    """
+    compiled = query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    connection = db.session.connection()
+    
+    if db.engine.dialect.name == 'mysql':
+        rows = connection.exec_driver_sql('EXPLAIN ' + str(compiled), params).mappings().all()
+        problems = []
+        for row in rows:
+            if row['type'] == 'ALL' and filtered:
+                problems.append(f"full scan of {row['table']} (~{row['rows']} rows)")
+            if 'filesort' in (row['Extra'] or ''):
+                problems.append(f"filesort on {row['table']}")
+        plan = [f"{row['table']}: {row['type']} via {row['key'] or '-'} (~{row['rows']} rows) {row['Extra'] or ''}".strip() for row in rows]
+        used = {name for row in rows if row['key'] for name in row['key'].split(',')}  # index_merge lists several
+        return plan, problems, used
+    
+    rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compiled), params).all()
+    plan = [row[-1] for row in rows]
+    problems = []
+    for detail in plan:
+        if detail.startswith('SCAN ') and 'USING' not in detail and 'CONSTANT' not in detail and filtered:
+            problems.append(f'full scan ({detail})')
+        if 'TEMP B-TREE FOR ORDER BY' in detail:
+            problems.append('filesort (temp b-tree for ORDER BY)')
+    used = {match for detail in plan for match in SQLITE_INDEX.findall(detail)}
+    return plan, problems, used
+
+def audit(max_filters, show_all):
+    with app.app_context():
+        values = sample_values()
+        orders = {sort: [column.desc() for column in columns] for sort, columns in ISSUE_SORT_KEYS.items()}
+        orders['id'] = [Issue.id]  # /api/admin/issues/ids
+        
+        checked = flagged = 0
+        used = set()
+        for size in range(0, max_filters + 1):
+            for names in combinations(FILTER_COLUMNS, size):
+                filters = {name: values[name] for name in names}
+                for sort, order_by in orders.items():
+                    query = filter_issues(Issue.query, filters)
+                    if sort == 'id':
+                        query = query.with_entities(Issue.id).order_by(*order_by)  # streamed whole, as the route does
+                    else:
+                        query = query.order_by(*order_by).limit(10)
+                    plan, problems, indexes = explain(query, bool(filters))
+                    used |= indexes
+                    checked += 1
+                    if problems:
+                        flagged += 1
+                    if problems or show_all:
+                        label = ', '.join(f'{name}={value!r}' for name, value in filters.items()) or '(no filters)'
+                        print(f"{'⚠️ ' if problems else '✅'} {label} | sort={sort}")
+                        for line in plan:
+                            print(f"      {line}")
+                        for problem in problems:
+                            print(f"      -> {problem}")
+        
+        print(f"\nChecked {checked} query shapes, {flagged} with full scans or filesorts.")
+        unused = sorted(issue_indexes() - used)
+        if unused:
+            print(f"Indexes on issues not used by any audited query: {', '.join(unused)}")
+        return flagged
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN every issue filter combination and flag scans/filesorts")
+    parser.add_argument('--max-filters', type=int, default=2, help='largest number of filters combined')
+    parser.add_argument('--all', action='store_true', help='print plans without problems too')
+    parser.add_argument('--strict', action='store_true', help='exit with status 1 when anything is flagged')
+    args = parser.parse_args()
+    
+    print("Auditing query plans for issue filters...")
+    print("=" * 60)
+    flagged = audit(args.max_filters, args.all)
+    sys.exit(1 if flagged and args.strict else 0)
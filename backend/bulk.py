@@ -0,0 +1,138 @@
+"""
+Set-based bulk operations on issues.
+
+Every operation works on one chunk of issue IDs at a time with plain
+UPDATE/DELETE statements and commits per chunk, instead of loading the issues
+into the session. Deleted issues take their comments, attachments, tag links
+and test case rows with them through ON DELETE CASCADE; attachment files are
+removed afterwards by a background AttachmentSweeper, so the request never
+waits on the filesystem. jobs.py runs these chunk functions in the background.
+"""
+
+import logging
+import os
+import queue
+import threading
+from app import app, db
+from models import Issue, Comment, Attachment, Vote, IssueTag, Tag
+from cache import invalidate, issue_tag
+from indexing import enqueue
+from tags import resolve_tag_ids
+
+logger = logging.getLogger(__name__)
+
+class AttachmentSweeper(threading.Thread):
+    """Background thread deleting attachment files of removed issues"""
+    
+    def __init__(self):
+        super().__init__(name='attachment-sweeper', daemon=True)
+        self.paths = queue.Queue()
+    
+    def submit(self, file_paths):
+        for file_path in file_paths:
+            self.paths.put(file_path)
+    
+    def run(self):
+        while True:
+            file_path = self.paths.get()
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.exception('Could not remove attachment file %s', file_path)
+            finally:
+                self.paths.task_done()
+
+_sweeper = None
+_sweeper_lock = threading.Lock()
+
+def get_attachment_sweeper():
+    global _sweeper
+    if _sweeper is None:
+        with _sweeper_lock:
+            if _sweeper is None:
+                _sweeper = AttachmentSweeper()
+                _sweeper.start()
+    return _sweeper
+
+def _reset_after_fork():
+    global _sweeper, _sweeper_lock
+    _sweeper = None
+    _sweeper_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def chunked(issue_ids, chunk_size=None):
+    """Split issue IDs into sorted, de-duplicated chunks of BULK_CHUNK_SIZE"""
+    chunk_size = chunk_size or app.config.get('BULK_CHUNK_SIZE', 1000)
+    issue_ids = sorted({int(issue_id) for issue_id in issue_ids})
+    return [issue_ids[start:start + chunk_size] for start in range(0, len(issue_ids), chunk_size)]
+
+def delete_chunk(issue_ids):
+    """Delete one chunk of issues and commit; returns the number of issues deleted"""
+    file_paths = [
+        file_path for file_path, in
+        db.session.query(Attachment.file_path).filter(Attachment.issue_id.in_(issue_ids))
+    ]
+    
+    # The vote ledger has no foreign keys (targets live in two tables)
+    comment_ids = db.select(Comment.id).where(Comment.issue_id.in_(issue_ids))
+    Vote.query.filter(db.or_(
+        db.and_(Vote.target_type == 'issue', Vote.target_id.in_(issue_ids)),
+        db.and_(Vote.target_type == 'comment', Vote.target_id.in_(comment_ids))
+    )).delete(synchronize_session=False)
+    
+    deleted = Issue.query.filter(Issue.id.in_(issue_ids)).delete(synchronize_session=False)
+    enqueue(issue_ids, 'delete')
+    db.session.commit()
+    
+    invalidate(*[issue_tag(issue_id) for issue_id in issue_ids])
+    get_attachment_sweeper().submit(file_paths)
+    return deleted
+
+def delete_issues(issue_ids, chunk_size=None):
+    """Delete issues chunk by chunk; returns the number of issues deleted"""
+    deleted = 0
+    try:
+        for chunk in chunked(issue_ids, chunk_size):
+            deleted += delete_chunk(chunk)
+    finally:
+        invalidate('issues', 'tags')
+    return deleted
+
+def update_chunk(issue_ids, values):
+    """Apply column `values` to one chunk of issues and commit; returns the number of issues updated"""
+    values = dict(values, version=Issue.version + 1)
+    updated = Issue.query.filter(Issue.id.in_(issue_ids)).update(values, synchronize_session=False)
+    enqueue(issue_ids, 'index')
+    db.session.commit()
+    invalidate(*[issue_tag(issue_id) for issue_id in issue_ids])
+    return updated
+
+def status_chunk(issue_ids, status):
+    return update_chunk(issue_ids, {'status': status})
+
+def move_to_ccr_chunk(issue_ids, ccr_number):
+    return update_chunk(issue_ids, {'status': 'ccr', 'ccr_number': ccr_number})
+
+def retag_chunk(issue_ids, add=(), remove=()):
+    """Add and/or remove tags on one chunk of issues and commit; returns the number of issues touched"""
+    issue_tags = IssueTag.__table__
+    # Resolve (and create) tags before writing: creation runs in its own transaction
+    add_ids = list(resolve_tag_ids(add).values()) if add else []
+    remove_ids = [tag_id for tag_id, in db.session.query(Tag.id).filter(Tag.name.in_(remove))] if remove else []
+    
+    if remove_ids:
+        db.session.execute(issue_tags.delete().where(
+            issue_tags.c.issue_id.in_(issue_ids), issue_tags.c.tag_id.in_(remove_ids)
+        ))
+    if add_ids:
+        # Skip issues deleted since the job was submitted (foreign key)
+        existing_ids = [issue_id for issue_id, in db.session.query(Issue.id).filter(Issue.id.in_(issue_ids))]
+        if existing_ids:
+            db.session.execute(
+                issue_tags.insert().prefix_with('IGNORE', dialect='mysql').prefix_with('OR IGNORE', dialect='sqlite'),
+                [{'issue_id': issue_id, 'tag_id': tag_id} for issue_id in existing_ids for tag_id in add_ids]
+            )
+    return update_chunk(issue_ids, {})
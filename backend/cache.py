@@ -0,0 +1,243 @@
+"""
+Response cache for hot read endpoints.
+
+Entries carry invalidation tags (e.g. 'tags', 'issues', 'issue:42'); write
+routes call invalidate() with the tags they affect after committing. Entries
+stored with stale_ok=True may be served until their TTL even after such a write.
+CACHE_BACKEND selects the in-process LRU ('memory', default), a Redis
+compatible server ('redis', needs the redis package) or no caching ('none').
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request
+from app import app
+
+# Response headers stored with cached bodies (ETags are attached per request, never from the cache)
+CACHED_HEADERS = ('Cache-Control',)
+
+class CacheStats:
+    """Per-process hit/miss counters"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.invalidations = 0
+    
+    def incr(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+    
+    def to_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'sets': self.sets,
+            'invalidations': self.invalidations,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None
+        }
+
+class NullCache:
+    """Cache that stores nothing (CACHE_BACKEND=none)"""
+    name = 'none'
+    
+    def __init__(self):
+        self.stats = CacheStats()
+    
+    def get(self, key):
+        self.stats.incr('misses')
+        return None
+    
+    def set(self, key, value, ttl=None, tags=(), stale_ok=False):
+        pass
+    
+    def invalidate(self, *tags):
+        pass
+    
+    def clear(self):
+        pass
+    
+    def info(self):
+        return dict(self.stats.to_dict(), backend=self.name)
+
+class LRUCache(NullCache):
+    """
+    In-process LRU cache with per-entry TTL and tag-based invalidation.
+    Invalidations only reach the process that made the write, so when several
+    server processes share the database only entries that expire by TTL alone
+    (untagged or stale_ok) may be cached; see ttl_only().
+    """
+    name = 'memory'
+    
+    def __init__(self, max_entries=1024, default_ttl=60):
+        super().__init__()
+        self.ttl_only_reason = None  # set once tag invalidation can no longer be relied on
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.entries = OrderedDict()  # key -> (expires, value, tags)
+        self.tag_index = {}  # tag -> set of keys
+        self.lock = threading.Lock()
+    
+    def _remove(self, key):
+        _, _, tags = self.entries.pop(key)
+        for tag in tags:
+            keys = self.tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tag_index[tag]
+    
+    def ttl_only(self, reason):
+        """Only cache entries that expire by TTL alone from now on, and drop the current entries"""
+        self.ttl_only_reason = reason
+        self.clear()
+    
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.stats.incr('hits')
+                return entry[1]
+            if entry is not None:
+                self._remove(key)
+        self.stats.incr('misses')
+        return None
+    
+    def set(self, key, value, ttl=None, tags=(), stale_ok=False):
+        if tags and not stale_ok and self.ttl_only_reason:
+            return
+        expires = time.monotonic() + (ttl or self.default_ttl)
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (expires, value, tuple(tags))
+            for tag in tags:
+                self.tag_index.setdefault(tag, set()).add(key)
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+        self.stats.incr('sets')
+    
+    def invalidate(self, *tags):
+        with self.lock:
+            for tag in tags:
+                for key in list(self.tag_index.get(tag, ())):
+                    self._remove(key)
+        self.stats.incr('invalidations')
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.tag_index.clear()
+    
+    def info(self):
+        return dict(super().info(), entries=len(self.entries), max_entries=self.max_entries, ttl_only=self.ttl_only_reason)
+
+class RedisCache(NullCache):
+    """
+    Redis-backed cache shared by all processes. Tags are version counters:
+    each entry stores the versions of its tags when written and is treated as a
+    miss once any of them has been incremented by invalidate().
+    """
+    name = 'redis'
+    
+    def __init__(self, url, default_ttl=60, prefix='testerTalk:'):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('CACHE_BACKEND=redis requires the redis package (pip install redis)')
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+    
+    def _tag_keys(self, tags):
+        return [f'{self.prefix}tag:{tag}' for tag in tags]
+    
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is not None:
+            tag_versions, value = pickle.loads(raw)
+            tags = list(tag_versions)
+            current = self.client.mget(self._tag_keys(tags)) if tags else []
+            if all(int(version or 0) == tag_versions[tag] for tag, version in zip(tags, current)):
+                self.stats.incr('hits')
+                return value
+        self.stats.incr('misses')
+        return None
+    
+    def set(self, key, value, ttl=None, tags=(), stale_ok=False):
+        tags = list(tags)
+        versions = self.client.mget(self._tag_keys(tags)) if tags else []
+        tag_versions = {tag: int(version or 0) for tag, version in zip(tags, versions)}
+        self.client.set(self.prefix + key, pickle.dumps((tag_versions, value)), ex=ttl or self.default_ttl)
+        self.stats.incr('sets')
+    
+    def invalidate(self, *tags):
+        if tags:
+            pipeline = self.client.pipeline()
+            for tag_key in self._tag_keys(tags):
+                pipeline.incr(tag_key)
+            pipeline.execute()
+        self.stats.incr('invalidations')
+    
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+    
+    def info(self):
+        return dict(super().info(), url=app.config.get('CACHE_REDIS_URL'))
+
+def create_cache():
+    backend = app.config.get('CACHE_BACKEND', 'memory')
+    ttl = app.config.get('CACHE_DEFAULT_TTL', 60)
+    if backend == 'redis':
+        return RedisCache(app.config['CACHE_REDIS_URL'], default_ttl=ttl)
+    if backend == 'none':
+        return NullCache()
+    return LRUCache(max_entries=app.config.get('CACHE_MAX_ENTRIES', 1024), default_ttl=ttl)
+
+response_cache = create_cache()
+
+def invalidate(*tags):
+    """Invalidate cached entries carrying any of the given tags"""
+    response_cache.invalidate(*tags)
+
+def issue_tag(issue_id):
+    return f'issue:{issue_id}'
+
+def cached_response(tags=(), ttl=None, vary=None):
+    """
+    Cache the 200 responses of a GET view, keyed by path and query string.
+    `tags` is a list of invalidation tags or a function of the view arguments returning one.
+    `vary` is an optional function of the view arguments whose result is added to the key
+    (e.g. the issue version), so a stale entry is never served after the data changed
+    and the entry does not depend on invalidation.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            key = 'response:' + request.full_path
+            if vary is not None:
+                key += '|' + str(vary(*args, **kwargs))
+            entry = response_cache.get(key)
+            if entry is not None:
+                body, mimetype, headers = entry
+                return app.response_class(body, status=200, mimetype=mimetype, headers=headers)
+            
+            response = app.make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                entry_tags = tags(*args, **kwargs) if callable(tags) else tags
+                headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+                response_cache.set(
+                    key, (response.get_data(), response.mimetype, headers), ttl, entry_tags, stale_ok=vary is not None
+                )
+            return response
+        return decorated_function
+    return decorator
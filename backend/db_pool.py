@@ -0,0 +1,105 @@
+"""
+Database connection pool settings and instrumentation.
+
+engine_options() turns the DB_POOL_* settings into SQLAlchemy engine options.
+For server databases the pool is an InstrumentedQueuePool, which records how
+long each checkout waited for a free connection and how often the wait ran
+into DB_POOL_TIMEOUT. pool_status() combines those counters with the pool's
+current size and in-use count for /api/admin/pool. Counters are per process.
+"""
+
+import os
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30)
+
+class PoolMetrics:
+    """Checkout counters and wait time histogram"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.buckets = [0] * (len(WAIT_BUCKETS) + 1)
+    
+    def record(self, wait, timed_out=False):
+        with self.lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.buckets[next((i for i, bound in enumerate(WAIT_BUCKETS) if wait <= bound), len(WAIT_BUCKETS))] += 1
+    
+    def to_dict(self):
+        with self.lock:
+            attempts = self.checkouts + self.timeouts
+            bounds = [str(bound) for bound in WAIT_BUCKETS] + ['+Inf']
+            # Ordered list of {le: upper bound, count}, as jsonify would sort dict keys
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_avg_ms': round(self.wait_total / attempts * 1000, 3) if attempts else None,
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+                'wait_seconds_histogram': [{'le': bound, 'count': count} for bound, count in zip(bounds, self.buckets)]
+            }
+
+pool_metrics = PoolMetrics()
+
+def _reset_after_fork():
+    global pool_metrics
+    pool_metrics = PoolMetrics()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout, including the wait for a free connection"""
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record(time.perf_counter() - start)
+        return connection
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database"""
+    options = {'pool_pre_ping': config['DB_POOL_PRE_PING']}
+    if config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        # SQLite connections are per file/thread; its default pools take no sizing options
+        return options
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+    })
+    return options
+
+def pool_status(engine):
+    """Current pool occupancy plus this process's checkout metrics"""
+    pool = engine.pool
+    status = {'pool': type(pool).__name__, 'pid': os.getpid()}
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'timeout': pool.timeout(),
+            'recycle': pool._recycle,
+            'in_use': pool.checkedout(),
+            'idle': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+        })
+    status.update(pool_metrics.to_dict())
+    return status
@@ -0,0 +1,71 @@
+"""
+Conditional GET support for the issue read endpoints.
+
+Issue ETags are derived from Issue.version (bumped on every change to the issue,
+its comments and attachments) and updated_at, so an If-None-Match request can
+be answered with 304 from a narrow version query instead of loading and
+serializing the full issue.
+"""
+
+import hashlib
+from functools import wraps
+from flask import g, request
+from app import app, db
+from models import Issue
+
+ETAG_COLUMNS = (Issue.id, Issue.version, Issue.updated_at)
+
+def issue_etag(issue_id, version, updated_at):
+    stamp = int(updated_at.timestamp() * 1000000) if updated_at else 0
+    return f'issue-{issue_id}-{version}-{stamp}'
+
+def listing_etag(items, *extra):
+    """ETag for a page of issues (ORM objects or version rows) plus extra page data such as the total"""
+    rows = [(item.id, item.version, item.updated_at) for item in items]
+    digest = hashlib.sha1(repr((request.full_path, rows, extra)).encode()).hexdigest()
+    return f'issues-{digest}'
+
+def version_query(query, columns=()):
+    """Narrow `query` to the ETag columns plus any extra (sort) columns"""
+    keys = {column.key for column in ETAG_COLUMNS}
+    return query.with_entities(*ETAG_COLUMNS, *[column for column in columns if column.key not in keys])
+
+def with_etag(response, etag):
+    response = app.make_response(response)
+    if response.status_code == 200:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def not_modified(etag):
+    """Return a 304 response if the request's If-None-Match matches `etag`, else None"""
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return None
+
+def current_issue_etag():
+    """ETag of the issue being served, as read by conditional_issue (None if it does not exist)"""
+    return g.get('issue_etag')
+
+def conditional_issue(f):
+    """
+    Read the issue's version row first: answers If-None-Match with 304 from it
+    alone, leaves the ETag in g for response cache keys (see current_issue_etag)
+    and sets it on the response, which may come from the cache. The row is read
+    before the body, so a concurrent write can only make the ETag older than
+    the body, which costs the client one extra full response, never a stale one.
+    """
+    @wraps(f)
+    def decorated_function(issue_id, *args, **kwargs):
+        row = db.session.query(Issue.version, Issue.updated_at).filter(Issue.id == issue_id).first()
+        g.issue_etag = issue_etag(issue_id, *row) if row is not None else None
+        if g.issue_etag and request.if_none_match:
+            response = not_modified(g.issue_etag)
+            if response is not None:
+                return response
+        response = f(issue_id, *args, **kwargs)
+        return with_etag(response, g.issue_etag) if g.issue_etag else response
+    return decorated_function
@@ -0,0 +1,83 @@
+"""
+Streaming export of issues as NDJSON or CSV (/api/issues/export).
+
+Rows come from a server-side cursor on a dedicated connection and are
+serialized in batches, with tags for each batch looked up on a second
+connection, so memory use does not depend on the number of issues exported.
+Output can be gzip-compressed on the fly.
+"""
+
+import csv
+import io
+import json
+import zlib
+from app import db
+from models import Issue, IssueTag, Tag
+
+EXPORT_COLUMNS = [
+    Issue.id, Issue.testcase_title, Issue.testcase_path, Issue.severity, Issue.test_case_ids,
+    Issue.release, Issue.platform, Issue.build, Issue.target, Issue.description,
+    Issue.additional_comments, Issue.reporter_name, Issue.status, Issue.ccr_number,
+    Issue.upvotes, Issue.downvotes, Issue.comment_count, Issue.has_verified_solution,
+    Issue.created_at, Issue.updated_at
+]
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS] + ['tags']
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+def export_batches(query, batch_size=1000):
+    """Yield lists of issue dicts (with tags) for an Issue query, in primary-key order"""
+    statement = query.with_entities(*EXPORT_COLUMNS).order_by(Issue.id).statement
+    with db.engine.connect() as stream_conn, db.engine.connect() as lookup_conn:
+        result = stream_conn.execution_options(stream_results=True).execute(statement)
+        for rows in result.partitions(batch_size):
+            issues = [dict(row._mapping) for row in rows]
+            tag_names = {issue['id']: [] for issue in issues}
+            tag_rows = lookup_conn.execute(
+                db.select(IssueTag.issue_id, Tag.name).join(Tag, Tag.id == IssueTag.tag_id)
+                .where(IssueTag.issue_id.in_(list(tag_names)))
+            )
+            for issue_id, name in tag_rows:
+                tag_names[issue_id].append(name)
+            for issue in issues:
+                issue['tags'] = sorted(tag_names[issue['id']])
+                for key in ('created_at', 'updated_at'):
+                    if issue[key] is not None:
+                        issue[key] = issue[key].isoformat()
+                issue['has_verified_solution'] = bool(issue['has_verified_solution'])
+            yield issues
+
+def ndjson_chunks(batches):
+    for issues in batches:
+        yield ''.join(json.dumps(issue, ensure_ascii=False) + '\n' for issue in issues)
+
+def csv_chunks(batches):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for issues in batches:
+        for issue in issues:
+            writer.writerow(dict(issue, tags=','.join(issue['tags'])))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()  # Header only when nothing matched
+
+def export_stream(query, export_format, compress=False, batch_size=1000):
+    """Encoded output chunks for `query` in `export_format`, gzip-compressed if `compress`"""
+    serialize = ndjson_chunks if export_format == 'ndjson' else csv_chunks
+    if not compress:
+        for chunk in serialize(export_batches(query, batch_size)):
+            if chunk:
+                yield chunk.encode('utf-8')
+        return
+    
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in serialize(export_batches(query, batch_size)):
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
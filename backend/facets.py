@@ -0,0 +1,62 @@
+"""
+Facet counts for the issue filter panel (/api/facets).
+
+All scalar facets come from a single GROUP BY over the facet columns, folded
+into per-facet counts in Python; tag counts take one more grouped query.
+Results are cached per filter signature for FACETS_CACHE_TTL seconds in the
+response cache and dropped whenever an issue write invalidates 'issues'.
+"""
+
+from app import app, db
+from models import Issue, IssueTag, Tag
+from cache import response_cache
+
+FACET_COLUMNS = {
+    'status': Issue.status,
+    'severity': Issue.severity,
+    'release': Issue.release,
+    'platform': Issue.platform,
+    'build': Issue.build,
+    'target': Issue.target,
+}
+
+def compute_facets(query):
+    """Compute facet counts for the issues matched by `query`"""
+    columns = list(FACET_COLUMNS.values())
+    rows = query.order_by(None).with_entities(*columns, db.func.count(Issue.id)).group_by(*columns).all()
+    
+    counts = {name: {} for name in FACET_COLUMNS}
+    total = 0
+    for row in rows:
+        *values, count = row
+        total += count
+        for name, value in zip(FACET_COLUMNS, values):
+            if value is not None:
+                counts[name][value] = counts[name].get(value, 0) + count
+    
+    matching_ids = query.order_by(None).with_entities(Issue.id).statement
+    tag_rows = db.session.query(Tag.name, db.func.count(IssueTag.issue_id)).join(
+        IssueTag, IssueTag.tag_id == Tag.id
+    ).filter(IssueTag.issue_id.in_(matching_ids)).group_by(Tag.name).all()
+    counts['tags'] = dict(tag_rows)
+    
+    facets = {
+        name: [
+            {'value': value, 'count': count}
+            for value, count in sorted(values.items(), key=lambda item: (-item[1], str(item[0])))
+        ]
+        for name, values in counts.items()
+    }
+    for entry in facets['platform']:
+        entry['display'] = Issue.get_platform_display_name(entry['value'])
+    facets['total'] = total
+    return facets
+
+def get_facets(query, signature):
+    """Return cached facets for a filter signature (a hashable description of the filters)"""
+    key = 'facets:' + repr(signature)
+    facets = response_cache.get(key)
+    if facets is None:
+        facets = compute_facets(query)
+        response_cache.set(key, facets, app.config.get('FACETS_CACHE_TTL', 30), tags=['issues'], stale_ok=True)
+    return facets
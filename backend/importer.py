@@ -0,0 +1,179 @@
+"""
+Bulk issue import (/api/issues/import).
+
+Rows are validated up front (required fields, value types, column lengths
+and tags), so one bad row cannot fail the chunk it would be inserted with;
+valid ones are inserted in chunks of BULK_CHUNK_SIZE, one transaction per chunk, with multi-row INSERTs for the
+issues, their tag links and their test case rows. Tags are resolved once for
+the whole import and test case IDs are allocated one block per chunk. New
+issue IDs are read back by their freshly allocated test case IDs, restricted to
+rows above the highest issue ID seen before the insert (a primary key range).
+"""
+
+import json
+import logging
+from datetime import datetime
+from app import app, db
+from models import Issue, IssueTag, IssueTestCase, Tag, test_case_id_allocator
+from tags import parse_tag_names, resolve_tag_ids
+from cache import invalidate
+from indexing import enqueue
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ('testcase_title', 'testcase_path', 'severity', 'description', 'reporter_name')
+OPTIONAL_FIELDS = ('build', 'target', 'additional_comments')
+SEVERITIES = ('Low', 'Medium', 'High', 'Critical')
+TEXT_MAX_BYTES = 65535  # MySQL TEXT columns
+
+class InvalidImport(ValueError):
+    """Raised when the request body cannot be parsed at all"""
+
+def parse_body(body, content_type):
+    """Parse an NDJSON body or a JSON array (optionally wrapped as {"issues": [...]}) into a list of rows"""
+    text = body.decode('utf-8-sig')
+    if 'ndjson' in (content_type or '') or 'jsonlines' in (content_type or ''):
+        rows = []
+        for line_number, line in enumerate(text.splitlines(), 1):
+            if line.strip():
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    raise InvalidImport(f'Invalid JSON on line {line_number}')
+        return rows
+    
+    try:
+        data = json.loads(text)
+    except ValueError:
+        raise InvalidImport('Invalid JSON')
+    if isinstance(data, dict):
+        data = data.get('issues')
+    if not isinstance(data, list):
+        raise InvalidImport('Expected a JSON array of issues, {"issues": [...]} or NDJSON')
+    return data
+
+def field_error(field, value):
+    """Error message for a string field that is not a string or too long for its column, or None"""
+    if not isinstance(value, str):
+        return f'{field} must be a string'
+    max_length = getattr(Issue.__table__.c[field].type, 'length', None)
+    if max_length is None:
+        if len(value.encode('utf-8')) > TEXT_MAX_BYTES:
+            return f'{field} is longer than {TEXT_MAX_BYTES} bytes'
+    elif len(value) > max_length:
+        return f'{field} is longer than {max_length} characters'
+    return None
+
+def tags_error(value):
+    """Error message for a tags value that is not a list of names or a comma separated string, or None"""
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+        return 'tags must be a list of strings or a comma separated string'
+    max_length = Tag.__table__.c.name.type.length
+    if any(len(name.strip()) > max_length for name in value):
+        return f'Tag names are limited to {max_length} characters'
+    return None
+
+def validate_row(row):
+    """Return an error message for an invalid row, or None"""
+    if not isinstance(row, dict):
+        return 'Expected a JSON object'
+    missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+    if missing:
+        return f'Missing required field(s): {", ".join(missing)}'
+    present = REQUIRED_FIELDS + tuple(field for field in OPTIONAL_FIELDS if row.get(field) is not None)
+    for field in present:
+        error = field_error(field, row[field])
+        if error:
+            return error
+    if row['severity'] not in SEVERITIES:
+        return f"Invalid severity '{row['severity'][:20]}'"
+    if row.get('tags') is not None:
+        return tags_error(row['tags'])
+    return None
+
+def issue_values(row, test_case_id, now):
+    release, platform = Issue.parse_testcase_path(row['testcase_path'])
+    return {
+        'testcase_title': row['testcase_title'],
+        'testcase_path': row['testcase_path'],
+        'severity': row['severity'],
+        'test_case_ids': test_case_id,
+        'release': release,
+        'platform': platform,
+        'build': row.get('build'),
+        'target': row.get('target'),
+        'description': row['description'],
+        'additional_comments': row.get('additional_comments', ''),
+        'reporter_name': row['reporter_name'],
+        'status': 'open',
+        'created_at': now,
+        'updated_at': now
+    }
+
+def insert_chunk(chunk, tag_ids):
+    """
+    Insert one chunk of (index, row, tag names) entries and commit.
+    Returns {index: (issue_id, test_case_id)}.
+    """
+    now = datetime.now()
+    test_case_ids = test_case_id_allocator.allocate_many(len(chunk))
+    # Older issues may carry the same test_case_ids text; new rows always get higher IDs
+    max_id_before = db.session.query(db.func.max(Issue.id)).scalar() or 0
+    db.session.execute(Issue.__table__.insert(), [
+        issue_values(row, test_case_id, now) for (_, row, _), test_case_id in zip(chunk, test_case_ids)
+    ])
+    issue_ids = dict(
+        db.session.query(Issue.test_case_ids, Issue.id).filter(
+            Issue.id > max_id_before, Issue.test_case_ids.in_(test_case_ids)
+        )
+    )
+    if len(issue_ids) != len(chunk):
+        raise RuntimeError(f'Read back {len(issue_ids)} of {len(chunk)} inserted issues')
+    
+    test_case_rows, tag_rows = [], []
+    created = {}
+    for (index, _, names), test_case_id in zip(chunk, test_case_ids):
+        issue_id = issue_ids[test_case_id]
+        created[index] = (issue_id, test_case_id)
+        test_case_rows.append({'issue_id': issue_id, 'test_case_id': test_case_id})
+        tag_rows.extend({'issue_id': issue_id, 'tag_id': tag_id} for tag_id in sorted({tag_ids[name] for name in names}))
+    db.session.execute(IssueTestCase.__table__.insert(), test_case_rows)
+    if tag_rows:
+        db.session.execute(IssueTag.__table__.insert(), tag_rows)
+    enqueue(list(issue_ids.values()), 'index')
+    db.session.commit()
+    return created
+
+def import_issues(rows, chunk_size=None):
+    """Validate and insert rows; returns per-row results in input order"""
+    results = [None] * len(rows)
+    valid = []
+    for index, row in enumerate(rows):
+        error = validate_row(row)
+        if error:
+            results[index] = {'index': index, 'error': error}
+        else:
+            valid.append((index, row, parse_tag_names(row.get('tags', []))))
+    
+    tag_ids = resolve_tag_ids(sorted({name for _, _, names in valid for name in names}))
+    
+    chunk_size = chunk_size or app.config.get('BULK_CHUNK_SIZE', 1000)
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        try:
+            created = insert_chunk(chunk, tag_ids)
+        except Exception:
+            # The database error quotes other rows' values; it goes to the log only
+            db.session.rollback()
+            logger.exception('Import of rows %s-%s failed', chunk[0][0], chunk[-1][0])
+            for index, _, _ in chunk:
+                results[index] = {'index': index, 'error': 'Insert failed; no row of its chunk was imported'}
+            continue
+        for index, (issue_id, test_case_id) in created.items():
+            results[index] = {'index': index, 'id': issue_id, 'test_case_id': test_case_id}
+    
+    if valid:
+        invalidate('issues', 'tags')
+    return results
@@ -0,0 +1,295 @@
+"""
+Elasticsearch indexing pipeline.
+
+Issue, comment and tag changes are recorded in the search_outbox table by a
+session after_flush hook, so they commit or roll back together with the change
+itself. IndexingWorker drains the outbox in batches through the bulk API and
+retries failed entries with exponential backoff.
+
+ELASTICSEARCH_INDEX names an alias. The worker writes through it and, before
+its first write, creates a timestamped index with INDEX_MAPPING behind it when
+the alias does not exist yet; run_reindex.py later swaps the alias to a
+rebuilt index.
+
+Set ELASTICSEARCH_URL=memory:// to use the in-process InMemoryElasticsearch
+stand-in instead of a real cluster.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from app import app, db
+from models import Issue, Comment, IssueTag, Tag, SearchOutbox, touched_issue_ids
+from memory_es import InMemoryElasticsearch
+
+logger = logging.getLogger(__name__)
+
+# Field mapping for the issues index
+INDEX_MAPPING = {
+    'mappings': {
+        'properties': {
+            'testcase_title': {'type': 'text'},
+            'testcase_path': {'type': 'keyword'},
+            'severity': {'type': 'keyword'},
+            'test_case_ids': {'type': 'text'},
+            'release': {'type': 'keyword'},
+            'platform': {'type': 'keyword'},
+            'build': {'type': 'keyword'},
+            'target': {'type': 'keyword'},
+            'description': {'type': 'text'},
+            'additional_comments': {'type': 'text'},
+            'reporter_name': {'type': 'keyword'},
+            'status': {'type': 'keyword'},
+            'tags': {'type': 'keyword'},
+            'comments': {'type': 'text'},
+            'comment_count': {'type': 'integer'},
+            'has_verified_solution': {'type': 'boolean'},
+            'created_at': {'type': 'date'}
+        }
+    }
+}
+
+_client = None
+_client_lock = threading.Lock()
+
+def indexing_enabled():
+    return bool(app.config.get('ELASTICSEARCH_URL'))
+
+def get_es_client():
+    """Return the shared Elasticsearch client, or None when indexing is not configured"""
+    global _client
+    if _client is None and indexing_enabled():
+        with _client_lock:
+            if _client is None:
+                url = app.config['ELASTICSEARCH_URL']
+                if url.startswith('memory://'):
+                    _client = InMemoryElasticsearch()
+                else:
+                    from elasticsearch import Elasticsearch
+                    api_key = app.config.get('ELASTICSEARCH_API_KEY')
+                    _client = Elasticsearch(url, api_key=api_key) if api_key else Elasticsearch(url)
+    return _client
+
+def versioned_index_name(alias):
+    """Name for a new concrete index behind the alias"""
+    return f"{alias}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+def ensure_index(client):
+    """
+    Make sure ELASTICSEARCH_INDEX is an alias of an index with INDEX_MAPPING.
+    Bulk writes to a missing name would auto-create a concrete index with a
+    dynamic mapping, which run_reindex.py cannot swap out.
+    """
+    alias = app.config['ELASTICSEARCH_INDEX']
+    if client.indices.exists_alias(name=alias):
+        return
+    if client.indices.exists(index=alias):
+        logger.warning("'%s' is a concrete index, not an alias; delete it and run run_reindex.py", alias)
+        return
+    index = versioned_index_name(alias)
+    client.indices.create(index=index, body=INDEX_MAPPING)
+    client.indices.update_aliases(body={'actions': [{'add': {'index': index, 'alias': alias}}]})
+    logger.info("Created index '%s' behind alias '%s'", index, alias)
+
+class ClusterStatus:
+    """
+    Tracks whether the cluster is reachable.
+    After a failure, searches skip Elasticsearch for ELASTICSEARCH_RETRY_AFTER seconds.
+    """
+    
+    def __init__(self):
+        self.down_until = 0.0
+        self.last_error = None
+    
+    def mark_down(self, error):
+        self.down_until = time.monotonic() + app.config.get('ELASTICSEARCH_RETRY_AFTER', 30)
+        self.last_error = str(error)
+    
+    def mark_up(self):
+        self.down_until = 0.0
+        self.last_error = None
+    
+    def available(self):
+        return time.monotonic() >= self.down_until
+
+cluster_status = ClusterStatus()
+
+def build_documents(issue_ids):
+    """Build index documents for the given issue IDs with one query per table"""
+    if not issue_ids:
+        return {}
+    
+    issues = Issue.query.filter(Issue.id.in_(issue_ids)).all()
+    
+    tag_names = {issue.id: [] for issue in issues}
+    tag_rows = db.session.query(IssueTag.issue_id, Tag.name).join(
+        Tag, Tag.id == IssueTag.tag_id
+    ).filter(IssueTag.issue_id.in_(issue_ids))
+    for issue_id, name in tag_rows:
+        tag_names[issue_id].append(name)
+    
+    comment_contents = {issue.id: [] for issue in issues}
+    comment_rows = db.session.query(Comment.issue_id, Comment.content).filter(
+        Comment.issue_id.in_(issue_ids)
+    ).order_by(Comment.id)
+    for issue_id, content in comment_rows:
+        comment_contents[issue_id].append(content)
+    
+    return {
+        issue.id: issue_document(issue, tag_names[issue.id], comment_contents[issue.id])
+        for issue in issues
+    }
+
+def issue_document(issue, tags, comments):
+    """Index document for one issue"""
+    return {
+        'testcase_title': issue.testcase_title,
+        'testcase_path': issue.testcase_path,
+        'severity': issue.severity,
+        'test_case_ids': issue.test_case_ids,
+        'release': issue.release,
+        'platform': issue.platform,
+        'build': issue.build,
+        'target': issue.target,
+        'description': issue.description,
+        'additional_comments': issue.additional_comments,
+        'reporter_name': issue.reporter_name,
+        'status': issue.status,
+        'tags': tags,
+        'comments': comments,
+        'comment_count': issue.comment_count or 0,
+        'has_verified_solution': bool(issue.has_verified_solution),
+        'created_at': issue.created_at.isoformat() if issue.created_at else None
+    }
+
+def enqueue(issue_ids, action='index', connection=None):
+    """
+    Add outbox entries for issues changed outside the ORM unit of work
+    (e.g. bulk Query.update/delete). Uses the session's transaction by default.
+    """
+    if not indexing_enabled() or not issue_ids:
+        return
+    now = datetime.now()
+    rows = [
+        {'issue_id': issue_id, 'action': action, 'attempts': 0, 'next_attempt_at': now, 'created_at': now}
+        for issue_id in issue_ids
+    ]
+    (connection or db.session).execute(SearchOutbox.__table__.insert(), rows)
+
+def record_outbox_entries(session, flush_context):
+    """after_flush hook: queue index/delete actions for every issue touched by the flush"""
+    if not indexing_enabled():
+        return
+    
+    changed, deleted = touched_issue_ids(session)
+    connection = session.connection()
+    enqueue(sorted(changed), 'index', connection)
+    enqueue(sorted(deleted), 'delete', connection)
+
+db.event.listen(db.session, 'after_flush', record_outbox_entries)
+
+class IndexingWorker(threading.Thread):
+    """Background thread that drains the search outbox into Elasticsearch"""
+    
+    def __init__(self, batch_size=None, poll_interval=None):
+        super().__init__(name='search-indexing-worker', daemon=True)
+        self.batch_size = batch_size or app.config.get('INDEXING_BATCH_SIZE', 500)
+        self.poll_interval = poll_interval or app.config.get('INDEXING_POLL_INTERVAL', 1.0)
+        self.stop_event = threading.Event()
+        self.index_ready = False
+    
+    def stop(self):
+        self.stop_event.set()
+    
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                with app.app_context():
+                    processed = self.drain_once()
+            except Exception:
+                logger.exception('Search indexing batch failed')
+                processed = 0
+            if not processed:
+                self.stop_event.wait(self.poll_interval)
+    
+    def drain_once(self):
+        """Send one batch of outbox entries to Elasticsearch. Returns the number of entries processed."""
+        entries = SearchOutbox.query.filter(
+            SearchOutbox.next_attempt_at <= datetime.now()
+        ).order_by(SearchOutbox.id).limit(self.batch_size).with_for_update(skip_locked=True).all()
+        if not entries:
+            db.session.commit()
+            return 0
+        
+        # Only the most recent action per issue matters
+        latest = {}
+        for entry in entries:
+            latest[entry.issue_id] = entry.action
+        
+        documents = build_documents([issue_id for issue_id, action in latest.items() if action == 'index'])
+        index_name = app.config['ELASTICSEARCH_INDEX']
+        operations = []
+        for issue_id, action in latest.items():
+            if action == 'index' and issue_id in documents:
+                operations.append({'index': {'_index': index_name, '_id': issue_id}})
+                operations.append(documents[issue_id])
+            else:
+                # Issue no longer exists (or was deleted after being queued)
+                operations.append({'delete': {'_index': index_name, '_id': issue_id}})
+        
+        client = get_es_client()
+        try:
+            if not self.index_ready:
+                ensure_index(client)
+                self.index_ready = True
+            response = client.bulk(body=operations)
+        except Exception as e:
+            cluster_status.mark_down(e)
+            self.schedule_retry(entries, str(e))
+            db.session.commit()
+            return 0
+        cluster_status.mark_up()
+        
+        failed = {}
+        for item in response.get('items', []):
+            op, result = next(iter(item.items()))
+            status = result.get('status', 200)
+            if status >= 300 and not (op == 'delete' and status == 404):
+                failed[int(result['_id'])] = str(result.get('error'))
+        
+        for entry in entries:
+            if entry.issue_id in failed:
+                self.schedule_retry([entry], failed[entry.issue_id])
+            else:
+                db.session.delete(entry)
+        db.session.commit()
+        return len(entries)
+    
+    @staticmethod
+    def schedule_retry(entries, error):
+        max_backoff = app.config.get('INDEXING_MAX_BACKOFF', 300)
+        for entry in entries:
+            entry.attempts += 1
+            entry.last_error = error[:1000]
+            entry.next_attempt_at = datetime.now() + timedelta(seconds=min(2 ** entry.attempts, max_backoff))
+
+_worker = None
+
+def start_indexing_worker():
+    """Start the background indexing worker once per process (no-op when indexing is disabled)"""
+    global _worker
+    if indexing_enabled() and _worker is None:
+        _worker = IndexingWorker()
+        _worker.start()
+    return _worker
+
+def _reset_after_fork():
+    # A forked process has no worker thread and must open its own cluster connection
+    global _worker, _client, _client_lock
+    _worker = None
+    _client = None
+    _client_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
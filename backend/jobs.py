@@ -0,0 +1,164 @@
+"""
+Background jobs for admin bulk operations.
+
+A job is a list of issue IDs plus one operation from bulk.py. Submitting
+returns immediately with a job ID; a thread pool in the accepting process
+works through the IDs in BULK_CHUNK_SIZE chunks, one transaction per chunk.
+Progress is written to the bulk_jobs table after every chunk, so
+/api/admin/jobs/<id> can be answered by any server process. A failing chunk is
+rolled back and recorded, and the job moves on to the next one.
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from app import app, db
+from models import BulkJob
+from cache import invalidate
+from tags import parse_tag_names
+import bulk
+
+logger = logging.getLogger(__name__)
+
+# operation name -> (chunk function, required parameters)
+OPERATIONS = {
+    'delete': (bulk.delete_chunk, ()),
+    'status': (bulk.status_chunk, ('status',)),
+    'move_to_ccr': (bulk.move_to_ccr_chunk, ('ccr_number',)),
+    'retag': (bulk.retag_chunk, ()),
+}
+
+ISSUE_STATUSES = ('open', 'in_progress', 'resolved', 'closed', 'ccr')
+
+class JobError(ValueError):
+    """Raised for invalid job submissions"""
+
+class JobRunner:
+    """Works through the chunks of one job and records its progress in bulk_jobs"""
+    
+    def __init__(self, job_id, operation, chunks, params):
+        self.job_id = job_id
+        self.operation = operation
+        self.chunks = chunks
+        self.params = params
+        self.processed = 0
+        self.affected = 0
+        self.failed_ids = []
+        self.errors = []
+    
+    def save(self, **values):
+        """Write the job's progress in a transaction of its own"""
+        values.update({
+            'processed': self.processed,
+            'affected': self.affected,
+            'failed': len(self.failed_ids),
+            'failed_issue_ids': json.dumps(self.failed_ids[:1000]),
+            'errors': json.dumps(self.errors[:20])
+        })
+        jobs = BulkJob.__table__
+        with db.engine.begin() as connection:
+            connection.execute(jobs.update().where(jobs.c.id == self.job_id).values(**values))
+    
+    def run_chunk(self, chunk_function, chunk):
+        """Process one chunk; returns (affected, error)"""
+        try:
+            return chunk_function(chunk, **self.params), None
+        except Exception as e:
+            db.session.rollback()
+            logger.exception('Bulk %s job %s failed on a chunk', self.operation, self.job_id)
+            return 0, str(e)
+    
+    def run(self):
+        chunk_function = OPERATIONS[self.operation][0]
+        with app.app_context():
+            self.save(status='running', started_at=datetime.now())
+            try:
+                for chunk in self.chunks:
+                    affected, error = self.run_chunk(chunk_function, chunk)
+                    self.processed += len(chunk)
+                    self.affected += affected
+                    if error:
+                        self.failed_ids.extend(chunk)
+                        self.errors.append({'first_id': chunk[0], 'last_id': chunk[-1], 'error': error[:500]})
+                    db.session.remove()
+                    self.save()
+                invalidate('issues', 'tags')
+            finally:
+                self.save(
+                    status='failed' if self.failed_ids and not self.affected else 'completed',
+                    finished_at=datetime.now()
+                )
+
+_executor_lock = threading.Lock()
+_executor = None
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get('BULK_JOB_WORKERS', 2), thread_name_prefix='bulk-job'
+            )
+        return _executor
+
+def _reset_after_fork():
+    # Executor threads belong to the parent process
+    global _executor_lock, _executor
+    _executor_lock = threading.Lock()
+    _executor = None
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def validate(operation, params):
+    """Check and normalize the parameters of an operation; raises JobError"""
+    if operation not in OPERATIONS:
+        raise JobError(f"Unknown operation '{operation}'. Use one of: {', '.join(OPERATIONS)}")
+    missing = [name for name in OPERATIONS[operation][1] if not params.get(name)]
+    if missing:
+        raise JobError(f'Missing parameter(s): {", ".join(missing)}')
+    
+    if operation == 'status':
+        if params['status'] not in ISSUE_STATUSES:
+            raise JobError(f"Invalid status '{params['status']}'")
+        return {'status': params['status']}
+    if operation == 'move_to_ccr':
+        return {'ccr_number': str(params['ccr_number'])}
+    if operation == 'retag':
+        add, remove = parse_tag_names(params.get('add')), parse_tag_names(params.get('remove'))
+        if not add and not remove:
+            raise JobError('Provide tags to add and/or remove')
+        return {'add': add, 'remove': remove}
+    return {}
+
+def prune_jobs():
+    """Delete finished jobs older than BULK_JOB_RETENTION seconds"""
+    cutoff = datetime.now() - timedelta(seconds=app.config.get('BULK_JOB_RETENTION', 3600))
+    BulkJob.query.filter(BulkJob.finished_at < cutoff).delete(synchronize_session=False)
+
+def submit_job(operation, issue_ids, params=None):
+    """Validate, record and queue a bulk job; returns the BulkJob row"""
+    params = validate(operation, params or {})
+    try:
+        chunks = bulk.chunked(issue_ids)
+    except (TypeError, ValueError):
+        raise JobError('issue_ids must be a list of integers')
+    total = sum(len(chunk) for chunk in chunks)
+    if not total:
+        raise JobError('No issue IDs provided')
+    
+    prune_jobs()
+    job = BulkJob(id=uuid.uuid4().hex, operation=operation, params=json.dumps(params), status='queued', total=total)
+    db.session.add(job)
+    db.session.commit()
+    get_executor().submit(JobRunner(job.id, operation, chunks, params).run)
+    return job
+
+def get_job(job_id):
+    return BulkJob.query.get(job_id)
+
+def list_jobs():
+    return BulkJob.query.order_by(BulkJob.created_at.desc()).limit(100).all()
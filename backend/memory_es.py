@@ -0,0 +1,181 @@
+"""
+In-process stand-in for the Elasticsearch client.
+
+Implements the subset of the elasticsearch-py API used by indexing.py, the
+Elasticsearch search backend and run_reindex.py, so the indexing pipeline can run in tests and
+local development without a cluster (ELASTICSEARCH_URL=memory://).
+"""
+
+import re
+import threading
+from elasticsearch.exceptions import ConnectionError as ESConnectionError, NotFoundError, RequestError
+
+TERM_PATTERN = re.compile(r'\w+')
+
+class InMemoryIndices:
+    """Fake of the client's indices namespace (index and alias management)"""
+    
+    def __init__(self, client):
+        self.client = client
+    
+    def exists(self, index):
+        """True for indices and aliases, like the real API"""
+        self.client._check_available()
+        return index in self.client.documents or bool(self.client.aliases.get(index))
+    
+    def create(self, index, body=None):
+        self.client._check_available()
+        with self.client.lock:
+            if self.exists(index):
+                raise RequestError(400, 'resource_already_exists_exception', {'index': index})
+            self.client.documents[index] = {}
+            self.client.settings[index] = dict((body or {}).get('settings', {}))
+            self.client.mappings[index] = dict((body or {}).get('mappings', {}))
+        return {'acknowledged': True, 'index': index}
+    
+    def delete(self, index):
+        self.client._check_available()
+        if index not in self.client.documents:
+            raise NotFoundError(404, 'index_not_found_exception', {'index': index})
+        del self.client.documents[index]
+        self.client.settings.pop(index, None)
+        self.client.mappings.pop(index, None)
+        for indices in self.client.aliases.values():
+            indices.discard(index)
+        return {'acknowledged': True}
+    
+    def put_settings(self, index, body):
+        self.client._check_available()
+        self.client.settings.setdefault(index, {}).update(body.get('index', body))
+        return {'acknowledged': True}
+    
+    def refresh(self, index=None):
+        self.client._check_available()
+        return {'_shards': {'failed': 0}}
+    
+    def exists_alias(self, name):
+        self.client._check_available()
+        return bool(self.client.aliases.get(name))
+    
+    def get_alias(self, name):
+        self.client._check_available()
+        indices = self.client.aliases.get(name)
+        if not indices:
+            raise NotFoundError(404, 'alias_not_found', {'alias': name})
+        return {index: {'aliases': {name: {}}} for index in indices}
+    
+    def update_aliases(self, body):
+        """Applies all add/remove actions under the client lock, i.e. atomically"""
+        self.client._check_available()
+        with self.client.lock:
+            for action in body['actions']:
+                op, params = next(iter(action.items()))
+                indices = self.client.aliases.setdefault(params['alias'], set())
+                if op == 'add':
+                    indices.add(params['index'])
+                elif op == 'remove':
+                    indices.discard(params['index'])
+        return {'acknowledged': True}
+
+class InMemoryElasticsearch:
+    """Dictionary-backed fake of the Elasticsearch client"""
+    
+    def __init__(self):
+        self.documents = {}  # index name -> {doc id: source}
+        self.settings = {}  # index name -> settings
+        self.mappings = {}  # index name -> mappings (None for indices auto-created by bulk writes)
+        self.aliases = {}  # alias name -> set of index names
+        self.available = True  # set to False to simulate a cluster outage
+        self.lock = threading.Lock()
+        self.indices = InMemoryIndices(self)
+    
+    def _check_available(self):
+        if not self.available:
+            raise ESConnectionError('N/A', 'In-memory cluster marked unavailable', None)
+    
+    def _resolve(self, index):
+        """Resolve an alias to its single write index"""
+        indices = self.aliases.get(index)
+        return next(iter(indices)) if indices else index
+    
+    def ping(self):
+        return self.available
+    
+    def bulk(self, body, index=None, refresh=None):
+        self._check_available()
+        items = []
+        with self.lock:
+            operations = iter(body)
+            for operation in operations:
+                op, meta = next(iter(operation.items()))
+                name = self._resolve(meta.get('_index', index))
+                if name not in self.documents:
+                    # Writing to a missing index creates it with a dynamic mapping
+                    self.documents[name] = {}
+                    self.mappings[name] = None
+                target = self.documents[name]
+                doc_id = str(meta['_id'])
+                if op == 'delete':
+                    found = target.pop(doc_id, None) is not None
+                    items.append({op: {'_id': doc_id, 'status': 200 if found else 404}})
+                else:
+                    target[doc_id] = next(operations)
+                    items.append({op: {'_id': doc_id, 'status': 201}})
+        return {'errors': False, 'items': items}
+    
+    def get(self, index, id):
+        self._check_available()
+        source = self.documents.get(self._resolve(index), {}).get(str(id))
+        if source is None:
+            raise NotFoundError(404, 'not_found', {'_id': str(id)})
+        return {'_id': str(id), '_source': source, 'found': True}
+    
+    def count(self, index, body=None):
+        self._check_available()
+        return {'count': len(self.documents.get(self._resolve(index), {}))}
+    
+    def search(self, index, body, size=None):
+        """
+        Supports multi_match queries: every term must occur in one of the fields,
+        the last term as a prefix; hits are scored by weighted term counts.
+        """
+        self._check_available()
+        multi_match = body['query']['multi_match']
+        terms = [term.lower() for term in TERM_PATTERN.findall(multi_match['query'])]
+        fields = []
+        for field in multi_match['fields']:
+            name, _, boost = field.partition('^')
+            fields.append((name, float(boost or 1)))
+        
+        hits = []
+        for doc_id, source in self.documents.get(self._resolve(index), {}).items():
+            tokens = {}
+            for name, boost in fields:
+                value = source.get(name) or ''
+                if isinstance(value, list):
+                    value = ' '.join(value)
+                tokens[name] = TERM_PATTERN.findall(value.lower())
+            
+            score = 0.0
+            for position, term in enumerate(terms):
+                prefix = position == len(terms) - 1
+                term_score = sum(
+                    boost * sum(1 for token in tokens[name] if token == term or (prefix and token.startswith(term)))
+                    for name, boost in fields
+                )
+                if not term_score:
+                    break
+                score += term_score
+            else:
+                if terms:
+                    hits.append({'_id': doc_id, '_score': score})
+        
+        hits.sort(key=lambda hit: hit['_score'], reverse=True)
+        size = size if size is not None else body.get('size', 10)
+        return {
+            'hits': {
+                'total': {'value': len(hits), 'relation': 'eq'},
+                'max_score': hits[0]['_score'] if hits else None,
+                'hits': hits[:size]
+            }
+        }
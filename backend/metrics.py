@@ -0,0 +1,280 @@
+"""
+Request metrics in Prometheus text format (/api/metrics).
+
+Every request is timed by before/after request hooks and recorded per Flask
+endpoint: a latency histogram, counts per status code, response sizes and the
+number of requests in flight. Each thread records into its own shard, so the
+request path takes no lock; shards are summed when metrics are rendered. The
+shards of threads that have exited are folded into one retired shard, so
+servers that recycle threads do not accumulate them.
+
+Worker processes do not share memory. With METRICS_DIR set, every process
+writes a snapshot of its counters there every METRICS_FLUSH_INTERVAL seconds
+(and whenever it renders metrics), and /api/metrics sums the snapshots of all
+processes. Without it, each process reports only its own requests.
+"""
+
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from flask import g, request
+from app import app
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+class MetricShard:
+    """Counters recorded by one thread"""
+    
+    def __init__(self):
+        self.durations = {}  # (endpoint, method) -> per-bucket counts + [sum, count]
+        self.statuses = {}  # (endpoint, method, status) -> count
+        self.sizes = {}  # (endpoint, method) -> [bytes, responses]
+        self.in_flight = 0
+    
+    def observe(self, endpoint, method, status, duration, size):
+        key = (endpoint, method)
+        values = self.durations.get(key)
+        if values is None:
+            values = self.durations[key] = [0] * (len(LATENCY_BUCKETS) + 3)
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if duration <= bound), len(LATENCY_BUCKETS))
+        values[bucket] += 1
+        values[-2] += duration
+        values[-1] += 1
+        
+        status_key = (endpoint, method, status)
+        self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+        
+        if size is not None:
+            sizes = self.sizes.get(key)
+            if sizes is None:
+                sizes = self.sizes[key] = [0, 0]
+            sizes[0] += size
+            sizes[1] += 1
+    
+    def absorb(self, other):
+        """Add the counters of a shard whose thread has exited (its in-flight count is void)"""
+        for key, values in other.durations.items():
+            total = self.durations.setdefault(key, [0] * len(values))
+            for i, value in enumerate(values):
+                total[i] += value
+        for key, count in other.statuses.items():
+            self.statuses[key] = self.statuses.get(key, 0) + count
+        for key, values in other.sizes.items():
+            total = self.sizes.setdefault(key, [0, 0])
+            total[0] += values[0]
+            total[1] += values[1]
+
+_local = threading.local()
+_shards = []  # (thread, shard) of live threads
+_retired = MetricShard()  # counters of exited threads
+_shards_lock = threading.Lock()
+
+def retire_dead_shards():
+    """Fold the shards of exited threads into the retired shard (call with _shards_lock held)"""
+    for thread, shard in [entry for entry in _shards if not entry[0].is_alive()]:
+        _retired.absorb(shard)
+        _shards.remove((thread, shard))
+
+def get_shard():
+    """The current thread's shard (registered on first use)"""
+    shard = getattr(_local, 'shard', None)
+    if shard is None:
+        shard = _local.shard = MetricShard()
+        with _shards_lock:
+            retire_dead_shards()
+            _shards.append((threading.current_thread(), shard))
+    return shard
+
+def snapshot():
+    """Sum of all shards of this process, as JSON-friendly lists"""
+    durations, statuses, sizes = {}, {}, {}
+    in_flight = 0
+    with _shards_lock:
+        retire_dead_shards()
+        shards = [shard for _, shard in _shards]
+        # The retired shard is only changed under the lock, so it is copied here
+        retired = MetricShard()
+        retired.absorb(_retired)
+        shards.append(retired)
+    for shard in shards:
+        # dict() copies are atomic under the GIL while the owning thread keeps writing
+        for key, values in dict(shard.durations).items():
+            total = durations.setdefault(key, [0] * len(values))
+            for i, value in enumerate(list(values)):
+                total[i] += value
+        for key, count in dict(shard.statuses).items():
+            statuses[key] = statuses.get(key, 0) + count
+        for key, values in dict(shard.sizes).items():
+            total = sizes.setdefault(key, [0, 0])
+            total[0] += values[0]
+            total[1] += values[1]
+        in_flight += shard.in_flight
+    return {
+        'pid': os.getpid(),
+        'durations': [[*key, values] for key, values in durations.items()],
+        'statuses': [[*key, count] for key, count in statuses.items()],
+        'sizes': [[*key, values] for key, values in sizes.items()],
+        'in_flight': in_flight,
+    }
+
+def write_snapshot():
+    """Write this process's snapshot to METRICS_DIR (atomically replaced)"""
+    metrics_dir = app.config.get('METRICS_DIR')
+    if not metrics_dir:
+        return
+    os.makedirs(metrics_dir, exist_ok=True)
+    path = os.path.join(metrics_dir, f'{os.getpid()}.json')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(snapshot(), f)
+    os.replace(path + '.tmp', path)
+
+def clear_snapshots():
+    """Remove snapshots of earlier server runs (called once before workers start)"""
+    metrics_dir = app.config.get('METRICS_DIR')
+    if not metrics_dir:
+        return
+    for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+        os.remove(path)
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def collect():
+    """Snapshots of every process (just this one without METRICS_DIR)"""
+    if not app.config.get('METRICS_DIR'):
+        return [snapshot()]
+    write_snapshot()
+    snapshots = []
+    for path in glob.glob(os.path.join(app.config['METRICS_DIR'], '*.json')):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        # Counters of exited workers still count; their in-flight requests do not
+        if not process_alive(data['pid']):
+            data['in_flight'] = 0
+        snapshots.append(data)
+    return snapshots
+
+def merge(snapshots):
+    durations, statuses, sizes = {}, {}, {}
+    in_flight = 0
+    for data in snapshots:
+        for endpoint, method, values in data['durations']:
+            total = durations.setdefault((endpoint, method), [0] * len(values))
+            for i, value in enumerate(values):
+                total[i] += value
+        for endpoint, method, status, count in data['statuses']:
+            statuses[(endpoint, method, status)] = statuses.get((endpoint, method, status), 0) + count
+        for endpoint, method, values in data['sizes']:
+            total = sizes.setdefault((endpoint, method), [0, 0])
+            total[0] += values[0]
+            total[1] += values[1]
+        in_flight += data['in_flight']
+    return durations, statuses, sizes, in_flight
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    durations, statuses, sizes, in_flight = merge(collect())
+    lines = [
+        '# HELP http_request_duration_seconds Request latency by endpoint.',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+    for (endpoint, method), values in sorted(durations.items()):
+        labels = f'endpoint="{endpoint}",method="{method}"'
+        cumulative = 0
+        for bound, count in zip([*LATENCY_BUCKETS, '+Inf'], values):
+            cumulative += count
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'http_request_duration_seconds_sum{{{labels}}} {values[-2]:.6f}')
+        lines.append(f'http_request_duration_seconds_count{{{labels}}} {values[-1]}')
+    
+    lines += ['# HELP http_requests_total Finished requests by endpoint and status code.', '# TYPE http_requests_total counter']
+    for (endpoint, method, status), count in sorted(statuses.items()):
+        lines.append(f'http_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}')
+    
+    lines += ['# HELP http_response_size_bytes Response body sizes by endpoint.', '# TYPE http_response_size_bytes summary']
+    for (endpoint, method), (total, count) in sorted(sizes.items()):
+        labels = f'endpoint="{endpoint}",method="{method}"'
+        lines.append(f'http_response_size_bytes_sum{{{labels}}} {total}')
+        lines.append(f'http_response_size_bytes_count{{{labels}}} {count}')
+    
+    lines += ['# HELP http_requests_in_flight Requests currently being handled.', '# TYPE http_requests_in_flight gauge']
+    lines.append(f'http_requests_in_flight {in_flight}')
+    return '\n'.join(lines) + '\n'
+
+class SnapshotWriter(threading.Thread):
+    """Writes this process's snapshot to METRICS_DIR periodically"""
+    
+    def __init__(self, interval):
+        super().__init__(name='metrics-writer', daemon=True)
+        self.interval = interval
+    
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                write_snapshot()
+            except OSError:
+                logger.exception('Could not write metrics snapshot')
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def start_snapshot_writer():
+    global _writer
+    if _writer is None and app.config.get('METRICS_DIR'):
+        with _writer_lock:
+            if _writer is None:
+                _writer = SnapshotWriter(app.config.get('METRICS_FLUSH_INTERVAL', 5))
+                _writer.start()
+
+def _reset_after_fork():
+    # A forked worker starts with its own (empty) counters and writer thread
+    global _local, _shards, _retired, _shards_lock, _writer, _writer_lock
+    _local = threading.local()
+    _shards = []
+    _retired = MetricShard()
+    _shards_lock = threading.Lock()
+    _writer = None
+    _writer_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    get_shard().in_flight += 1
+    start_snapshot_writer()
+
+@app.after_request
+def record_request(response):
+    # Streamed responses are timed up to the first byte; their size is unknown
+    started = g.pop('request_started', None)
+    if started is not None:
+        get_shard().in_flight -= 1
+        endpoint = request.endpoint or 'unmatched'
+        size = None if response.is_streamed else response.content_length
+        get_shard().observe(endpoint, request.method, response.status_code, time.perf_counter() - started, size)
+    return response
+
+@app.teardown_request
+def record_failed_request(error):
+    # after_request is skipped for unhandled exceptions
+    started = g.pop('request_started', None)
+    if started is not None:
+        get_shard().in_flight -= 1
+        get_shard().observe(request.endpoint or 'unmatched', request.method, 500, time.perf_counter() - started, None)
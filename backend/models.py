@@ -1,10 +1,20 @@
 from app import db
 from datetime import datetime
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
 from werkzeug.security import generate_password_hash, check_password_hash
-import random
+import json
+import logging
+import os
 import string
+import threading
 import re
 
+# /lan/fed/etpv5/release/<Release>/<Platform>/etautotest/..., compiled once for Issue.parse_testcase_path
+TESTCASE_PATH_PATTERN = re.compile(r'/lan/fed/etpv5/release/(\d+)/([^/]+)/etautotest/')
+
+logger = logging.getLogger(__name__)
+
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -36,6 +46,30 @@ class User(db.Model):
 
 class Issue(db.Model):
     __tablename__ = 'issues'
+    # (filter columns..., created_at): InnoDB appends id, so WHERE <filters> ORDER BY
+    # created_at DESC, id DESC is a range scan. The counter indexes (named as in
+    # migrate_comment_counters.sql) serve the other sorts. Check audit_query_plans.py
+    # after changing these.
+    __table_args__ = (
+        db.Index('ix_issues_status_created_at', 'status', 'created_at'),
+        db.Index('ix_issues_status_severity_created_at', 'status', 'severity', 'created_at'),
+        db.Index('ix_issues_severity_created_at', 'severity', 'created_at'),
+        db.Index('ix_issues_release_platform_created_at', 'release', 'platform', 'created_at'),
+        db.Index('ix_issues_release_target_created_at', 'release', 'target', 'created_at'),
+        db.Index('ix_issues_platform_created_at', 'platform', 'created_at'),
+        db.Index('ix_issues_build_created_at', 'build', 'created_at'),
+        db.Index('ix_issues_target_created_at', 'target', 'created_at'),
+        db.Index('ix_issues_reporter_name_created_at', 'reporter_name', 'created_at'),
+        db.Index('idx_issues_comment_count', 'comment_count', 'created_at'),  # sort=most_discussed
+        db.Index('idx_issues_has_verified_solution', 'has_verified_solution', 'created_at'),  # sort=has_solution
+        # (filter columns..., id): covering indexes for /api/admin/issues/ids, named as in
+        # run_migration.py and migrate_build_target.sql
+        db.Index('idx_issues_release', 'release'),
+        db.Index('idx_issues_platform', 'platform'),
+        db.Index('idx_issues_release_platform', 'release', 'platform'),
+        db.Index('idx_issues_build', 'build'),
+        db.Index('idx_issues_target', 'target'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -43,7 +77,7 @@ class Issue(db.Model):
     testcase_title = db.Column(db.String(500), nullable=False)
     testcase_path = db.Column(db.String(200), nullable=False)
     severity = db.Column(db.Enum('Low', 'Medium', 'High', 'Critical'), nullable=False)
-    test_case_ids = db.Column(db.String(200), nullable=False)  # Can contain multiple IDs separated by comma
+    test_case_ids = db.Column(db.String(200), nullable=False)  # Can contain multiple IDs separated by comma (see IssueTestCase)
     
     # Extracted path parameters
     release = db.Column(db.String(10))  # e.g., '251', '261', '231'
@@ -61,15 +95,23 @@ class Issue(db.Model):
     reporter_name = db.Column(db.String(100), nullable=False)
     status = db.Column(db.Enum('open', 'in_progress', 'resolved', 'closed', 'ccr'), default='open')
     ccr_number = db.Column(db.String(100))  # CCR number when status is 'ccr'
-    created_at = db.Column(db.DateTime, default=datetime.now)
+    created_at = db.Column(db.DateTime, default=datetime.now, index=True)  # InnoDB appends id, covering keyset pagination
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
     upvotes = db.Column(db.Integer, default=0)
     downvotes = db.Column(db.Integer, default=0)
     
+    # Denormalized comment counters, maintained by the comment routes
+    comment_count = db.Column(db.Integer, nullable=False, default=0)
+    has_verified_solution = db.Column(db.Boolean, nullable=False, default=False)
+    
+    # Bumped on every change to the issue or its comments/attachments (see bump_issue_versions)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
     # Relationships
     comments = db.relationship('Comment', backref='issue', lazy=True, cascade='all, delete-orphan')
     attachments = db.relationship('Attachment', backref='issue', lazy=True, cascade='all, delete-orphan')
-    tags = db.relationship('Tag', secondary='issue_tags', lazy='subquery', backref=db.backref('issues', lazy=True))
+    tags = db.relationship('Tag', secondary='issue_tags', lazy=True, backref=db.backref('issues', lazy=True))
+    test_cases = db.relationship('IssueTestCase', lazy=True, cascade='all, delete-orphan')
     
     @staticmethod
     def parse_testcase_path(path):
@@ -79,11 +121,8 @@ class Issue(db.Model):
         """
         if not path:
             return None, None
-            
-        # Regular expression to match the path pattern
-        pattern = r'/lan/fed/etpv5/release/(\d+)/([^/]+)/etautotest/'
-        match = re.match(pattern, path)
         
+        match = TESTCASE_PATH_PATTERN.match(path)
         if match:
             release = match.group(1)
             platform = match.group(2)
@@ -149,22 +188,68 @@ class Issue(db.Model):
         }
         return target_mapping.get(release, [])
     
+    @staticmethod
+    def split_test_case_ids(value):
+        """Split a comma separated test_case_ids value into distinct IDs, keeping their order"""
+        ids = []
+        for test_case_id in (value or '').split(','):
+            test_case_id = test_case_id.strip()
+            if test_case_id and test_case_id not in ids:
+                ids.append(test_case_id)
+        return ids
+    
+    @staticmethod
+    def test_case_filter(test_case_id):
+        """Filter clause for issues referencing `test_case_id`, served by the issue_test_cases index"""
+        return Issue.id.in_(
+            db.select(IssueTestCase.issue_id).where(IssueTestCase.test_case_id == test_case_id.strip())
+        )
+    
+    @staticmethod
+    def tag_filter(tag_names, match_all=True):
+        """
+        Filter clause for issues tagged with all (or, with match_all=False, any) of
+        `tag_names`. Resolved through the (tag_id, issue_id) index on issue_tags.
+        """
+        tag_ids = [tag_id for tag_id, in db.session.query(Tag.id).filter(Tag.name.in_(tag_names))]
+        if not tag_ids or (match_all and len(tag_ids) < len(set(tag_names))):
+            return db.false()
+        
+        tagged = db.select(IssueTag.issue_id).where(IssueTag.tag_id.in_(tag_ids))
+        if match_all and len(tag_ids) > 1:
+            tagged = tagged.group_by(IssueTag.issue_id).having(db.func.count(IssueTag.tag_id) == len(tag_ids))
+        return Issue.id.in_(tagged)
+    
     @staticmethod
     def generate_unique_test_case_id():
-        """Generate a unique test case ID in format: TC-YYYYMMDD-XXXX"""
-        while True:
-            # Get current date
-            date_str = datetime.now().strftime('%Y%m%d')
-            # Generate 4 random alphanumeric characters
-            random_chars = ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
-            test_case_id = f"TC-{date_str}-{random_chars}"
-            
-            # Check if this ID already exists
-            existing_issue = Issue.query.filter(Issue.test_case_ids.like(f"%{test_case_id}%")).first()
-            if not existing_issue:
-                return test_case_id
+        """Generate a unique test case ID in format: TC-YYYYMMDD-XXXX (see TestCaseIdAllocator)"""
+        return test_case_id_allocator.allocate()
     
-    def to_dict(self):
+    @staticmethod
+    def to_dict_list(issues):
+        """
+        Serialize a page of issues for list endpoints.
+        Tag names for the whole page are fetched with a single query instead of
+        a lazy load per issue; comment counters are read from the issue row.
+        """
+        issue_ids = [issue.id for issue in issues]
+        if not issue_ids:
+            return []
+        
+        tag_names = {issue_id: [] for issue_id in issue_ids}
+        tag_rows = db.session.query(IssueTag.issue_id, Tag.name).join(
+            Tag, Tag.id == IssueTag.tag_id
+        ).filter(IssueTag.issue_id.in_(issue_ids))
+        for issue_id, name in tag_rows:
+            tag_names[issue_id].append(name)
+        
+        return [issue.to_dict(tags=tag_names[issue.id]) for issue in issues]
+    
+    def to_dict(self, tags=None):
+        # Precomputed tag names are passed in by to_dict_list; otherwise fall back to the relationship
+        if tags is None:
+            tags = [tag.name for tag in self.tags]
+        
         return {
             'id': self.id,
             'testcase_title': self.testcase_title,
@@ -183,14 +268,23 @@ class Issue(db.Model):
             'ccr_number': self.ccr_number,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'tags': [tag.name for tag in self.tags],
-            'comment_count': len(self.comments),
-            'has_verified_solution': any(comment.is_verified_solution for comment in self.comments),
+            'tags': tags,
+            'comment_count': self.comment_count or 0,
+            'has_verified_solution': bool(self.has_verified_solution),
             'upvotes': self.upvotes,
             'downvotes': self.downvotes,
             'score': self.upvotes - self.downvotes
         }
 
+# FULLTEXT index used by the MySQL search backend (other databases use the LIKE fallback)
+db.event.listen(
+    Issue.__table__,
+    'after_create',
+    db.DDL(
+        'ALTER TABLE issues ADD FULLTEXT INDEX ft_issues_search (testcase_title, description, test_case_ids)'
+    ).execute_if(dialect='mysql')
+)
+
 class Tag(db.Model):
     __tablename__ = 'tags'
     
@@ -207,15 +301,37 @@ class Tag(db.Model):
 
 class IssueTag(db.Model):
     __tablename__ = 'issue_tags'
+    __table_args__ = (
+        db.Index('ix_issue_tags_tag_id_issue_id', 'tag_id', 'issue_id'),
+    )
+    
+    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id', ondelete='CASCADE'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True)
+
+class IssueTestCase(db.Model):
+    """One row per test case ID listed in Issue.test_case_ids, kept in sync by sync_test_case_rows"""
+    __tablename__ = 'issue_test_cases'
+    __table_args__ = (
+        db.Index('ix_issue_test_cases_test_case_id', 'test_case_id', 'issue_id'),
+    )
     
-    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id'), primary_key=True)
-    tag_id = db.Column(db.Integer, db.ForeignKey('tags.id'), primary_key=True)
+    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id', ondelete='CASCADE'), primary_key=True)
+    test_case_id = db.Column(db.String(200), primary_key=True)
+
+@db.event.listens_for(Issue.test_case_ids, 'set')
+def sync_test_case_rows(issue, value, oldvalue, initiator):
+    """Rebuild the issue_test_cases rows whenever test_case_ids is assigned"""
+    existing = {row.test_case_id: row for row in issue.test_cases}
+    issue.test_cases = [
+        existing.get(test_case_id) or IssueTestCase(test_case_id=test_case_id)
+        for test_case_id in Issue.split_test_case_ids(value)
+    ]
 
 class Comment(db.Model):
     __tablename__ = 'comments'
     
     id = db.Column(db.Integer, primary_key=True)
-    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id'), nullable=False)
+    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id', ondelete='CASCADE'), nullable=False)
     commenter_name = db.Column(db.String(100), nullable=False)
     content = db.Column(db.Text, nullable=False)
     is_verified_solution = db.Column(db.Boolean, default=False)
@@ -245,8 +361,8 @@ class Attachment(db.Model):
     __tablename__ = 'attachments'
     
     id = db.Column(db.Integer, primary_key=True)
-    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id'), nullable=False)
-    comment_id = db.Column(db.Integer, db.ForeignKey('comments.id'))
+    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id', ondelete='CASCADE'), nullable=False)
+    comment_id = db.Column(db.Integer, db.ForeignKey('comments.id', ondelete='CASCADE'))
     filename = db.Column(db.String(255), nullable=False)
     file_path = db.Column(db.String(500), nullable=False)
     file_size = db.Column(db.Integer)
@@ -264,4 +380,190 @@ class Attachment(db.Model):
             'mime_type': self.mime_type,
             'uploaded_by': self.uploaded_by,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        } 
\ No newline at end of file
+        }
+
+class SearchOutbox(db.Model):
+    __tablename__ = 'search_outbox'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    issue_id = db.Column(db.Integer, nullable=False, index=True)  # No FK: delete entries outlive the issue
+    action = db.Column(db.Enum('index', 'delete'), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.now, index=True)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+class BulkJob(db.Model):
+    """Progress of one admin bulk operation (see jobs.py), visible to every server process"""
+    __tablename__ = 'bulk_jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    operation = db.Column(db.String(20), nullable=False)
+    params = db.Column(db.Text)  # JSON
+    status = db.Column(db.Enum('queued', 'running', 'completed', 'failed'), nullable=False, default='queued')
+    total = db.Column(db.Integer, nullable=False, default=0)
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    affected = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    failed_issue_ids = db.Column(db.Text)  # JSON list, first 1000
+    errors = db.Column(db.Text)  # JSON list, first 20
+    created_at = db.Column(db.DateTime, default=datetime.now, index=True)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        end = self.finished_at or (datetime.now() if self.started_at else None)
+        elapsed = (end - self.started_at).total_seconds() if self.started_at and end else 0.0
+        return {
+            'id': self.id,
+            'operation': self.operation,
+            'params': json.loads(self.params or '{}'),
+            'status': self.status,
+            'total': self.total,
+            'processed': self.processed,
+            'affected': self.affected,
+            'failed': self.failed,
+            'failed_issue_ids': json.loads(self.failed_issue_ids or '[]'),
+            'errors': json.loads(self.errors or '[]'),
+            'progress': round(self.processed / self.total, 4) if self.total else 1.0,
+            'elapsed': round(elapsed, 3),
+            'throughput': round(self.processed / elapsed, 1) if elapsed else None,  # issues/s
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class TestCaseIdCounter(db.Model):
+    """Last test case ID sequence number handed out per day"""
+    __tablename__ = 'test_case_id_counters'
+    
+    day = db.Column(db.String(8), primary_key=True)  # YYYYMMDD
+    last_value = db.Column(db.Integer, nullable=False, default=0)
+
+class TestCaseIdAllocator:
+    """
+    Hands out TC-YYYYMMDD-XXXX IDs from per-day counters, XXXX being the
+    sequence number in base 36. Each process reserves TEST_CASE_ID_BLOCK_SIZE
+    numbers at a time with one atomic counter update (in its own transaction),
+    so most IDs are allocated without a counter update. IDs already listed on
+    an issue (older issues, or edits made after the block was reserved) are
+    skipped; issues may still share an ID on purpose by listing it themselves.
+    """
+    ALPHABET = string.digits + string.ascii_uppercase
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.day = None
+        self.available = []
+    
+    @classmethod
+    def format(cls, day, number):
+        suffix = ''
+        while number:
+            number, digit = divmod(number, len(cls.ALPHABET))
+            suffix = cls.ALPHABET[digit] + suffix
+        return f"TC-{day}-{suffix.rjust(4, '0')}"
+    
+    def reserve_block(self, day, size):
+        """Atomically advance the day's counter by `size`; returns the reserved IDs"""
+        counters = TestCaseIdCounter.__table__
+        while True:
+            try:
+                with db.engine.begin() as connection:
+                    updated = connection.execute(
+                        counters.update().where(counters.c.day == day)
+                        .values(last_value=counters.c.last_value + size)
+                    ).rowcount
+                    if not updated:
+                        connection.execute(counters.insert().values(day=day, last_value=size))
+                    last_value = connection.execute(
+                        db.select(counters.c.last_value).where(counters.c.day == day)
+                    ).scalar()
+                    
+                    # Skip IDs already taken by issues created before the counters existed
+                    # (issue_test_cases also holds the IDs of issues listing several)
+                    candidates = [self.format(day, number) for number in range(last_value - size + 1, last_value + 1)]
+                    taken = set(connection.execute(
+                        db.select(IssueTestCase.test_case_id).where(IssueTestCase.test_case_id.in_(candidates))
+                    ).scalars())
+                return [candidate for candidate in candidates if candidate not in taken]
+            except IntegrityError:
+                # Another process created the day's counter first; retry as an update
+                continue
+    
+    def allocate(self):
+        return self.allocate_many(1)[0]
+    
+    def allocate_many(self, count):
+        """Allocate `count` IDs, reserving a block large enough for all of them at once"""
+        day = datetime.now().strftime('%Y%m%d')
+        with self.lock:
+            if day != self.day:
+                self.day, self.available = day, []
+            allocated = []
+            while len(allocated) < count:
+                needed = count - len(allocated)
+                while len(self.available) < needed:
+                    block_size = max(current_app.config.get('TEST_CASE_ID_BLOCK_SIZE', 20), needed - len(self.available))
+                    self.available.extend(self.reserve_block(day, block_size))
+                candidates, self.available = self.available[:needed], self.available[needed:]
+                # An edit may have listed a reserved ID on another issue since the block was reserved
+                taken = set(db.session.execute(
+                    db.select(IssueTestCase.test_case_id).where(IssueTestCase.test_case_id.in_(candidates))
+                ).scalars())
+                if taken:
+                    logger.warning('Skipped test case IDs already listed on other issues: %s', ', '.join(sorted(taken)))
+                allocated.extend(candidate for candidate in candidates if candidate not in taken)
+            return allocated
+
+test_case_id_allocator = TestCaseIdAllocator()
+
+# A forked worker must not hand out IDs from a block its parent reserved
+os.register_at_fork(after_in_child=test_case_id_allocator.__init__)
+
+class Vote(db.Model):
+    """Vote ledger: one row per voter and target, so repeated votes are detected by index lookup"""
+    __tablename__ = 'votes'
+    __table_args__ = (
+        db.UniqueConstraint('target_type', 'target_id', 'voter', name='uq_votes_target_voter'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    target_type = db.Column(db.Enum('issue', 'comment'), nullable=False)
+    target_id = db.Column(db.Integer, nullable=False)  # No FK: targets live in two tables
+    voter = db.Column(db.String(64), nullable=False)  # 'user:<id>' or 'anon:<session token>'
+    value = db.Column(db.SmallInteger, nullable=False)  # 1 or -1
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+def touched_issue_ids(session):
+    """
+    Issue IDs affected by the pending flush, as (changed, deleted).
+    Comment and attachment changes count as changes to their issue.
+    """
+    changed, deleted = set(), set()
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Issue) and obj.id is not None:
+            changed.add(obj.id)
+        elif isinstance(obj, (Comment, Attachment)) and obj.issue_id is not None:
+            changed.add(obj.issue_id)
+    for obj in session.deleted:
+        if isinstance(obj, Issue):
+            deleted.add(obj.id)
+        elif isinstance(obj, (Comment, Attachment)) and obj.issue_id is not None:
+            changed.add(obj.issue_id)
+    return changed - deleted, deleted
+
+def bump_issue_versions(session, flush_context):
+    """after_flush hook: increment Issue.version for every issue touched by the flush"""
+    changed, _ = touched_issue_ids(session)
+    if changed:
+        issues = Issue.__table__
+        session.connection().execute(
+            issues.update().where(issues.c.id.in_(changed)).values(
+                version=issues.c.version + 1,
+                updated_at=issues.c.updated_at  # Child changes must not count as edits
+            )
+        )
+
+db.event.listen(db.session, 'after_flush', bump_issue_versions)
@@ -0,0 +1,132 @@
+"""
+Keyset (cursor) pagination helpers for the issue listing endpoints.
+
+Cursors are opaque URL-safe tokens holding the sort key values of the last row
+on the previous page, so every page is a single index range scan regardless of
+how deep it is.
+"""
+
+import base64
+import json
+from datetime import datetime
+from app import db
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded or does not match the requested sort"""
+
+def _encode(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode().rstrip('=')
+
+def encode_cursor(sort, values):
+    """Encode the sort key values of the last row of a page"""
+    return _encode({
+        's': sort,
+        'v': [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    })
+
+def encode_offset_cursor(sort, offset):
+    """Encode a position in a ranked result list (used for relevance ordering)"""
+    return _encode({'s': sort, 'o': offset})
+
+def cursor_offset(payload):
+    offset = payload.get('o')
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursor('Cursor does not match the requested sort order')
+    return offset
+
+def decode_cursor(token, sort):
+    """Decode a cursor token; returns the payload dict"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(payload, dict) or payload.get('s') != sort:
+        raise InvalidCursor('Cursor does not match the requested sort order')
+    return payload
+
+def cursor_value(column, value):
+    """Check one decoded cursor value against the column's Python type (timestamps are parsed)"""
+    if value is None:
+        if not column.nullable:
+            raise InvalidCursor('Invalid cursor value')
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise InvalidCursor('Invalid cursor timestamp')
+    # JSON booleans are ints to Python; keep them apart from integer columns
+    if not isinstance(value, python_type) or isinstance(value, bool) != (python_type is bool):
+        raise InvalidCursor('Invalid cursor value')
+    return value
+
+def cursor_values(payload, columns):
+    """Convert decoded cursor values back to column types; raises InvalidCursor on a mismatch"""
+    values = payload.get('v')
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursor('Cursor does not match the requested sort order')
+    return [cursor_value(column, value) for column, value in zip(columns, values)]
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+def _after(column, value):
+    """Rows after `value` in descending order of `column`; NULLs sort last (as in MySQL and SQLite)"""
+    if value is None:
+        return db.false()
+    if isinstance(value, bool):
+        # A bound parameter: SQLAlchemy only allows = and != against the True/False constants
+        value = db.literal(value, column.type)
+    after = column < value
+    return db.or_(after, column.is_(None)) if column.nullable else after
+
+def keyset_filter(columns, values):
+    """
+    Rows strictly after the given key in descending order of `columns`.
+    Expanded to (a < x) OR (a = x AND b < y) ... so MySQL can use a range scan
+    on the matching composite index.
+    """
+    clauses = []
+    for position, (column, value) in enumerate(zip(columns, values)):
+        equal_prefix = [_equal(columns[i], values[i]) for i in range(position)]
+        clauses.append(db.and_(*equal_prefix, _after(column, value)))
+    return db.or_(*clauses)
+
+def keyset_page(query, sort, columns, cursor, per_page):
+    """
+    Fetch one page ordered by `columns` descending, starting after `cursor`.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        query = query.filter(keyset_filter(columns, cursor_values(decode_cursor(cursor, sort), columns)))
+    
+    rows = query.order_by(*[column.desc() for column in columns]).limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(sort, [getattr(last, column.key) for column in columns])
+    return items, next_cursor
+
+def count_rows(query, mode):
+    """
+    Count rows for `query` according to mode: 'exact' runs COUNT(*), 'approx'
+    uses the MySQL optimizer's row estimate from EXPLAIN (exact on other databases),
+    anything else returns None.
+    """
+    if mode == 'exact':
+        return query.order_by(None).count()
+    if mode != 'approx':
+        return None
+    if db.engine.dialect.name != 'mysql':
+        return query.order_by(None).count()
+    
+    compiled = query.order_by(None).statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True}
+    )
+    plan = db.session.connection().exec_driver_sql('EXPLAIN ' + str(compiled), compiled.params).mappings().first()
+    if not plan or plan.get('rows') is None:
+        return None
+    return int(plan['rows'] * float(plan.get('filtered') or 100) / 100)
@@ -0,0 +1,134 @@
+"""
+Per-request SQL statistics and N+1 detection.
+
+Engine events count and time every statement executed by the current thread
+while a QueryStats collector is active. Requests get a collector when the app
+runs in debug mode or SQL_QUERY_STATS is enabled: the totals are logged and
+returned in X-Query-Count / X-Query-Time-Ms / X-Query-Max-Repeats headers,
+and a statement shape (the SQL with IN lists collapsed) executed more than
+SQL_REPEAT_THRESHOLD times in one request triggers an NPlusOneWarning.
+
+Tests can measure any block of code, including test client requests:
+
+    with count_queries() as stats:
+        client.get('/api/issues')
+    assert stats.count <= 5, stats.summary()
+"""
+
+import logging
+import re
+import threading
+import time
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, request
+from sqlalchemy.engine import Engine
+from app import app, db
+
+logger = logging.getLogger(__name__)
+
+# Runs of bind placeholders (?, %s, %(name)s, :name), i.e. expanded IN lists and multi-row VALUES
+PLACEHOLDER_LIST = re.compile(r'(\?|%s|%\(\w+\)s|:\w+)(\s*,\s*(\?|%s|%\(\w+\)s|:\w+))+')
+WHITESPACE = re.compile(r'\s+')
+
+class NPlusOneWarning(UserWarning):
+    """The same statement ran more often in one request than SQL_REPEAT_THRESHOLD allows"""
+
+def statement_shape(statement):
+    return PLACEHOLDER_LIST.sub('?, ...', WHITESPACE.sub(' ', statement).strip())
+
+class QueryStats:
+    """Statements executed while the collector was active"""
+    
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.shapes = Counter()
+    
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+    
+    @property
+    def max_repeats(self):
+        return max(self.shapes.values(), default=0)
+    
+    def repeated(self, threshold):
+        """(shape, count) of statements executed more than `threshold` times"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+    
+    def summary(self):
+        return f'{self.count} queries in {self.duration * 1000:.1f} ms, max {self.max_repeats} of one shape'
+
+_local = threading.local()
+
+def active_collectors():
+    if not hasattr(_local, 'collectors'):
+        _local.collectors = []
+    return _local.collectors
+
+@contextmanager
+def count_queries():
+    """Collect the statements executed by this thread inside the block"""
+    stats = QueryStats()
+    collectors = active_collectors()
+    collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        collectors.remove(stats)
+
+@db.event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_local, 'collectors', None):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+@db.event.listens_for(Engine, 'after_cursor_execute')
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    collectors = getattr(_local, 'collectors', None)
+    started = conn.info.get('query_started')
+    if not collectors or not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    for stats in collectors:
+        stats.record(statement, duration)
+
+def query_stats_enabled():
+    return app.debug or app.config.get('SQL_QUERY_STATS', False)
+
+@app.before_request
+def start_query_stats():
+    if query_stats_enabled():
+        g.query_stats = QueryStats()
+        active_collectors().append(g.query_stats)
+
+def finish_query_stats():
+    """Detach the request's collector; returns it, or None when stats are off"""
+    stats = g.pop('query_stats', None)
+    if stats is not None and stats in active_collectors():
+        active_collectors().remove(stats)
+    return stats
+
+@app.after_request
+def report_query_stats(response):
+    stats = finish_query_stats()
+    if stats is None:
+        return response
+    
+    response.headers['X-Query-Count'] = str(stats.count)
+    response.headers['X-Query-Time-Ms'] = f'{stats.duration * 1000:.1f}'
+    response.headers['X-Query-Max-Repeats'] = str(stats.max_repeats)
+    logger.info('%s %s: %s', request.method, request.path, stats.summary())
+    
+    for shape, count in stats.repeated(app.config.get('SQL_REPEAT_THRESHOLD', 10)):
+        message = f'{request.method} {request.path} ran this statement {count} times (possible N+1): {shape[:300]}'
+        logger.warning(message)
+        warnings.warn(message, NPlusOneWarning)
+    return response
+
+@app.teardown_request
+def discard_query_stats(error):
+    # after_request does not run for unhandled exceptions
+    finish_query_stats()
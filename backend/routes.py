@@ -1,6 +1,20 @@
-from flask import request, jsonify, send_file, session
+from flask import Response, request, jsonify, send_file, session, stream_with_context
 from app import app, db
 from models import Issue, Comment, Tag, Attachment, User
+from search import SearchLimitExceeded, get_search_backend
+from facets import get_facets
+from cache import cached_response, invalidate, issue_tag, response_cache
+from pagination import InvalidCursor, keyset_page, count_rows, decode_cursor, cursor_offset, encode_offset_cursor
+from etags import conditional_issue, current_issue_etag, listing_etag, not_modified, version_query, with_etag
+from votes import cast_vote
+from tags import parse_tag_names, resolve_tags
+from bulk import delete_issues
+from jobs import JobError, submit_job, get_job, list_jobs
+from export import EXPORT_FORMATS, export_stream
+from importer import InvalidImport, parse_body, import_issues
+from db_pool import pool_status
+from metrics import render as render_metrics
+import query_stats  # per-request SQL statistics hooks
 import os
 from werkzeug.utils import secure_filename
 import markdown
@@ -123,6 +137,7 @@ def delete_issue(issue_id):
     issue = Issue.query.get_or_404(issue_id)
     db.session.delete(issue)
     db.session.commit()
+    invalidate(issue_tag(issue_id), 'issues')
     
     return jsonify({'message': 'Issue deleted successfully'})
 
@@ -130,8 +145,16 @@ def delete_issue(issue_id):
 @admin_required
 def delete_comment(comment_id):
     comment = Comment.query.get_or_404(comment_id)
+    
+    counter_updates = {Issue.comment_count: Issue.comment_count - 1}
+    if comment.is_verified_solution:
+        # verify_solution keeps at most one verified comment per issue
+        counter_updates[Issue.has_verified_solution] = False
+    Issue.query.filter_by(id=comment.issue_id).update(counter_updates, synchronize_session=False)
+    
     db.session.delete(comment)
     db.session.commit()
+    invalidate(issue_tag(comment.issue_id))
     return jsonify({'message': 'Comment deleted successfully'})
 
 @app.route('/api/admin/issues/<int:issue_id>/edit', methods=['PUT'])
@@ -153,15 +176,10 @@ def admin_edit_issue(issue_id):
     
     # Update tags if provided
     if 'tags' in data:
-        issue.tags.clear()
-        for tag_name in data['tags']:
-            tag = Tag.query.filter_by(name=tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.session.add(tag)
-            issue.tags.append(tag)
+        issue.tags = resolve_tags(parse_tag_names(data['tags']))
     
     db.session.commit()
+    invalidate(issue_tag(issue_id), 'issues', 'tags')
     
     return jsonify(issue.to_dict())
 
@@ -175,6 +193,7 @@ def get_all_issue_ids():
     platform = request.args.get('platform')
     build = request.args.get('build')
     target = request.args.get('target')
+    test_case_id = request.args.get('test_case_id')
     
     query = Issue.query
     
@@ -190,14 +209,28 @@ def get_all_issue_ids():
         query = query.filter(Issue.build == build)
     if target:
         query = query.filter(Issue.target == target)
-    
-    # Get all issue IDs that match the filters
-    issue_ids = [issue.id for issue in query.all()]
-    
-    return jsonify({
-        'issue_ids': issue_ids,
-        'total': len(issue_ids)
-    })
+    if test_case_id:
+        query = query.filter(Issue.test_case_filter(test_case_id))
+    
+    # Stream the matching IDs straight from a server-side cursor
+    ids_query = query.with_entities(Issue.id).order_by(Issue.id).yield_per(5000)
+    
+    def generate():
+        total = 0
+        batch = []
+        yield '{"issue_ids": ['
+        for issue_id, in ids_query:
+            batch.append(str(issue_id))
+            if len(batch) == 5000:
+                yield (',' if total else '') + ','.join(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            yield (',' if total else '') + ','.join(batch)
+            total += len(batch)
+        yield f'], "total": {total}}}'
+    
+    return app.response_class(stream_with_context(generate()), mimetype='application/json')
 
 @app.route('/api/admin/issues/bulk-delete', methods=['POST'])
 @admin_required
@@ -210,21 +243,59 @@ def bulk_delete_issues():
         return jsonify({'error': 'No issue IDs provided'}), 400
     
     try:
-        # Delete issues from database
-        issues_to_delete = Issue.query.filter(Issue.id.in_(issue_ids)).all()
-        for issue in issues_to_delete:
-            db.session.delete(issue)
-        
-        db.session.commit()
+        # Chunked set-based DELETEs; children go through ON DELETE CASCADE
+        deleted_count = delete_issues(issue_ids)
         
         return jsonify({
-            'message': f'Successfully deleted {len(issues_to_delete)} issues',
-            'deleted_count': len(issues_to_delete)
+            'message': f'Successfully deleted {deleted_count} issues',
+            'deleted_count': deleted_count
         })
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': f'Failed to delete issues: {str(e)}'}), 500
 
+@app.route('/api/admin/jobs', methods=['POST'])
+@admin_required
+def create_bulk_job():
+    """Start a background bulk operation (delete, status, move_to_ccr or retag) on a list of issues"""
+    data = request.json or {}
+    try:
+        job = submit_job(data.get('operation'), data.get('issue_ids') or [], data.get('params'))
+    except JobError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(job.to_dict()), 202
+
+@app.route('/api/admin/jobs', methods=['GET'])
+@admin_required
+def get_bulk_jobs():
+    return jsonify([job.to_dict() for job in list_jobs()])
+
+@app.route('/api/admin/jobs/<job_id>', methods=['GET'])
+@admin_required
+def get_bulk_job(job_id):
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/admin/cache', methods=['GET'])
+@admin_required
+def get_cache_stats():
+    """Response cache hit/miss counters for this process"""
+    return jsonify(response_cache.info())
+
+@app.route('/api/admin/cache', methods=['DELETE'])
+@admin_required
+def clear_cache():
+    response_cache.clear()
+    return jsonify({'message': 'Cache cleared'})
+
+@app.route('/api/admin/pool', methods=['GET'])
+@admin_required
+def get_pool_stats():
+    """Database connection pool occupancy and checkout wait times for this process"""
+    return jsonify(pool_status(db.engine))
+
 # Helper function to save file
 def save_file(file, folder='uploads'):
     if file and file.filename:
@@ -236,25 +307,44 @@ def save_file(file, folder='uploads'):
         return filename, file_path
     return None, None
 
-# Helper function to index issue in Elasticsearch
-def index_issue(issue):
-    doc = {
-        'testcase_title': issue.testcase_title,
-        'testcase_path': issue.testcase_path,
-        'severity': issue.severity,
-        'test_case_ids': issue.test_case_ids,
-        'release': issue.release,
-        'platform': issue.platform,
-        'build': issue.build,
-        'target': issue.target,
-        'description': issue.description,
-        'additional_comments': issue.additional_comments,
-        'reporter_name': issue.reporter_name,
-        'status': issue.status,
-        'tags': [tag.name for tag in issue.tags],
-        'created_at': issue.created_at.isoformat() if issue.created_at else None
-    }
-    es.index(index='issues', id=issue.id, body=doc)
+# Sort keys accepted by the issue listing endpoints (all descending, id breaks ties)
+ISSUE_SORT_KEYS = {
+    'newest': (Issue.created_at, Issue.id),
+    'most_discussed': (Issue.comment_count, Issue.created_at, Issue.id),
+    'has_solution': (Issue.has_verified_solution, Issue.created_at, Issue.id),
+}
+
+# Filters accepted by the facet and export endpoints (same meaning as in /api/search)
+ISSUE_FILTER_KEYS = ('q', 'status', 'severity', 'release', 'platform', 'build', 'target', 'test_case_id', 'reporter_name', 'tags', 'tag_mode')
+
+def request_filters():
+    return {key: request.args.get(key) for key in ISSUE_FILTER_KEYS if request.args.get(key)}
+
+def filter_issues(query, filters, complete=False):
+    """Apply a dict of ISSUE_FILTER_KEYS values to an Issue query (see SearchBackend.filter for `complete`)"""
+    if filters.get('q'):
+        query = get_search_backend().filter(query, filters['q'], complete)
+    if filters.get('status'):
+        query = query.filter(Issue.status == filters['status'])
+    if filters.get('severity'):
+        query = query.filter(Issue.severity == filters['severity'])
+    if filters.get('release'):
+        query = query.filter(Issue.release == filters['release'])
+    if filters.get('platform'):
+        query = query.filter(Issue.platform == filters['platform'])
+    if filters.get('build'):
+        query = query.filter(Issue.build == filters['build'])
+    if filters.get('target'):
+        query = query.filter(Issue.target == filters['target'])
+    if filters.get('test_case_id'):
+        query = query.filter(Issue.test_case_filter(filters['test_case_id']))
+    if filters.get('reporter_name'):
+        query = query.filter(Issue.reporter_name == filters['reporter_name'])
+    if filters.get('tags'):
+        tag_names = parse_tag_names(filters['tags'])
+        if tag_names:
+            query = query.filter(Issue.tag_filter(tag_names, match_all=filters.get('tag_mode') != 'any'))
+    return query
 
 # Issues endpoints
 @app.route('/api/issues', methods=['GET'])
@@ -268,6 +358,9 @@ def get_issues():
     build = request.args.get('build')
     target = request.args.get('target')
     test_case_id = request.args.get('test_case_id')
+    sort = request.args.get('sort', 'newest')
+    if sort not in ISSUE_SORT_KEYS:
+        sort = 'newest'
     
     query = Issue.query
     
@@ -284,18 +377,51 @@ def get_issues():
     if target:
         query = query.filter(Issue.target == target)
     if test_case_id:
-        query = query.filter(Issue.test_case_ids == test_case_id)
+        query = query.filter(Issue.test_case_filter(test_case_id))
+    
+    sort_columns = ISSUE_SORT_KEYS[sort]
+    
+    # Keyset pagination when a cursor is passed (empty cursor = first page)
+    if 'cursor' in request.args:
+        cursor = request.args.get('cursor')
+        count = request.args.get('count')
+        try:
+            # Revalidation: compare against the page's version rows before loading issues
+            if request.if_none_match:
+                rows, _ = keyset_page(version_query(query, sort_columns), sort, sort_columns, cursor, per_page)
+                response = not_modified(listing_etag(rows, count_rows(query, count)))
+                if response is not None:
+                    return response
+            issues, next_cursor = keyset_page(query, sort, sort_columns, cursor, per_page)
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        total = count_rows(query, count)
+        return with_etag(jsonify({
+            'issues': Issue.to_dict_list(issues),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+            'total': total
+        }), listing_etag(issues, total))
+    
+    order_by = [column.desc() for column in sort_columns]
+    if request.if_none_match:
+        rows = version_query(query).order_by(*order_by).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+        response = not_modified(listing_etag(rows.items, rows.total))
+        if response is not None:
+            return response
     
-    issues = query.order_by(Issue.created_at.desc()).paginate(
+    issues = query.order_by(*order_by).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
-    return jsonify({
-        'issues': [issue.to_dict() for issue in issues.items],
+    return with_etag(jsonify({
+        'issues': Issue.to_dict_list(issues.items),
         'total': issues.total,
         'pages': issues.pages,
         'current_page': page
-    })
+    }), listing_etag(issues.items, issues.total))
 
 @app.route('/api/issues', methods=['POST'])
 def create_issue():
@@ -346,18 +472,7 @@ def create_issue():
     )
     
     # Handle tags
-    tags_input = data.get('tags', [])
-    if isinstance(tags_input, str):
-        tag_names = [tag.strip() for tag in tags_input.split(',') if tag.strip()]
-    else:
-        tag_names = tags_input
-    
-    for tag_name in tag_names:
-        tag = Tag.query.filter_by(name=tag_name).first()
-        if not tag:
-            tag = Tag(name=tag_name)
-            db.session.add(tag)
-        issue.tags.append(tag)
+    issue.tags = resolve_tags(parse_tag_names(data.get('tags', [])))
     
     db.session.add(issue)
     db.session.commit()
@@ -378,10 +493,31 @@ def create_issue():
                 db.session.add(attachment)
     
     db.session.commit()
+    invalidate('issues', 'tags')
     
     return jsonify(issue.to_dict()), 201
 
+@app.route('/api/issues/import', methods=['POST'])
+def import_issues_bulk():
+    """Create many issues from NDJSON or a JSON array; returns a result per row"""
+    try:
+        rows = parse_body(request.get_data(), request.content_type)
+    except InvalidImport as e:
+        return jsonify({'error': str(e)}), 400
+    if not rows:
+        return jsonify({'error': 'No issues provided'}), 400
+    
+    results = import_issues(rows)
+    created = sum(1 for result in results if 'id' in result)
+    return jsonify({
+        'created': created,
+        'failed': len(results) - created,
+        'results': results
+    })
+
 @app.route('/api/issues/<int:issue_id>', methods=['GET'])
+@conditional_issue
+@cached_response(tags=lambda issue_id: [issue_tag(issue_id)], vary=lambda issue_id: current_issue_etag())
 def get_issue(issue_id):
     issue = Issue.query.get_or_404(issue_id)
     issue_dict = issue.to_dict()
@@ -389,7 +525,7 @@ def get_issue(issue_id):
     comments = Comment.query.filter_by(issue_id=issue_id).order_by(Comment.created_at.desc()).all()
     issue_dict['comments'] = [comment.to_dict() for comment in comments]
     issue_dict['attachments'] = [att.to_dict() for att in issue.attachments]
-    return jsonify(issue_dict)
+    return jsonify(issue_dict)  # conditional_issue sets the ETag
 
 @app.route('/api/issues/<int:issue_id>', methods=['PUT'])
 def update_issue(issue_id):
@@ -423,15 +559,10 @@ def update_issue(issue_id):
     
     # Update tags if provided
     if 'tags' in data:
-        issue.tags.clear()
-        for tag_name in data['tags']:
-            tag = Tag.query.filter_by(name=tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.session.add(tag)
-            issue.tags.append(tag)
+        issue.tags = resolve_tags(parse_tag_names(data['tags']))
     
     db.session.commit()
+    invalidate(issue_tag(issue_id), 'issues', 'tags')
     
     return jsonify(issue.to_dict())
 
@@ -448,6 +579,7 @@ def move_to_ccr(issue_id):
     issue.ccr_number = data['ccr_number']
     
     db.session.commit()
+    invalidate(issue_tag(issue_id), 'issues')
     
     return jsonify(issue.to_dict())
 
@@ -469,6 +601,10 @@ def create_comment(issue_id):
     )
     
     db.session.add(comment)
+    # Keep the denormalized counter in the same transaction as the insert
+    Issue.query.filter_by(id=issue_id).update(
+        {Issue.comment_count: Issue.comment_count + 1}, synchronize_session=False
+    )
     db.session.commit()
     
     # Handle file attachments
@@ -488,6 +624,7 @@ def create_comment(issue_id):
                 db.session.add(attachment)
     
     db.session.commit()
+    invalidate(issue_tag(issue_id))
     
     return jsonify(comment.to_dict()), 201
 
@@ -505,39 +642,46 @@ def verify_solution(comment_id):
     # Update issue status to resolved
     issue = Issue.query.get_or_404(comment.issue_id)
     issue.status = 'resolved'
+    issue.has_verified_solution = True
     
     db.session.commit()
+    invalidate(issue_tag(issue.id), 'issues')
     
     return jsonify(comment.to_dict())
 
 # Voting endpoints
+def vote_response(target_type, target_id, value):
+    counts = cast_vote(target_type, target_id, value)
+    if counts is None:
+        return jsonify({'error': f'{target_type.capitalize()} not found'}), 404
+    return jsonify(counts)
+
 @app.route('/api/issues/<int:issue_id>/upvote', methods=['POST'])
 def upvote_issue(issue_id):
-    issue = Issue.query.get_or_404(issue_id)
-    issue.upvotes += 1
-    db.session.commit()
-    return jsonify(issue.to_dict())
+    return vote_response('issue', issue_id, 1)
 
 @app.route('/api/issues/<int:issue_id>/downvote', methods=['POST'])
 def downvote_issue(issue_id):
-    issue = Issue.query.get_or_404(issue_id)
-    issue.downvotes += 1
-    db.session.commit()
-    return jsonify(issue.to_dict())
+    return vote_response('issue', issue_id, -1)
 
 @app.route('/api/comments/<int:comment_id>/upvote', methods=['POST'])
 def upvote_comment(comment_id):
-    comment = Comment.query.get_or_404(comment_id)
-    comment.upvotes += 1
-    db.session.commit()
-    return jsonify(comment.to_dict())
+    return vote_response('comment', comment_id, 1)
 
 @app.route('/api/comments/<int:comment_id>/downvote', methods=['POST'])
 def downvote_comment(comment_id):
-    comment = Comment.query.get_or_404(comment_id)
-    comment.downvotes += 1
-    db.session.commit()
-    return jsonify(comment.to_dict())
+    return vote_response('comment', comment_id, -1)
+
+def parse_page_size(value, default=20):
+    """Page size from a query or JSON value, clamped to SEARCH_MAX_SIZE; raises TypeError/ValueError if invalid"""
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+        raise ValueError(value)
+    size = int(value)
+    if size < 1:
+        raise ValueError(value)
+    return min(size, app.config.get('SEARCH_MAX_SIZE', 100))
 
 # Search endpoint
 @app.route('/api/search', methods=['GET', 'POST'])
@@ -554,7 +698,13 @@ def search_issues():
         test_case_id = data.get('test_case_id')
         reporter_name = data.get('reporter_name')
         tags = data.get('tags', [])
-        size = data.get('size', 20)
+        if isinstance(tags, str):
+            tags = tags.split(',')
+        tag_mode = data.get('tag_mode', 'all')
+        size = data.get('size')
+        sort = data.get('sort')
+        cursor = data.get('cursor')
+        count = data.get('count')
         from_date = data.get('from_date')
         to_date = data.get('to_date')
     else:
@@ -568,22 +718,27 @@ def search_issues():
         test_case_id = request.args.get('test_case_id')
         reporter_name = request.args.get('reporter_name')
         tags = request.args.get('tags', '').split(',') if request.args.get('tags') else []
-        size = request.args.get('size', 20, type=int)
+        tag_mode = request.args.get('tag_mode', 'all')
+        size = request.args.get('size')
+        sort = request.args.get('sort')
+        cursor = request.args.get('cursor')
+        count = request.args.get('count')
         from_date = request.args.get('from_date')
         to_date = request.args.get('to_date')
 
-    # Use only SQLAlchemy for all search and filters
+    try:
+        size = parse_page_size(size)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'size must be a positive integer'}), 400
+
+    # Results are ranked by relevance for text searches unless another sort is requested
+    if not sort:
+        sort = 'relevance' if query else 'newest'
+    if sort not in ISSUE_SORT_KEYS and not (sort == 'relevance' and query):
+        sort = 'newest'
+
     db_query = Issue.query
 
-    # Full-text search (case-insensitive, partial match)
-    if query:
-        db_query = db_query.filter(
-            db.or_(
-                Issue.testcase_title.ilike(f'%{query}%'),
-                Issue.description.ilike(f'%{query}%'),
-                Issue.test_case_ids.ilike(f'%{query}%')
-            )
-        )
     if status:
         db_query = db_query.filter(Issue.status == status)
     if severity:
@@ -597,37 +752,74 @@ def search_issues():
     if target:
         db_query = db_query.filter(Issue.target == target)
     if test_case_id:
-        db_query = db_query.filter(Issue.test_case_ids == test_case_id)
+        db_query = db_query.filter(Issue.test_case_filter(test_case_id))
     if reporter_name:
         db_query = db_query.filter(Issue.reporter_name == reporter_name)
     if tags:
         valid_tags = [tag.strip() for tag in tags if tag.strip()]
         if valid_tags:
-            # This is a simplified tag search - in production you'd want a proper tag relationship
-            pass
+            db_query = db_query.filter(Issue.tag_filter(valid_tags, match_all=tag_mode != 'any'))
     # Date range filter (if needed)
     # if from_date or to_date:
     #     ...
 
-    issues = db_query.order_by(Issue.created_at.desc()).limit(size).all()
+    # Full-text search through the configured backend (MySQL FULLTEXT or Python fallback)
+    search_backend = get_search_backend()
+    try:
+        if sort == 'relevance':
+            # Ranked results page by position; fetch one extra row to detect a next page
+            offset = cursor_offset(decode_cursor(cursor, sort)) if cursor else 0
+            results = search_backend.rank(db_query, query, size + 1, offset=offset)
+            next_cursor = encode_offset_cursor(sort, offset + size) if len(results) > size else None
+            results = results[:size]
+            issues = [issue for issue, _ in results]
+            scores = [score for _, score in results]
+            total_query = search_backend.filter(db_query, query) if count else None
+        else:
+            if query:
+                db_query = search_backend.filter(db_query, query)
+            issues, next_cursor = keyset_page(db_query, sort, ISSUE_SORT_KEYS[sort], cursor, size)
+            scores = None
+            total_query = db_query
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+
+    issue_dicts = Issue.to_dict_list(issues)
+    if scores is not None:
+        for issue_dict, score in zip(issue_dicts, scores):
+            issue_dict['search_score'] = score
+
+    total = count_rows(total_query, count) if count else None
+    # Relevance pages only reach the matches the backend ranks; count no further
+    max_ranked = search_backend.max_ranked if scores is not None else None
+    total_capped = total is not None and max_ranked is not None and total > max_ranked
+    if total_capped:
+        total = max_ranked
     return jsonify({
-        'issues': [issue.to_dict() for issue in issues],
-        'total': len(issues)
+        'issues': issue_dicts,
+        'total': total if total is not None else len(issues),
+        'total_capped': total_capped,
+        'max_score': max(scores) if scores else None,
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
     })
 
 # Tags endpoint
 @app.route('/api/tags', methods=['GET'])
+@cached_response(tags=['tags'])
 def get_tags():
     tags = Tag.query.all()
     return jsonify([tag.to_dict() for tag in tags])
 
 @app.route('/api/releases', methods=['GET'])
+@cached_response(tags=['issues'])
 def get_releases():
     """Get all available releases from existing issues"""
     releases = db.session.query(Issue.release).filter(Issue.release.isnot(None)).distinct().all()
     return jsonify([release[0] for release in releases if release[0]])
 
 @app.route('/api/platforms', methods=['GET'])
+@cached_response(tags=['issues'])
 def get_platforms():
     platforms = db.session.query(Issue.platform).distinct().filter(Issue.platform.isnot(None)).all()
     platform_list = [platform[0] for platform in platforms]
@@ -643,13 +835,46 @@ def get_platforms():
     
     return jsonify(platform_options)
 
+@app.route('/api/facets', methods=['GET'])
+def get_issue_facets():
+    """Counts per status, severity, release, platform, build, target and tag for the current filters"""
+    filters = request_filters()
+    query = filter_issues(Issue.query, filters)
+    return jsonify(get_facets(query, tuple(sorted(filters.items()))))
+
+@app.route('/api/issues/export', methods=['GET'])
+def export_issues():
+    """Stream all issues matching the filters as NDJSON (default) or CSV"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unsupported format '{export_format}'. Use ndjson or csv"}), 400
+    
+    try:
+        query = filter_issues(Issue.query, request_filters(), complete=True)
+    except SearchLimitExceeded as e:
+        return jsonify({'error': f'{e}; narrow the filters to export them all'}), 400
+    compress = 'gzip' in request.headers.get('Accept-Encoding', '')
+    
+    response = app.response_class(
+        stream_with_context(export_stream(query, export_format, compress)),
+        mimetype=EXPORT_FORMATS[export_format]
+    )
+    filename = f"issues-{datetime.now().strftime('%Y%m%d')}.{export_format}"
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
 @app.route('/api/builds', methods=['GET'])
+@cached_response(ttl=3600)
 def get_builds():
     """Get all available build options"""
     build_options = Issue.get_build_options()
     return jsonify(build_options)
 
 @app.route('/api/targets/<release>', methods=['GET'])
+@cached_response(ttl=3600)
 def get_targets(release):
     """Get target options for a specific release"""
     target_options = Issue.get_target_options(release)
@@ -664,4 +889,9 @@ def download_attachment(attachment_id):
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()}) 
\ No newline at end of file
+    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+
+# Prometheus scrape endpoint (all worker processes when METRICS_DIR is set)
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4') 
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+Pluggable full-text search backends for /api/search.
+
+The MySQL backend uses the FULLTEXT index on issues (see
+database/migrate_fulltext_search.sql); the Python backend is a portable
+fallback for SQLite development and test databases. The Elasticsearch backend
+queries the index maintained by indexing.py and degrades to the SQL backend
+while the cluster is unreachable.
+"""
+
+import re
+from datetime import datetime
+from app import app, db
+from models import Issue
+from indexing import get_es_client, cluster_status
+from sqlalchemy.dialects.mysql import match
+
+# Columns covered by the full-text search
+SEARCH_COLUMNS = (Issue.testcase_title, Issue.description, Issue.test_case_ids)
+
+# Characters with a special meaning in MySQL boolean mode queries
+BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+TERM_PATTERN = re.compile(r'\S+')
+
+class SearchLimitExceeded(Exception):
+    """Raised when a complete filter is requested but the backend only returns its top matches"""
+    
+    def __init__(self, limit):
+        super().__init__(f'The search matches more than {limit} issues')
+        self.limit = limit
+
+def tokenize(text):
+    """Split a search string into lowercase terms"""
+    return [term.lower() for term in TERM_PATTERN.findall(text or '')]
+
+class SearchBackend:
+    """Base class for search backends"""
+    name = None
+    
+    @property
+    def max_ranked(self):
+        """Most matches rank() considers per search (None when it ranks them all)"""
+        return None
+    
+    def filter(self, query, text, complete=False):
+        """
+        Restrict an Issue query to rows matching the search text.
+        With `complete`, raise SearchLimitExceeded rather than drop matches beyond the backend's limit.
+        """
+        raise NotImplementedError
+    
+    def rank(self, query, text, limit, offset=0):
+        """Return up to `limit` (issue, score) pairs matching the search text, best first, skipping `offset`"""
+        raise NotImplementedError
+
+class MySQLFullTextBackend(SearchBackend):
+    """MATCH ... AGAINST search backed by the ft_issues_search index"""
+    name = 'mysql_fulltext'
+    
+    def __init__(self, mode='boolean'):
+        self.mode = mode
+    
+    @staticmethod
+    def boolean_query(text):
+        """
+        Build a boolean mode query requiring every term, with prefix matching on the
+        last term so results stay useful while the user is still typing.
+        Terms containing operator characters (e.g. TC-20250101-AB12) are matched as phrases.
+        """
+        terms = tokenize(text)
+        parts = []
+        for index, term in enumerate(terms):
+            words = [word for word in BOOLEAN_OPERATORS.split(term) if word]
+            if not words:
+                continue
+            if len(words) > 1:
+                parts.append('+"%s"' % ' '.join(words))
+            elif index == len(terms) - 1:
+                parts.append('+%s*' % words[0])
+            else:
+                parts.append('+%s' % words[0])
+        return ' '.join(parts)
+    
+    def _match_filter(self, text):
+        if self.mode == 'natural':
+            return match(*SEARCH_COLUMNS, against=text).in_natural_language_mode() > 0
+        return match(*SEARCH_COLUMNS, against=self.boolean_query(text)).in_boolean_mode() > 0
+    
+    def filter(self, query, text, complete=False):
+        return query.filter(self._match_filter(text))
+    
+    def rank(self, query, text, limit, offset=0):
+        # Natural language relevance gives a better ordering than boolean mode scores
+        relevance = match(*SEARCH_COLUMNS, against=text).in_natural_language_mode()
+        rows = self.filter(query, text).add_columns(relevance.label('relevance')).order_by(
+            db.desc('relevance'), Issue.created_at.desc(), Issue.id.desc()
+        ).offset(offset).limit(limit).all()
+        return [(issue, float(score or 0)) for issue, score in rows]
+
+class PythonSearchBackend(SearchBackend):
+    """
+    Portable fallback: candidates are narrowed with LIKE and ranked in Python.
+    For SQLite and development only: LIKE '%term%' scans the whole table, and
+    only the newest SEARCH_PYTHON_MAX_CANDIDATES matches are ranked.
+    """
+    name = 'python'
+    
+    # Relative weight of a term occurrence in each column
+    FIELD_WEIGHTS = {'testcase_title': 3.0, 'test_case_ids': 2.0, 'description': 1.0}
+    PHRASE_BONUS = 5.0
+    
+    @property
+    def max_ranked(self):
+        return app.config.get('SEARCH_PYTHON_MAX_CANDIDATES', 1000)
+    
+    def filter(self, query, text, complete=False):
+        for term in tokenize(text):
+            query = query.filter(db.or_(*[column.ilike(f'%{term}%') for column in SEARCH_COLUMNS]))
+        return query
+    
+    def score(self, text, fields):
+        """Score a row given a mapping of column name to column value"""
+        terms = tokenize(text)
+        phrase = ' '.join(terms)
+        total = 0.0
+        for name, weight in self.FIELD_WEIGHTS.items():
+            value = (fields.get(name) or '').lower()
+            total += weight * sum(value.count(term) for term in terms)
+            if len(terms) > 1 and phrase in value:
+                total += weight * self.PHRASE_BONUS
+        return total
+    
+    def rank(self, query, text, limit, offset=0):
+        candidates = self.filter(query, text).with_entities(
+            Issue.id, Issue.testcase_title, Issue.description, Issue.test_case_ids, Issue.created_at
+        ).order_by(Issue.created_at.desc(), Issue.id.desc()).limit(self.max_ranked).all()
+        scored = sorted(
+            ((self.score(text, row._asdict()), row.created_at, row.id) for row in candidates),
+            key=lambda item: (item[0], item[1] or datetime.min, item[2]),
+            reverse=True
+        )[offset:offset + limit]
+        
+        issues = {issue.id: issue for issue in Issue.query.filter(Issue.id.in_([issue_id for _, _, issue_id in scored]))}
+        return [(issues[issue_id], score) for score, _, issue_id in scored if issue_id in issues]
+
+class ElasticsearchBackend(SearchBackend):
+    """
+    Elasticsearch relevance search. Matching IDs come from the index and the
+    remaining filters are applied in SQL, so at most ELASTICSEARCH_MAX_HITS
+    matches are considered per search (complete filters, used by the export,
+    raise SearchLimitExceeded instead of dropping the rest).
+    """
+    name = 'elasticsearch'
+    
+    # Relative field boosts, matching the Python backend weights
+    FIELDS = ['testcase_title^3', 'test_case_ids^2', 'description', 'additional_comments', 'comments']
+    
+    def __init__(self, fallback):
+        self.fallback = fallback
+    
+    def _search_hits(self, text):
+        """
+        Return (issue id, score) pairs from the index and whether they are all the matches,
+        or None if the cluster is unavailable
+        """
+        client = get_es_client()
+        if client is None or not cluster_status.available():
+            return None
+        body = {
+            'query': {
+                'multi_match': {
+                    'query': text,
+                    'fields': self.FIELDS,
+                    'type': 'bool_prefix',
+                    'operator': 'and'
+                }
+            },
+            '_source': False
+        }
+        try:
+            response = client.search(
+                index=app.config['ELASTICSEARCH_INDEX'], body=body,
+                size=app.config.get('ELASTICSEARCH_MAX_HITS', 1000)
+            )
+        except Exception as e:
+            cluster_status.mark_down(e)
+            return None
+        hits = [(int(hit['_id']), float(hit['_score'] or 0)) for hit in response['hits']['hits']]
+        total = response['hits']['total']
+        return hits, total['relation'] == 'eq' and total['value'] <= len(hits)
+    
+    def filter(self, query, text, complete=False):
+        result = self._search_hits(text)
+        if result is None:
+            return self.fallback.filter(query, text, complete)
+        hits, all_matches = result
+        if complete and not all_matches:
+            raise SearchLimitExceeded(len(hits))
+        return query.filter(Issue.id.in_([issue_id for issue_id, _ in hits]))
+    
+    def rank(self, query, text, limit, offset=0):
+        result = self._search_hits(text)
+        if result is None:
+            return self.fallback.rank(query, text, limit, offset)
+        scores = dict(result[0])
+        issues = query.filter(Issue.id.in_(list(scores))).all()
+        issues.sort(key=lambda issue: (scores[issue.id], issue.created_at or datetime.min, issue.id), reverse=True)
+        return [(issue, scores[issue.id]) for issue in issues[offset:offset + limit]]
+
+SEARCH_BACKENDS = {
+    MySQLFullTextBackend.name: MySQLFullTextBackend,
+    PythonSearchBackend.name: PythonSearchBackend,
+    ElasticsearchBackend.name: ElasticsearchBackend,
+}
+
+_backend = None
+
+def get_sql_search_backend():
+    """MySQL FULLTEXT on MySQL databases, the Python fallback everywhere else"""
+    if db.engine.dialect.name == 'mysql':
+        return MySQLFullTextBackend(mode=app.config.get('SEARCH_FULLTEXT_MODE', 'boolean'))
+    return PythonSearchBackend()
+
+def get_search_backend():
+    """
+    Return the configured search backend.
+    SEARCH_BACKEND selects one explicitly; otherwise the SQL backend for the database is used.
+    """
+    global _backend
+    if _backend is None:
+        name = app.config.get('SEARCH_BACKEND')
+        if name == ElasticsearchBackend.name:
+            _backend = ElasticsearchBackend(fallback=get_sql_search_backend())
+        elif name == MySQLFullTextBackend.name:
+            _backend = MySQLFullTextBackend(mode=app.config.get('SEARCH_FULLTEXT_MODE', 'boolean'))
+        elif name:
+            _backend = SEARCH_BACKENDS[name]()
+        else:
+            _backend = get_sql_search_backend()
+    return _backend
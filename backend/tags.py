@@ -0,0 +1,79 @@
+"""
+Tag name resolution for the issue create/edit routes.
+
+resolve_tag_ids() maps tag names to IDs with one IN query, inserts missing
+tags with a single INSERT ... IGNORE (safe against concurrent creators) and
+remembers the result in a process-local name -> id cache, so repeated tags
+cost no queries at all. Tags are never deleted, so cached IDs stay valid.
+"""
+
+import threading
+from datetime import datetime
+from sqlalchemy.orm import make_transient_to_detached
+from app import db
+from models import Tag
+
+_tag_ids = {}
+_tag_ids_lock = threading.Lock()
+
+def parse_tag_names(value):
+    """Tag names from a list or a comma separated string, stripped and de-duplicated"""
+    if isinstance(value, str):
+        value = value.split(',')
+    names = []
+    for name in value or []:
+        name = str(name).strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def _match_ids(names, rows):
+    """Map requested names to row IDs; falls back to case-insensitive matches (MySQL collations)"""
+    exact = {name: tag_id for tag_id, name in rows}
+    folded = {name.casefold(): tag_id for tag_id, name in rows}
+    matched = {}
+    for name in names:
+        tag_id = exact.get(name, folded.get(name.casefold()))
+        if tag_id is not None:
+            matched[name] = tag_id
+    return matched
+
+def resolve_tag_ids(names):
+    """Return {name: tag_id} for `names`, creating missing tags"""
+    missing = [name for name in names if name not in _tag_ids]
+    if missing:
+        tags = Tag.__table__
+        # Own short transaction: created tags are committed even if the caller rolls back,
+        # so the cache never holds IDs of rows that do not exist
+        with db.engine.begin() as connection:
+            select_missing = db.select(tags.c.id, tags.c.name).where(tags.c.name.in_(missing))
+            found = _match_ids(missing, connection.execute(select_missing).all())
+            if len(found) < len(missing):
+                now = datetime.now()
+                connection.execute(
+                    tags.insert().prefix_with('IGNORE', dialect='mysql').prefix_with('OR IGNORE', dialect='sqlite'),
+                    [{'name': name, 'created_at': now} for name in missing if name not in found]
+                )
+                found = _match_ids(missing, connection.execute(select_missing).all())
+        with _tag_ids_lock:
+            _tag_ids.update(found)
+    return {name: _tag_ids[name] for name in names}
+
+def resolve_tags(names):
+    """
+    Tag objects for `names` (in order), creating missing tags. Objects are attached
+    to the session by primary key without loading them.
+    """
+    tags, seen = [], set()
+    for name, tag_id in resolve_tag_ids(names).items():
+        if tag_id in seen:
+            continue  # Names differing only in case share a row under MySQL collations
+        seen.add(tag_id)
+        tag = Tag(id=tag_id, name=name)
+        make_transient_to_detached(tag)
+        tags.append(db.session.merge(tag, load=False))
+    return tags
+
+def clear_tag_cache():
+    with _tag_ids_lock:
+        _tag_ids.clear()
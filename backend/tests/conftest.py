@@ -0,0 +1,79 @@
+"""
+Shared fixtures for the backend tests.
+
+The app reads its configuration when it is imported, so the environment is set
+up here first: a throwaway SQLite database, the in-memory Elasticsearch
+stand-in and the in-process response cache. Every test starts from empty
+tables.
+"""
+
+import os
+import sys
+import tempfile
+import pytest
+
+DB_DIR = tempfile.mkdtemp(prefix='testertalk-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(DB_DIR, 'test.db')}"
+os.environ['ELASTICSEARCH_URL'] = 'memory://'
+os.environ['CACHE_BACKEND'] = 'memory'
+os.environ['VOTE_FLUSH_INTERVAL'] = '0'
+os.environ['METRICS_DIR'] = ''
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.append(os.path.dirname(BACKEND_DIR))  # maintenance scripts in the repository root
+
+from app import app, db
+import indexing
+from cache import response_cache
+from tags import clear_tag_cache
+from models import User, test_case_id_allocator
+
+ISSUE_PATH = '/lan/fed/etpv5/release/251/lnx86/etautotest/suite/case'
+
+@pytest.fixture(autouse=True)
+def database():
+    """Empty tables, caches and search index for every test"""
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    response_cache.clear()
+    clear_tag_cache()
+    test_case_id_allocator.__init__()
+    indexing._client = None
+    indexing.cluster_status.mark_up()
+    yield
+    with app.app_context():
+        db.session.remove()
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+@pytest.fixture
+def admin_client():
+    with app.app_context():
+        admin = User(username='admin', email='admin@example.com', role='admin')
+        admin.set_password('secret')
+        db.session.add(admin)
+        db.session.commit()
+    client = app.test_client()
+    response = client.post('/api/auth/login', json={'username': 'admin', 'password': 'secret'})
+    assert response.status_code == 200, response.data
+    return client
+
+@pytest.fixture
+def create_issue(client):
+    """Create an issue through the API and return its JSON"""
+    def create(**fields):
+        data = {
+            'testcase_title': 'Build fails with no makefile found',
+            'testcase_path': ISSUE_PATH,
+            'severity': 'High',
+            'description': 'The build stops before compiling',
+            'reporter_name': 'alice',
+        }
+        data.update(fields)
+        response = client.post('/api/issues', json=data)
+        assert response.status_code == 201, response.data
+        return response.json
+    return create
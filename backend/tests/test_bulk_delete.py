@@ -0,0 +1,59 @@
+from app import app, db
+from bulk import get_attachment_sweeper
+from models import Attachment, Comment, IssueTag, IssueTestCase, Tag, Vote
+from query_stats import count_queries
+
+def add_attachment(issue_id, path):
+    path.write_bytes(b'screenshot')
+    with app.app_context():
+        db.session.add(Attachment(issue_id=issue_id, filename=path.name, file_path=str(path), uploaded_by='alice'))
+        db.session.commit()
+
+def rows_of(issue_id):
+    with app.app_context():
+        return {
+            'comments': Comment.query.filter_by(issue_id=issue_id).count(),
+            'attachments': Attachment.query.filter_by(issue_id=issue_id).count(),
+            'tags': IssueTag.query.filter_by(issue_id=issue_id).count(),
+            'test_cases': IssueTestCase.query.filter_by(issue_id=issue_id).count(),
+            'votes': Vote.query.filter_by(target_type='issue', target_id=issue_id).count(),
+        }
+
+def test_children_cascade_and_files_are_swept(admin_client, create_issue, tmp_path):
+    doomed = [create_issue(tags=['ui', 'crash']) for _ in range(3)]
+    kept = create_issue(tags=['ui'])
+    for i, issue in enumerate(doomed + [kept]):
+        comment = admin_client.post(f"/api/issues/{issue['id']}/comments", json={'commenter_name': 'bob', 'content': 'Me too'}).json
+        admin_client.post(f"/api/issues/{issue['id']}/upvote")
+        admin_client.post(f"/api/comments/{comment['id']}/upvote")
+        add_attachment(issue['id'], tmp_path / f'shot-{i}.png')
+    
+    response = admin_client.post('/api/admin/issues/bulk-delete', json={'issue_ids': [issue['id'] for issue in doomed]})
+    assert response.json['deleted_count'] == 3
+    for issue in doomed:
+        assert rows_of(issue['id']) == {'comments': 0, 'attachments': 0, 'tags': 0, 'test_cases': 0, 'votes': 0}
+        assert admin_client.get(f"/api/issues/{issue['id']}").status_code == 404
+    assert rows_of(kept['id']) == {'comments': 1, 'attachments': 1, 'tags': 1, 'test_cases': 1, 'votes': 1}
+    with app.app_context():
+        assert Vote.query.filter_by(target_type='comment').count() == 1
+        assert Tag.query.count() == 2  # tags outlive their issues
+    
+    get_attachment_sweeper().paths.join()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['shot-3.png']
+
+def test_delete_runs_a_fixed_number_of_statements_per_chunk(admin_client, create_issue, monkeypatch):
+    monkeypatch.setitem(app.config, 'BULK_CHUNK_SIZE', 10)
+    issue_ids = [create_issue(tags=['ui'])['id'] for _ in range(10)]
+    with count_queries() as stats:
+        response = admin_client.post('/api/admin/issues/bulk-delete', json={'issue_ids': issue_ids + issue_ids[:3]})
+    assert response.json['deleted_count'] == 10
+    assert stats.max_repeats <= 2, stats.summary()
+
+def test_id_listing_streams_filtered_ids(admin_client, create_issue):
+    high = [create_issue(severity='High')['id'] for _ in range(3)]
+    create_issue(severity='Low')
+    assert admin_client.get('/api/admin/issues/ids', query_string={'severity': 'High'}).json == {'issue_ids': high, 'total': 3}
+    assert admin_client.get('/api/admin/issues/ids', query_string={'severity': 'Medium'}).json == {'issue_ids': [], 'total': 0}
+
+def test_bulk_delete_requires_ids(admin_client):
+    assert admin_client.post('/api/admin/issues/bulk-delete', json={'issue_ids': []}).status_code == 400
@@ -0,0 +1,56 @@
+import time
+from cache import LRUCache, response_cache
+
+def test_lru_cache_evicts_expires_and_invalidates(monkeypatch):
+    cache = LRUCache(max_entries=2, default_ttl=60)
+    cache.set('a', 1, tags=['issues'])
+    cache.set('b', 2, tags=['tags'])
+    cache.get('a')
+    cache.set('c', 3)
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)  # b was least recently used
+    
+    cache.invalidate('issues')
+    assert cache.get('a') is None and cache.get('c') == 3
+    
+    now = time.monotonic()
+    cache.set('d', 4, ttl=5)
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 10)
+    assert cache.get('d') is None
+
+def test_ttl_only_cache_keeps_entries_that_need_no_invalidation():
+    cache = LRUCache()
+    cache.set('a', 1, tags=['issues'])
+    cache.ttl_only('shared by several workers')
+    assert cache.get('a') is None
+    
+    cache.set('tagged', 1, tags=['issues'])
+    cache.set('untagged', 2, ttl=3600)
+    cache.set('facets', 3, tags=['issues'], stale_ok=True)
+    assert (cache.get('tagged'), cache.get('untagged'), cache.get('facets')) == (None, 2, 3)
+    assert cache.info()['ttl_only'] == 'shared by several workers'
+
+def test_tag_list_is_cached_until_a_write(client, create_issue):
+    create_issue(tags=['ui'])
+    assert client.get('/api/tags').json[0]['name'] == 'ui'
+    hits = response_cache.stats.hits
+    client.get('/api/tags')
+    assert response_cache.stats.hits == hits + 1
+    
+    create_issue(tags=['crash'])
+    assert {tag['name'] for tag in client.get('/api/tags').json} == {'ui', 'crash'}
+
+def test_issue_detail_is_never_stale(client, create_issue):
+    issue = create_issue()
+    client.get(f"/api/issues/{issue['id']}")
+    client.post(f"/api/issues/{issue['id']}/comments", json={'commenter_name': 'bob', 'content': 'Me too'})
+    assert len(client.get(f"/api/issues/{issue['id']}").json['comments']) == 1
+    client.put(f"/api/issues/{issue['id']}", json={'severity': 'Low'})
+    assert client.get(f"/api/issues/{issue['id']}").json['severity'] == 'Low'
+
+def test_admin_can_inspect_and_clear_the_cache(admin_client, create_issue):
+    create_issue()
+    admin_client.get('/api/releases')
+    info = admin_client.get('/api/admin/cache').json
+    assert info['backend'] == 'memory' and info['entries'] >= 1
+    assert admin_client.delete('/api/admin/cache').status_code == 200
+    assert admin_client.get('/api/admin/cache').json['entries'] == 0
@@ -0,0 +1,62 @@
+from app import app, db
+from models import Issue, SearchOutbox
+import backfill_comment_counters
+
+def counters(client, issue_id):
+    issue = client.get(f'/api/issues/{issue_id}').json
+    return issue['comment_count'], issue['has_verified_solution']
+
+def add_comment(client, issue_id, content='Me too'):
+    response = client.post(f'/api/issues/{issue_id}/comments', json={'commenter_name': 'bob', 'content': content})
+    assert response.status_code == 201
+    return response.json
+
+def test_counters_follow_comment_writes(admin_client, create_issue):
+    issue = create_issue()
+    assert counters(admin_client, issue['id']) == (0, False)
+    
+    comments = [add_comment(admin_client, issue['id'], f'Comment {i}') for i in range(3)]
+    assert counters(admin_client, issue['id']) == (3, False)
+    
+    assert admin_client.post(f"/api/comments/{comments[1]['id']}/verify").status_code == 200
+    assert counters(admin_client, issue['id']) == (3, True)
+    
+    # Deleting another comment keeps the verified solution
+    assert admin_client.delete(f"/api/admin/comments/{comments[0]['id']}").status_code == 200
+    assert counters(admin_client, issue['id']) == (2, True)
+    assert admin_client.delete(f"/api/admin/comments/{comments[1]['id']}").status_code == 200
+    assert counters(admin_client, issue['id']) == (1, False)
+
+def test_sorts_use_the_counters(client, create_issue):
+    quiet, busy, solved = (create_issue(testcase_title=title)['id'] for title in ('Quiet', 'Busy', 'Solved'))
+    for _ in range(2):
+        add_comment(client, busy)
+    client.post(f"/api/comments/{add_comment(client, solved)['id']}/verify")
+    
+    def order(sort):
+        return [issue['id'] for issue in client.get('/api/issues', query_string={'sort': sort}).json['issues']]
+    assert order('most_discussed') == [busy, solved, quiet]
+    assert order('has_solution')[0] == solved
+
+def test_backfill_repairs_drifted_counters(admin_client, create_issue, capsys):
+    issues = [create_issue(testcase_title=f'Issue {i}')['id'] for i in range(4)]
+    for issue_id in issues[1:]:
+        add_comment(admin_client, issue_id)
+    admin_client.post(f"/api/comments/{add_comment(admin_client, issues[2])['id']}/verify")
+    with app.app_context():
+        Issue.query.filter(Issue.id.in_(issues[:3])).update(
+            {'comment_count': 7, 'has_verified_solution': False}, synchronize_session=False
+        )
+        SearchOutbox.query.delete()
+        db.session.commit()
+    
+    backfill_comment_counters.backfill(batch_size=2, start_id=0, dry_run=True)
+    assert '3 of 4 issues would be repaired' in capsys.readouterr().out
+    assert counters(admin_client, issues[0]) == (7, False)
+    
+    backfill_comment_counters.backfill(batch_size=2, start_id=issues[0], dry_run=False)
+    assert 'Repaired 2 of 3 issues' in capsys.readouterr().out
+    assert counters(admin_client, issues[0]) == (7, False)  # before --start-id
+    assert [counters(admin_client, issue_id) for issue_id in issues[1:]] == [(1, False), (2, True), (1, False)]
+    with app.app_context():
+        assert sorted(entry.issue_id for entry in SearchOutbox.query) == issues[1:3]
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+import db_pool
+from app import app
+
+def test_engine_options_per_database():
+    config = dict(app.config, SQLALCHEMY_DATABASE_URI='mysql+pymysql://user@db/testing_platform', DB_POOL_SIZE=5)
+    options = db_pool.engine_options(config)
+    assert options['poolclass'] is db_pool.InstrumentedQueuePool
+    assert (options['pool_size'], options['max_overflow'], options['pool_timeout'], options['pool_recycle']) == (
+        5, config['DB_MAX_OVERFLOW'], config['DB_POOL_TIMEOUT'], config['DB_POOL_RECYCLE']
+    )
+    assert db_pool.engine_options(dict(config, SQLALCHEMY_DATABASE_URI='sqlite:///test.db')) == {'pool_pre_ping': config['DB_POOL_PRE_PING']}
+
+def test_checkouts_and_timeouts_are_recorded(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_pool, 'pool_metrics', db_pool.PoolMetrics())
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=db_pool.InstrumentedQueuePool,
+        pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    held = engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    held.close()
+    engine.connect().close()
+    
+    status = db_pool.pool_status(engine)
+    assert (status['pool'], status['size'], status['in_use'], status['idle']) == ('InstrumentedQueuePool', 1, 0, 1)
+    assert (status['checkouts'], status['timeouts']) == (2, 1)
+    assert status['wait_max_ms'] >= 50
+    assert sum(bucket['count'] for bucket in status['wait_seconds_histogram']) == 3
+    assert status['wait_seconds_histogram'][-1]['le'] == '+Inf'
+    engine.dispose()
+
+def test_admin_pool_endpoint(admin_client, client):
+    status = admin_client.get('/api/admin/pool').json
+    assert {'pool', 'pid', 'checkouts', 'timeouts', 'wait_seconds_histogram'} <= set(status)
+    assert client.get('/api/admin/pool').status_code == 401
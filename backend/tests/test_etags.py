@@ -0,0 +1,56 @@
+from app import app, db
+from models import Issue
+
+def test_issue_detail_revalidates_with_304(client, create_issue):
+    issue = create_issue()
+    first = client.get(f"/api/issues/{issue['id']}")
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    
+    cached = client.get(f"/api/issues/{issue['id']}", headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.headers['ETag'] == etag
+    assert cached.data == b''
+
+def test_issue_etag_changes_with_comments_and_votes(client, create_issue):
+    issue = create_issue()
+    etags = [client.get(f"/api/issues/{issue['id']}").headers['ETag']]
+    
+    client.post(f"/api/issues/{issue['id']}/comments", json={'commenter_name': 'bob', 'content': 'Seen on lnx86 too'})
+    etags.append(client.get(f"/api/issues/{issue['id']}").headers['ETag'])
+    client.post(f"/api/issues/{issue['id']}/upvote")
+    response = client.get(f"/api/issues/{issue['id']}", headers={'If-None-Match': etags[-1]})
+    assert response.status_code == 200
+    etags.append(response.headers['ETag'])
+    assert len(set(etags)) == 3
+
+def test_out_of_band_change_is_never_served_from_cache(client, create_issue):
+    issue = create_issue()
+    etag = client.get(f"/api/issues/{issue['id']}").headers['ETag']
+    
+    # Written without invalidating the response cache, as another process would
+    with app.app_context():
+        Issue.query.get(issue['id']).testcase_title = 'Renamed elsewhere'
+        db.session.commit()
+    
+    response = client.get(f"/api/issues/{issue['id']}", headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json['testcase_title'] == 'Renamed elsewhere'
+    assert response.headers['ETag'] != etag
+
+def test_listing_revalidates_with_304(client, create_issue):
+    for i in range(3):
+        create_issue(testcase_title=f'Issue {i}')
+    for query in ({'per_page': 2}, {'per_page': 2, 'cursor': ''}):
+        etag = client.get('/api/issues', query_string=query).headers['ETag']
+        response = client.get('/api/issues', query_string=query, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+    
+    etag = client.get('/api/issues', query_string={'per_page': 2}).headers['ETag']
+    create_issue(testcase_title='Newest')
+    response = client.get('/api/issues', query_string={'per_page': 2}, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json['issues'][0]['testcase_title'] == 'Newest'
+
+def test_missing_issue_is_404(client):
+    assert client.get('/api/issues/999', headers={'If-None-Match': '"anything"'}).status_code == 404
@@ -0,0 +1,56 @@
+import csv
+import gzip
+import io
+import json
+import search
+from app import app
+from export import export_batches
+from indexing import IndexingWorker
+from models import Issue
+
+def export_rows(client, **filters):
+    response = client.get('/api/issues/export', query_string=filters)
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.data.decode().splitlines()]
+
+def create_issues(create_issue, count):
+    return [create_issue(
+        testcase_title=f'Exported issue {i}',
+        severity=['Low', 'Medium', 'High', 'Critical'][i % 4],
+        description=f'Exported description {i}',
+        tags=['exported', f'group-{i % 3}'],
+    ) for i in range(count)]
+
+def test_export_filters_and_formats(client, create_issue):
+    create_issues(create_issue, 6)
+    assert len(export_rows(client, severity='Low')) == 2
+    assert len(export_rows(client, tags='group-0,exported', tag_mode='all')) == 2
+    
+    response = client.get('/api/issues/export?format=csv', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.data).decode())))
+    assert len(rows) == 6
+    assert rows[0]['tags'] in ('exported,group-0', 'exported,group-1', 'exported,group-2')
+    
+    assert client.get('/api/issues/export?format=xml').status_code == 400
+
+def test_export_streams_in_batches(client, create_issue):
+    created = create_issues(create_issue, 5)
+    with app.app_context():
+        batches = list(export_batches(Issue.query, batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [issue['id'] for batch in batches for issue in batch] == [issue['id'] for issue in created]
+    assert batches[0][0]['tags'] == ['exported', 'group-0']
+
+def test_export_rejects_a_capped_search(client, create_issue, monkeypatch):
+    create_issues(create_issue, 4)
+    with app.app_context():
+        IndexingWorker().drain_once()
+    monkeypatch.setattr(search, '_backend', search.ElasticsearchBackend(fallback=search.PythonSearchBackend()))
+    
+    assert len(export_rows(client, q='exported')) == 4
+    monkeypatch.setitem(app.config, 'ELASTICSEARCH_MAX_HITS', 3)
+    response = client.get('/api/issues/export', query_string={'q': 'exported'})
+    assert response.status_code == 400
+    assert 'more than 3 issues' in response.json['error']
+    assert len(export_rows(client, q='2 exported')) == 1
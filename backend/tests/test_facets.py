@@ -0,0 +1,40 @@
+from conftest import ISSUE_PATH
+
+def facet_counts(facets, name):
+    return {entry['value']: entry['count'] for entry in facets[name]}
+
+def test_counts_per_facet(client, create_issue):
+    create_issue(severity='High', build='Weekly', tags=['ui'])
+    create_issue(severity='High', build='Daily', tags=['ui', 'crash'])
+    create_issue(severity='Low', testcase_path=ISSUE_PATH.replace('lnx86', 'lr'), tags=['crash'])
+    
+    facets = client.get('/api/facets').json
+    assert facets['total'] == 3
+    assert facet_counts(facets, 'severity') == {'High': 2, 'Low': 1}
+    assert facet_counts(facets, 'status') == {'open': 3}
+    assert facet_counts(facets, 'release') == {'251': 3}
+    assert facet_counts(facets, 'platform') == {'lnx86': 2, 'lr': 1}
+    assert facet_counts(facets, 'build') == {'Weekly': 1, 'Daily': 1}
+    assert facet_counts(facets, 'tags') == {'ui': 2, 'crash': 2}
+    assert {entry['value']: entry['display'] for entry in facets['platform']} == {'lnx86': 'Linux', 'lr': 'LR'}
+
+def test_filters_narrow_the_counts(client, create_issue):
+    create_issue(severity='High', testcase_title='Makefile missing', tags=['ui'])
+    create_issue(severity='Low', testcase_title='Makefile error', tags=['crash'])
+    create_issue(severity='Low', testcase_title='Loader crash', tags=['crash'])
+    
+    facets = client.get('/api/facets', query_string={'severity': 'Low'}).json
+    assert facets['total'] == 2
+    assert facet_counts(facets, 'tags') == {'crash': 2}
+    facets = client.get('/api/facets', query_string={'q': 'makefile'}).json
+    assert facet_counts(facets, 'severity') == {'High': 1, 'Low': 1}
+    facets = client.get('/api/facets', query_string={'tags': 'crash', 'q': 'makefile'}).json
+    assert facets['total'] == 1
+
+def test_cached_counts_are_dropped_on_writes(client, create_issue):
+    issue = create_issue(severity='High')
+    assert client.get('/api/facets').json['total'] == 1
+    create_issue(severity='Low')
+    assert client.get('/api/facets').json['total'] == 2
+    client.put(f"/api/issues/{issue['id']}", json={'severity': 'Low'})
+    assert facet_counts(client.get('/api/facets').json, 'severity') == {'Low': 2}
@@ -0,0 +1,104 @@
+import json
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+import importer
+import models
+from app import app, db
+from conftest import ISSUE_PATH
+from test_export import export_rows
+
+def import_rows(client, rows):
+    body = ''.join(json.dumps(row) + '\n' for row in rows)
+    response = client.post('/api/issues/import', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200, response.data
+    return response.json
+
+def sample_rows(count):
+    return [{
+        'testcase_title': f'Imported issue {i}',
+        'testcase_path': ISSUE_PATH,
+        'severity': ['Low', 'Medium', 'High', 'Critical'][i % 4],
+        'description': f'Imported description {i}',
+        'reporter_name': 'importer',
+        'build': 'nightly',
+        'tags': ['imported', f'group-{i % 3}'],
+    } for i in range(count)]
+
+def test_import_then_export_round_trips(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'BULK_CHUNK_SIZE', 4)  # several chunks
+    rows = sample_rows(10)
+    result = import_rows(client, rows)
+    assert result['created'] == 10 and result['failed'] == 0
+    assert [entry['index'] for entry in result['results']] == list(range(10))
+    
+    exported = {issue['id']: issue for issue in export_rows(client)}
+    assert len(exported) == 10
+    for row, entry in zip(rows, result['results']):
+        issue = exported[entry['id']]
+        assert issue['test_case_ids'] == entry['test_case_id']
+        assert issue['tags'] == sorted(row['tags'])
+        for field in ('testcase_title', 'severity', 'description', 'reporter_name', 'build'):
+            assert issue[field] == row[field]
+        assert (issue['release'], issue['platform']) == ('251', 'lnx86')
+    
+    # Exported rows can be imported again as they are
+    reimported = import_rows(client, list(exported.values()))
+    assert reimported['created'] == 10
+    assert len(export_rows(client)) == 20
+
+def test_import_reads_back_new_rows_only(client):
+    # A legacy issue (no issue_test_cases rows) whose test_case_ids text matches the next allocated ID
+    with app.app_context():
+        next_id = models.TestCaseIdAllocator.format(datetime.now().strftime('%Y%m%d'), 1)
+        db.session.execute(models.Issue.__table__.insert(), [{
+            'testcase_title': 'Legacy', 'testcase_path': ISSUE_PATH, 'severity': 'Low',
+            'test_case_ids': next_id, 'description': 'Old row', 'reporter_name': 'legacy', 'status': 'open'
+        }])
+        db.session.commit()
+    
+    result = import_rows(client, sample_rows(1))
+    entry = result['results'][0]
+    assert entry['test_case_id'] == next_id
+    assert client.get(f"/api/issues/{entry['id']}").json['testcase_title'] == 'Imported issue 0'
+
+def test_invalid_rows_are_reported_per_row(client):
+    rows = sample_rows(3)
+    rows[1]['severity'] = 'Urgent'
+    del rows[2]['description']
+    result = import_rows(client, rows)
+    assert result['created'] == 1
+    assert 'id' in result['results'][0]
+    assert "Invalid severity 'Urgent'" in result['results'][1]['error']
+    assert 'description' in result['results'][2]['error']
+
+def test_unparseable_body_is_400(client):
+    response = client.post('/api/issues/import', data='{"testcase_title":', content_type='application/json')
+    assert response.status_code == 400
+
+def test_bad_values_fail_only_their_own_row(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'BULK_CHUNK_SIZE', 10)  # every row in one chunk
+    rows = sample_rows(7)
+    rows[1]['testcase_title'] = 'x' * 501
+    rows[2]['reporter_name'] = 42
+    rows[3]['tags'] = 5
+    rows[4]['tags'] = ['ok', 'y' * 51]
+    rows[5]['build'] = {'name': 'nightly'}
+    result = import_rows(client, rows)
+    
+    assert result['created'] == 2
+    assert [bool(entry.get('id')) for entry in result['results']] == [True, False, False, False, False, False, True]
+    errors = [entry.get('error') for entry in result['results']]
+    assert errors[1] == 'testcase_title is longer than 500 characters'
+    assert errors[2] == 'reporter_name must be a string'
+    assert errors[3].startswith('tags must be')
+    assert errors[4] == 'Tag names are limited to 50 characters'
+    assert errors[5] == 'build must be a string'
+
+def test_failed_chunk_reports_no_database_details(client, monkeypatch):
+    def failing_insert(chunk, tag_ids):
+        raise IntegrityError('INSERT INTO issues ...', [{'description': 'Imported description 1'}], Exception('Duplicate entry'))
+    monkeypatch.setattr(importer, 'insert_chunk', failing_insert)
+    result = import_rows(client, sample_rows(2))
+    assert result['created'] == 0
+    for entry in result['results']:
+        assert entry['error'] == 'Insert failed; no row of its chunk was imported'
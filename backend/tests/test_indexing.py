@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from app import app, db
+from models import SearchOutbox
+from indexing import IndexingWorker, get_es_client
+
+def drain(worker):
+    with app.app_context():
+        return worker.drain_once()
+
+def outbox_entries():
+    with app.app_context():
+        return [(entry.issue_id, entry.action, entry.attempts) for entry in SearchOutbox.query.order_by(SearchOutbox.id)]
+
+def test_changes_are_queued_and_drained(create_issue, client):
+    issue = create_issue(tags=['build'])
+    client.post(f"/api/issues/{issue['id']}/comments", json={'commenter_name': 'bob', 'content': 'Same here'})
+    queued = outbox_entries()
+    assert {issue_id for issue_id, _, _ in queued} == {issue['id']}
+    
+    worker = IndexingWorker(batch_size=10)
+    assert drain(worker) == len(queued)
+    assert outbox_entries() == []
+    
+    document = get_es_client().get(index=app.config['ELASTICSEARCH_INDEX'], id=issue['id'])['_source']
+    assert document['tags'] == ['build']
+    assert document['comments'] == ['Same here']
+
+def test_first_write_creates_mapped_index_behind_alias(create_issue):
+    create_issue()
+    drain(IndexingWorker())
+    
+    es = get_es_client()
+    alias = app.config['ELASTICSEARCH_INDEX']
+    assert es.indices.exists_alias(name=alias)
+    index, = es.indices.get_alias(name=alias)
+    assert index.startswith(f'{alias}_')
+    assert es.mappings[index]['properties']['tags'] == {'type': 'keyword'}
+
+def test_deleted_issue_is_removed_from_index(create_issue, admin_client):
+    issue = create_issue()
+    worker = IndexingWorker()
+    drain(worker)
+    
+    assert admin_client.delete(f"/api/admin/issues/{issue['id']}").status_code == 200
+    drain(worker)
+    assert get_es_client().count(index=app.config['ELASTICSEARCH_INDEX'])['count'] == 0
+
+def test_failed_batch_backs_off_and_retries(create_issue):
+    issue = create_issue()
+    es = get_es_client()
+    es.available = False
+    
+    worker = IndexingWorker()
+    assert drain(worker) == 0
+    assert outbox_entries() == [(issue['id'], 'index', 1)]
+    with app.app_context():
+        entry = SearchOutbox.query.one()
+        assert entry.next_attempt_at > datetime.now()
+        assert 'unavailable' in entry.last_error
+    
+    # Entries are not picked up again before their backoff expires
+    es.available = True
+    assert drain(worker) == 0
+    
+    with app.app_context():
+        SearchOutbox.query.update({SearchOutbox.next_attempt_at: datetime.now() - timedelta(seconds=1)})
+        db.session.commit()
+    assert drain(worker) == 1
+    assert outbox_entries() == []
+
+def test_backoff_grows_exponentially_up_to_the_limit(create_issue):
+    create_issue()
+    with app.app_context():
+        entries = SearchOutbox.query.all()
+        for attempt in range(1, 12):
+            IndexingWorker.schedule_retry(entries, 'boom')
+            delay = (entries[0].next_attempt_at - datetime.now()).total_seconds()
+            expected = min(2 ** attempt, app.config['INDEXING_MAX_BACKOFF'])
+            assert expected - 5 < delay <= expected
+        db.session.rollback()
@@ -0,0 +1,31 @@
+from query_stats import count_queries
+
+def test_issue_listing_query_budget(client, create_issue):
+    for i in range(30):
+        issue = create_issue(testcase_title=f'Issue {i}', tags=['ui', f'group-{i % 5}'])
+        if i % 3 == 0:
+            client.post(f"/api/issues/{issue['id']}/comments", json={'commenter_name': 'bob', 'content': 'Me too'})
+    
+    # Page, count (offset pagination only) and one batched tag lookup, whatever the page size
+    budgets = {}
+    for params in ({'per_page': 5}, {'per_page': 25}, {'per_page': 25, 'cursor': ''}, {'per_page': 25, 'sort': 'most_discussed'}):
+        with count_queries() as stats:
+            response = client.get('/api/issues', query_string=params)
+        assert response.status_code == 200
+        assert stats.count <= 3, stats.summary()
+        assert stats.max_repeats == 1, stats.summary()
+        budgets[tuple(params.items())] = stats.count
+    assert budgets[(('per_page', 5),)] == budgets[(('per_page', 25),)]
+
+def test_listing_serializes_like_the_detail_view(client, create_issue):
+    tagged = create_issue(tags=['crash'])
+    untagged = create_issue(testcase_title='No tags')
+    client.post(f"/api/issues/{tagged['id']}/comments", json={'commenter_name': 'bob', 'content': 'Me too'})
+    
+    listed = {issue['id']: issue for issue in client.get('/api/issues').json['issues']}
+    for issue_id in (tagged['id'], untagged['id']):
+        detail = client.get(f'/api/issues/{issue_id}').json
+        # The detail view adds comments and attachments to the same fields
+        assert {field: detail[field] for field in listed[issue_id]} == listed[issue_id]
+    assert listed[tagged['id']]['comment_count'] == 1
+    assert listed[untagged['id']]['tags'] == []
@@ -0,0 +1,87 @@
+import threading
+import time
+import pytest
+import jobs
+from app import app
+
+def wait_for_job(client, job_id, condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f'/api/admin/jobs/{job_id}').json
+        if condition(job):
+            return job
+        assert time.monotonic() < deadline, job
+        time.sleep(0.02)
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setitem(app.config, 'BULK_CHUNK_SIZE', 2)
+
+def test_status_job_reports_progress_per_chunk(admin_client, create_issue, small_chunks, monkeypatch):
+    issue_ids = [create_issue(testcase_title=f'Issue {i}')['id'] for i in range(5)]
+    
+    # Hold the job after its first chunk so the intermediate state can be observed
+    release = threading.Event()
+    status_chunk = jobs.OPERATIONS['status'][0]
+    def held_status_chunk(chunk, **params):
+        if chunk[0] != issue_ids[0]:
+            release.wait(10)
+        return status_chunk(chunk, **params)
+    monkeypatch.setitem(jobs.OPERATIONS, 'status', (held_status_chunk, ('status',)))
+    
+    response = admin_client.post('/api/admin/jobs', json={'operation': 'status', 'issue_ids': issue_ids, 'params': {'status': 'closed'}})
+    assert response.status_code == 202
+    job_id = response.json['id']
+    assert response.json['total'] == 5
+    
+    job = wait_for_job(admin_client, job_id, lambda job: job['processed'] == 2)
+    assert job['status'] == 'running'
+    assert job['progress'] == 0.4
+    release.set()
+    
+    job = wait_for_job(admin_client, job_id, lambda job: job['status'] != 'running')
+    assert job['status'] == 'completed'
+    assert (job['processed'], job['affected'], job['failed']) == (5, 5, 0)
+    assert job['progress'] == 1.0
+    statuses = {admin_client.get(f'/api/issues/{issue_id}').json['status'] for issue_id in issue_ids}
+    assert statuses == {'closed'}
+
+def test_failed_chunk_is_recorded_and_job_continues(admin_client, create_issue, small_chunks, monkeypatch):
+    issue_ids = [create_issue(testcase_title=f'Issue {i}')['id'] for i in range(4)]
+    status_chunk = jobs.OPERATIONS['status'][0]
+    def failing_status_chunk(chunk, **params):
+        if issue_ids[0] in chunk:
+            raise RuntimeError('lock wait timeout')
+        return status_chunk(chunk, **params)
+    monkeypatch.setitem(jobs.OPERATIONS, 'status', (failing_status_chunk, ('status',)))
+    
+    job_id = admin_client.post('/api/admin/jobs', json={'operation': 'status', 'issue_ids': issue_ids, 'params': {'status': 'resolved'}}).json['id']
+    job = wait_for_job(admin_client, job_id, lambda job: job['finished_at'])
+    assert job['status'] == 'completed'
+    assert (job['processed'], job['affected'], job['failed']) == (4, 2, 2)
+    assert job['failed_issue_ids'] == issue_ids[:2]
+    assert 'lock wait timeout' in job['errors'][0]['error']
+
+def test_retag_job_and_job_listing(admin_client, create_issue):
+    issue_ids = [create_issue(tags=['old'])['id'] for _ in range(3)]
+    job_id = admin_client.post('/api/admin/jobs', json={'operation': 'retag', 'issue_ids': issue_ids, 'params': {'add': ['new'], 'remove': ['old']}}).json['id']
+    wait_for_job(admin_client, job_id, lambda job: job['status'] == 'completed')
+    
+    assert [job['id'] for job in admin_client.get('/api/admin/jobs').json] == [job_id]
+    assert admin_client.get('/api/admin/jobs/missing').status_code == 404
+    for issue_id in issue_ids:
+        assert admin_client.get(f'/api/issues/{issue_id}').json['tags'] == ['new']
+
+@pytest.mark.parametrize('body', [
+    {'operation': 'explode', 'issue_ids': [1]},
+    {'operation': 'status', 'issue_ids': [1], 'params': {'status': 'done'}},
+    {'operation': 'move_to_ccr', 'issue_ids': [1]},
+    {'operation': 'delete', 'issue_ids': []},
+    {'operation': 'delete', 'issue_ids': ['one']},
+])
+def test_invalid_job_is_400(admin_client, body):
+    assert admin_client.post('/api/admin/jobs', json=body).status_code == 400
+
+def test_jobs_require_admin(client):
+    assert client.post('/api/admin/jobs', json={'operation': 'delete', 'issue_ids': [1]}).status_code == 401
+    assert client.get('/api/admin/jobs/missing').status_code == 401
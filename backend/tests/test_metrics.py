@@ -0,0 +1,28 @@
+import threading
+import metrics
+from app import app
+
+def request_count(snap, endpoint):
+    return sum(count for key_endpoint, _, _, count in snap['statuses'] if key_endpoint == endpoint)
+
+def test_exited_threads_are_folded_into_the_retired_shard():
+    before = request_count(metrics.snapshot(), 'test.endpoint')
+    def record():
+        metrics.get_shard().observe('test.endpoint', 'GET', 200, 0.01, 100)
+    for _ in range(20):
+        thread = threading.Thread(target=record)
+        thread.start()
+        thread.join()
+    
+    snap = metrics.snapshot()
+    assert request_count(snap, 'test.endpoint') == before + 20
+    assert all(thread.is_alive() for thread, _ in metrics._shards)
+    assert len(metrics._shards) <= threading.active_count()
+
+def test_clear_snapshots_without_metrics_dir_leaves_files_alone(tmp_path, monkeypatch):
+    stray = tmp_path / 'settings.json'
+    stray.write_text('{}')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(app.config, 'METRICS_DIR', '')
+    metrics.clear_snapshots()
+    assert stray.exists()
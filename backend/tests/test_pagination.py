@@ -0,0 +1,114 @@
+import pytest
+from app import app, db
+from models import Issue
+from pagination import _encode, decode_cursor
+
+def walk(client, sort, per_page):
+    """Follow next_cursor from the first page to the last; returns the issue IDs in order"""
+    ids, cursor = [], ''
+    while True:
+        response = client.get('/api/issues', query_string={'sort': sort, 'cursor': cursor, 'per_page': per_page})
+        assert response.status_code == 200, response.data
+        ids.extend(issue['id'] for issue in response.json['issues'])
+        cursor = response.json['next_cursor']
+        assert response.json['has_more'] == (cursor is not None)
+        if cursor is None:
+            return ids
+
+@pytest.mark.parametrize('per_page', [1, 3, 7, 50])
+def test_cursor_walk_returns_every_issue_once(client, create_issue, per_page):
+    created = [create_issue(testcase_title=f'Issue {i}')['id'] for i in range(7)]
+    assert walk(client, 'newest', per_page) == sorted(created, reverse=True)
+
+def test_cursor_walk_follows_sort_with_ties(client, create_issue):
+    created = [create_issue(testcase_title=f'Issue {i}')['id'] for i in range(6)]
+    for issue_id, comments in zip(created, [2, 0, 2, 1, 0, 2]):
+        for _ in range(comments):
+            client.post(f'/api/issues/{issue_id}/comments', json={'commenter_name': 'bob', 'content': 'Me too'})
+    
+    ids = walk(client, 'most_discussed', 2)
+    # Comment count first, then newest first among issues with the same count
+    assert ids == [created[5], created[2], created[0], created[3], created[4], created[1]]
+
+def test_cursor_round_trips_sort_values(client, create_issue):
+    for i in range(3):
+        create_issue(testcase_title=f'Issue {i}')
+    cursor = client.get('/api/issues', query_string={'cursor': '', 'per_page': 2}).json['next_cursor']
+    payload = decode_cursor(cursor, 'newest')
+    second = client.get('/api/issues', query_string={'per_page': 2}).json['issues'][1]
+    assert payload['v'] == [second['created_at'], second['id']]
+
+@pytest.mark.parametrize('sort, cursor', [
+    ('newest', 'not-a-cursor!'),
+    ('newest', _encode(['newest'])),
+    ('newest', _encode({'s': 'most_discussed', 'v': [0, '2024-01-01T00:00:00', 1]})),
+    ('newest', _encode({'s': 'newest', 'v': ['2024-01-01T00:00:00']})),
+    ('newest', _encode({'s': 'newest', 'v': ['yesterday', 1]})),
+    ('newest', _encode({'s': 'newest', 'o': 10})),
+    ('newest', _encode({'s': 'newest', 'v': ['2024-01-01T00:00:00', '1 OR 1=1']})),
+    ('newest', _encode({'s': 'newest', 'v': ['2024-01-01T00:00:00', None]})),
+    ('newest', _encode({'s': 'newest', 'v': [12345, 1]})),
+    ('most_discussed', _encode({'s': 'most_discussed', 'v': [True, '2024-01-01T00:00:00', 1]})),
+    ('most_discussed', _encode({'s': 'most_discussed', 'v': [2.5, '2024-01-01T00:00:00', 1]})),
+    ('has_solution', _encode({'s': 'has_solution', 'v': [1, '2024-01-01T00:00:00', 1]})),
+])
+def test_tampered_cursor_is_rejected(client, create_issue, sort, cursor):
+    create_issue()
+    response = client.get('/api/issues', query_string={'sort': sort, 'cursor': cursor})
+    assert response.status_code == 400
+    assert 'cursor' in response.json['error'].lower()
+
+def test_search_rejects_cursor_for_another_sort(client, create_issue):
+    create_issue()
+    cursor = _encode({'s': 'newest', 'v': ['2024-01-01T00:00:00', 1]})
+    response = client.get('/api/search', query_string={'q': 'makefile', 'cursor': cursor})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('size', ['ten', '0', '-5', '1.5'])
+def test_search_rejects_invalid_size(client, size):
+    assert client.get('/api/search', query_string={'size': size}).status_code == 400
+
+@pytest.mark.parametrize('size', ['ten', 0, 2.5, True, [10], {'n': 1}])
+def test_search_post_rejects_invalid_size(client, size):
+    assert client.post('/api/search', json={'size': size}).status_code == 400
+
+def test_search_size_is_clamped(client, create_issue, monkeypatch):
+    monkeypatch.setitem(app.config, 'SEARCH_MAX_SIZE', 2)
+    for i in range(3):
+        create_issue(testcase_title=f'Issue {i}')
+    response = client.post('/api/search', json={'size': '1000'})
+    assert response.status_code == 200
+    assert len(response.json['issues']) == 2
+    assert response.json['has_more']
+
+def test_cursor_walk_over_boolean_sort(client, create_issue):
+    created = [create_issue(testcase_title=f'Makefile issue {i}')['id'] for i in range(5)]
+    for issue_id in created[1::2]:
+        comment = client.post(f'/api/issues/{issue_id}/comments', json={'commenter_name': 'bob', 'content': 'Rebuilt'}).json
+        client.post(f"/api/comments/{comment['id']}/verify")
+    expected = [created[3], created[1], created[4], created[2], created[0]]
+    
+    for per_page in (1, 2, 3):
+        assert walk(client, 'has_solution', per_page) == expected
+    
+    ids, cursor = [], ''
+    while cursor is not None:
+        response = client.get('/api/search', query_string={'q': 'makefile', 'sort': 'has_solution', 'size': 2, 'cursor': cursor})
+        assert response.status_code == 200, response.data
+        ids.extend(issue['id'] for issue in response.json['issues'])
+        cursor = response.json['next_cursor']
+    assert ids == expected
+
+def test_cursor_walk_reaches_rows_without_timestamp(client, create_issue):
+    created = [create_issue(testcase_title=f'Issue {i}')['id'] for i in range(5)]
+    with app.app_context():
+        Issue.query.filter(Issue.id.in_(created[1:3])).update({'created_at': None}, synchronize_session=False)
+        db.session.commit()
+    
+    # NULL timestamps sort after all others in descending order
+    expected = [created[4], created[3], created[0], created[2], created[1]]
+    for per_page in (1, 2, 4):
+        assert walk(client, 'newest', per_page) == expected
+    cursor = _encode({'s': 'newest', 'v': [None, created[2]]})
+    response = client.get('/api/issues', query_string={'cursor': cursor})
+    assert [issue['id'] for issue in response.json['issues']] == [created[1]]
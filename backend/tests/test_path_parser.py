@@ -0,0 +1,38 @@
+import pytest
+from app import app, db
+from models import Issue
+from conftest import ISSUE_PATH
+import backfill_release_platform
+
+@pytest.mark.parametrize('path, expected', [
+    (ISSUE_PATH, ('251', 'lnx86')),
+    ('/lan/fed/etpv5/release/261/rhel7.6/etautotest/a/b', ('261', 'rhel7.6')),
+    ('/lan/fed/etpv5/release/beta/lnx86/etautotest/a', (None, None)),
+    ('/home/alice/release/251/lnx86/etautotest/a', (None, None)),
+    ('', (None, None)),
+    (None, (None, None)),
+])
+def test_parse_testcase_path(path, expected):
+    assert Issue.parse_testcase_path(path) == expected
+
+def stored(issue_id):
+    with app.app_context():
+        issue = Issue.query.get(issue_id)
+        return issue.release, issue.platform, issue.version
+
+def test_backfill_repairs_only_drifted_rows(create_issue, capsys):
+    issues = [create_issue(testcase_title=f'Issue {i}')['id'] for i in range(5)]
+    with app.app_context():
+        Issue.query.filter(Issue.id.in_(issues[1:3])).update({'release': None, 'platform': 'lr'}, synchronize_session=False)
+        db.session.commit()
+    versions = {issue_id: stored(issue_id)[2] for issue_id in issues}
+    
+    backfill_release_platform.backfill(batch_size=2, start_id=0, dry_run=True)
+    assert '2 of 5 issues would be updated' in capsys.readouterr().out
+    assert stored(issues[1])[:2] == (None, 'lr')
+    
+    backfill_release_platform.backfill(batch_size=2, start_id=issues[1], dry_run=False)
+    assert 'Updated 1 of 3 issues' in capsys.readouterr().out
+    assert stored(issues[1])[:2] == (None, 'lr')  # before --start-id
+    assert stored(issues[2]) == ('251', 'lnx86', versions[issues[2]] + 1)
+    assert stored(issues[3])[2] == versions[issues[3]]
@@ -0,0 +1,35 @@
+import pytest
+from flask import request
+from app import app
+from models import Issue
+from query_stats import NPlusOneWarning, count_queries, statement_shape
+
+@app.route('/api/test/n-plus-one')
+def n_plus_one():
+    """Loads issues one by one, as an N+1 would"""
+    return {'titles': [Issue.query.get(int(issue_id)).testcase_title for issue_id in request.args['ids'].split(',')]}
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape('SELECT *\n  FROM tags WHERE id IN (?, ?, ?)') == 'SELECT * FROM tags WHERE id IN (?, ...)'
+    assert statement_shape('SELECT * FROM tags WHERE id IN (%(id_1)s, %(id_2)s)') == 'SELECT * FROM tags WHERE id IN (?, ...)'
+    assert statement_shape('SELECT * FROM tags WHERE id = ?') == 'SELECT * FROM tags WHERE id = ?'
+
+def test_response_headers_report_the_request_queries(client, create_issue, monkeypatch):
+    issue = create_issue()
+    assert 'X-Query-Count' not in client.get(f"/api/issues/{issue['id']}").headers
+    
+    monkeypatch.setitem(app.config, 'SQL_QUERY_STATS', True)
+    with count_queries() as stats:
+        response = client.get('/api/issues', query_string={'per_page': 5})
+    assert int(response.headers['X-Query-Count']) == stats.count
+    assert int(response.headers['X-Query-Max-Repeats']) == stats.max_repeats
+    assert float(response.headers['X-Query-Time-Ms']) >= 0
+
+def test_repeated_statements_warn(client, create_issue, monkeypatch):
+    issue_ids = [create_issue()['id'] for _ in range(3)]
+    monkeypatch.setitem(app.config, 'SQL_QUERY_STATS', True)
+    monkeypatch.setitem(app.config, 'SQL_REPEAT_THRESHOLD', 2)
+    
+    with pytest.warns(NPlusOneWarning, match='3 times'):
+        response = client.get('/api/test/n-plus-one', query_string={'ids': ','.join(map(str, issue_ids))})
+    assert response.headers['X-Query-Max-Repeats'] == '3'
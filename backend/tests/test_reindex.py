@@ -0,0 +1,45 @@
+import importlib
+from app import app, db
+from models import Issue, SearchOutbox
+from indexing import IndexingWorker, get_es_client
+
+def outbox_entries():
+    with app.app_context():
+        return sorted((entry.issue_id, entry.action) for entry in SearchOutbox.query)
+
+def test_rebuild_swaps_the_alias_to_a_new_index(create_issue, monkeypatch):
+    issues = [create_issue(tags=['build']) for _ in range(5)]
+    with app.app_context():
+        IndexingWorker().drain_once()
+    run_reindex = importlib.import_module('run_reindex')
+    alias = app.config['ELASTICSEARCH_INDEX']
+    monkeypatch.setattr(run_reindex, 'versioned_index_name', lambda alias: f'{alias}_rebuilt')
+    
+    assert run_reindex.reindex(chunk_size=2, workers=1, keep_old=False)
+    es = get_es_client()
+    assert list(es.indices.get_alias(name=alias)) == [f'{alias}_rebuilt']
+    assert es.count(index=alias)['count'] == 5
+    assert es.get(index=alias, id=issues[0]['id'])['_source']['tags'] == ['build']
+    assert outbox_entries() == []
+
+def test_only_chunks_changed_after_reading_are_replayed(create_issue, client, admin_client):
+    ids = [create_issue()['id'] for _ in range(6)]
+    run_reindex = importlib.import_module('run_reindex')
+    with app.app_context():
+        SearchOutbox.query.delete()
+        db.session.commit()
+        chunks = []
+        for first_id, last_id in ((ids[0], ids[1]), (ids[2], ids[3]), (ids[4], ids[5])):
+            chunks.append((first_id, last_id) + run_reindex.chunk_fingerprint(first_id, last_id))
+    
+    client.put(f"/api/issues/{ids[0]}", json={'severity': 'Low'})
+    admin_client.delete(f"/api/admin/issues/{ids[3]}")
+    new_id = create_issue()['id']
+    with app.app_context():
+        SearchOutbox.query.delete()
+        db.session.commit()
+        assert run_reindex.replay_changes(chunks) == (4, 1)
+        assert db.session.get(Issue, ids[3]) is None
+    assert outbox_entries() == sorted([
+        (ids[0], 'index'), (ids[1], 'index'), (ids[2], 'index'), (ids[3], 'delete'), (new_id, 'index')
+    ])
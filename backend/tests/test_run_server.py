@@ -0,0 +1,48 @@
+import argparse
+import importlib
+import multiprocessing
+import pytest
+from app import app
+from cache import response_cache
+
+@pytest.fixture
+def run_server(monkeypatch):
+    """Import run_server.py without keeping its side effects (working directory, METRICS_DIR)"""
+    monkeypatch.chdir('.')
+    monkeypatch.setitem(app.config, 'METRICS_DIR', '')
+    monkeypatch.setattr(response_cache, 'ttl_only_reason', None)
+    return importlib.import_module('run_server')
+
+def args(**values):
+    return argparse.Namespace(**dict({'bind': None, 'workers': None, 'threads': None, 'indexer': True}, **values))
+
+def test_options_come_from_config_and_flags(run_server, monkeypatch):
+    monkeypatch.setitem(app.config, 'SERVER_WORKERS', 0)
+    monkeypatch.setitem(app.config, 'SERVER_MAX_REQUESTS', 1000)
+    options = run_server.server_options(args())
+    assert options['workers'] == multiprocessing.cpu_count() * 2 + 1
+    assert (options['threads'], options['worker_class']) == (app.config['SERVER_THREADS'], 'gthread')
+    assert (options['max_requests'], options['max_requests_jitter']) == (1000, 100)
+    assert options['when_ready'] is run_server.start_indexer
+    
+    options = run_server.server_options(args(bind='127.0.0.1:9000', workers=2, threads=1, indexer=False))
+    assert (options['bind'], options['workers'], options['worker_class']) == ('127.0.0.1:9000', 2, 'sync')
+    assert options['when_ready'] is None
+
+def test_gunicorn_application_takes_the_options(run_server):
+    server = run_server.TesterTalkServer(run_server.server_options(args(workers=3, threads=2)))
+    assert (server.cfg.workers, server.cfg.threads, server.cfg.preload_app) == (3, 2, True)
+    assert server.cfg.worker_class_str == 'gthread'
+    assert server.load() is app
+
+def test_several_workers_keep_only_ttl_entries_in_the_memory_cache(run_server, client, create_issue, capsys):
+    issue = create_issue(tags=['ui'])
+    run_server.check_shared_state(4)
+    assert 'CACHE_BACKEND=memory with 4 workers' in capsys.readouterr().err
+    
+    for path in ('/api/builds', '/api/tags', f"/api/issues/{issue['id']}", '/api/facets'):
+        client.get(path)
+    hits = response_cache.stats.hits
+    for path in ('/api/builds', '/api/tags', f"/api/issues/{issue['id']}", '/api/facets'):
+        client.get(path)
+    assert response_cache.stats.hits == hits + 3  # every lookup but the tag list
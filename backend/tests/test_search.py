@@ -0,0 +1,37 @@
+from app import app
+from search import MySQLFullTextBackend
+
+def search_ids(client, **params):
+    response = client.get('/api/search', query_string=dict(params, size=10))
+    assert response.status_code == 200
+    return [issue['id'] for issue in response.json['issues']]
+
+def test_title_matches_rank_above_description_matches(client, create_issue):
+    in_description = create_issue(testcase_title='Build stops early', description='No makefile found')['id']
+    in_title = create_issue(testcase_title='Makefile missing', description='The build stops early')['id']
+    unrelated = create_issue(testcase_title='Crash on start', description='Segfault in the loader')['id']
+    
+    ids = search_ids(client, q='makefile')
+    assert ids == [in_title, in_description]
+    assert unrelated not in search_ids(client, q='make')
+
+def test_every_term_must_match(client, create_issue):
+    both = create_issue(testcase_title='Makefile error on lnx86')['id']
+    create_issue(testcase_title='Makefile error')
+    assert search_ids(client, q='makefile lnx86') == [both]
+
+def test_python_search_ranks_only_the_newest_candidates(client, create_issue, monkeypatch):
+    issue_ids = [create_issue(testcase_title=f'Makefile error {i}')['id'] for i in range(4)]
+    monkeypatch.setitem(app.config, 'SEARCH_PYTHON_MAX_CANDIDATES', 2)
+    assert set(search_ids(client, q='makefile')) == set(issue_ids[2:])
+    
+    page = client.get('/api/search', query_string={'q': 'makefile', 'size': 1, 'count': 'exact'}).json
+    assert (page['total'], page['total_capped'], page['has_more']) == (2, True, True)
+    page = client.get('/api/search', query_string={'q': 'makefile', 'size': 1, 'count': 'exact', 'cursor': page['next_cursor']}).json
+    assert (len(page['issues']), page['has_more']) == (1, False)
+    page = client.get('/api/search', query_string={'q': 'makefile', 'sort': 'newest', 'count': 'exact'}).json
+    assert (page['total'], page['total_capped']) == (4, False)
+
+def test_boolean_query_requires_terms_and_prefixes_the_last():
+    assert MySQLFullTextBackend.boolean_query('makefile not found') == '+makefile +not +found*'
+    assert MySQLFullTextBackend.boolean_query('TC-20250101-AB12 crash') == '+"tc 20250101 ab12" +crash*'
@@ -0,0 +1,69 @@
+import pytest
+from app import app
+from models import Issue, Tag
+from query_stats import count_queries
+from tags import parse_tag_names, resolve_tag_ids
+
+@pytest.fixture
+def tagged_issues(create_issue):
+    """Issue IDs keyed by their tag sets"""
+    tag_sets = [('ui',), ('ui', 'crash'), ('crash',), ('ui', 'crash', 'lnx86'), ()]
+    return {tags: create_issue(testcase_title=f"Issue {' '.join(tags)}", tags=list(tags))['id'] for tags in tag_sets}
+
+def matching_ids(tag_names, match_all):
+    with app.app_context():
+        return {issue.id for issue in Issue.query.filter(Issue.tag_filter(tag_names, match_all=match_all))}
+
+def test_tag_filter_all_and_any(tagged_issues):
+    assert matching_ids(['ui', 'crash'], True) == {tagged_issues[('ui', 'crash')], tagged_issues[('ui', 'crash', 'lnx86')]}
+    assert matching_ids(['ui', 'crash'], False) == {
+        tagged_issues[tags] for tags in tagged_issues if 'ui' in tags or 'crash' in tags
+    }
+    assert matching_ids(['lnx86'], True) == {tagged_issues[('ui', 'crash', 'lnx86')]}
+
+def test_tag_filter_with_unknown_tag(tagged_issues):
+    # A tag nobody uses can never be matched by "all", and adds nothing to "any"
+    assert matching_ids(['ui', 'missing'], True) == set()
+    assert matching_ids(['crash', 'missing'], False) == matching_ids(['crash'], False)
+    assert matching_ids(['missing'], False) == set()
+
+def test_search_endpoint_tag_modes(client, tagged_issues):
+    def search(**params):
+        response = client.get('/api/search', query_string=dict(params, size=50))
+        assert response.status_code == 200
+        return {issue['id'] for issue in response.json['issues']}
+    
+    assert search(tags='ui,crash') == matching_ids(['ui', 'crash'], True)
+    assert search(tags='ui,crash', tag_mode='any') == matching_ids(['ui', 'crash'], False)
+    response = client.post('/api/search', json={'tags': ['crash', 'lnx86'], 'tag_mode': 'all'})
+    assert {issue['id'] for issue in response.json['issues']} == {tagged_issues[('ui', 'crash', 'lnx86')]}
+
+def test_parse_tag_names():
+    assert parse_tag_names(' ui, crash,,ui ') == ['ui', 'crash']
+    assert parse_tag_names(['crash', ' crash', 7]) == ['crash', '7']
+    assert parse_tag_names(None) == []
+
+def test_resolve_creates_missing_tags_once():
+    with app.app_context():
+        with count_queries() as first:
+            created = resolve_tag_ids(['ui', 'crash', 'lnx86'])
+        assert first.count <= 3, first.summary()  # select, insert the missing ones, select again
+        assert {tag.name: tag.id for tag in Tag.query} == created
+        
+        # Known names come from the process cache; only new ones hit the database
+        with count_queries() as cached:
+            assert resolve_tag_ids(['crash', 'ui']) == {'crash': created['crash'], 'ui': created['ui']}
+        assert cached.count == 0
+        with count_queries() as mixed:
+            resolve_tag_ids(['ui', 'new'])
+        assert mixed.count <= 3
+        assert Tag.query.count() == 4
+
+def test_known_tags_cost_no_lookups(client, create_issue):
+    create_issue(tags=['ui', 'crash'])
+    issue = create_issue()
+    with count_queries() as stats:
+        response = client.put(f"/api/issues/{issue['id']}", json={'tags': 'ui, crash, crash'})
+    assert sorted(response.json['tags']) == ['crash', 'ui']
+    # Both names were resolved when the first issue was created: no lookup by name at all
+    assert not [shape for shape in stats.shapes if 'tags.name IN' in shape], stats.shapes
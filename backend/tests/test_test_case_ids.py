@@ -0,0 +1,111 @@
+import re
+import threading
+from app import app, db
+import models  # not `from models import`: pytest would collect the Test* classes
+
+ID_FORMAT = re.compile(r'^TC-\d{8}-[0-9A-Z]{4}$')
+
+def allocate(allocator, count, results):
+    with app.app_context():
+        for _ in range(count):
+            results.append(allocator.allocate())
+
+def test_concurrent_allocators_never_hand_out_the_same_id(monkeypatch):
+    monkeypatch.setitem(app.config, 'TEST_CASE_ID_BLOCK_SIZE', 3)
+    # Two allocators stand in for two server processes sharing the counters
+    allocators = [models.TestCaseIdAllocator(), models.TestCaseIdAllocator()]
+    results = []
+    threads = [
+        threading.Thread(target=allocate, args=(allocators[i % 2], 25, results))
+        for i in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(results) == 150
+    assert len(set(results)) == 150
+    assert all(ID_FORMAT.match(test_case_id) for test_case_id in results)
+
+def test_allocate_many_reserves_one_block():
+    allocator = models.TestCaseIdAllocator()
+    with app.app_context():
+        ids = allocator.allocate_many(50)
+        assert len(set(ids)) == 50
+        assert models.TestCaseIdCounter.query.one().last_value == 50
+
+def test_ids_of_existing_issues_are_skipped(create_issue):
+    existing = create_issue()['test_case_ids']
+    
+    # Counters lost (e.g. issues created before they existed): numbering restarts at 1
+    with app.app_context():
+        models.TestCaseIdCounter.query.delete()
+        db.session.commit()
+        ids = models.TestCaseIdAllocator().allocate_many(5)
+    assert existing not in ids
+    assert len(set(ids)) == 5
+
+def test_ids_listed_with_others_are_skipped(client, create_issue):
+    issue = create_issue()
+    day = issue['test_case_ids'].split('-')[1]
+    block = app.config['TEST_CASE_ID_BLOCK_SIZE']
+    # The next block starts right after the one reserved for the first issue
+    listed = [models.TestCaseIdAllocator.format(day, block + 1), models.TestCaseIdAllocator.format(day, block + 2)]
+    response = client.put(f"/api/issues/{issue['id']}", json={'test_case_ids': f"{issue['test_case_ids']}, {', '.join(listed)}"})
+    assert response.status_code == 200
+    
+    with app.app_context():
+        ids = models.TestCaseIdAllocator().allocate_many(block)
+    assert not set(listed) & set(ids)
+    assert len(ids) == block
+
+def test_issues_may_share_a_test_case_id(client, admin_client, create_issue):
+    first, second, third = create_issue(), create_issue(), create_issue()
+    shared = first['test_case_ids']
+    response = client.put(f"/api/issues/{second['id']}", json={'test_case_ids': f"{second['test_case_ids']}, {shared}", 'severity': 'Low'})
+    assert response.status_code == 200
+    response = admin_client.put(f"/api/admin/issues/{third['id']}/edit", json={'test_case_ids': shared})
+    assert response.status_code == 200
+    
+    response = client.get('/api/issues', query_string={'test_case_id': shared})
+    assert sorted(issue['id'] for issue in response.json['issues']) == [first['id'], second['id'], third['id']]
+
+def test_ids_listed_after_reservation_are_skipped(client, create_issue, caplog):
+    issue = create_issue()
+    day = issue['test_case_ids'].split('-')[1]
+    # The rest of the first issue's block is still held by the allocator; list its next ID elsewhere
+    next_id = models.TestCaseIdAllocator.format(day, 2)
+    client.put(f"/api/issues/{issue['id']}", json={'test_case_ids': f"{issue['test_case_ids']}, {next_id}"})
+    
+    created = create_issue()
+    assert created['test_case_ids'] == models.TestCaseIdAllocator.format(day, 3)
+    assert next_id in caplog.text
+
+def test_format_pads_base36_sequence():
+    assert models.TestCaseIdAllocator.format('20240101', 1) == 'TC-20240101-0001'
+    assert models.TestCaseIdAllocator.format('20240101', 36) == 'TC-20240101-0010'
+
+def filtered_ids(client, test_case_id):
+    response = client.get('/api/issues', query_string={'test_case_id': test_case_id})
+    return [issue['id'] for issue in response.json['issues']]
+
+def test_each_listed_id_finds_the_issue(client, create_issue):
+    issue = create_issue()
+    client.put(f"/api/issues/{issue['id']}", json={'test_case_ids': f"{issue['test_case_ids']}, LEGACY-12 ,LEGACY-7"})
+    for test_case_id in (issue['test_case_ids'], 'LEGACY-12', ' LEGACY-7 '):
+        assert filtered_ids(client, test_case_id) == [issue['id']]
+    # Whole IDs only, not substrings
+    assert filtered_ids(client, 'LEGACY-1') == []
+    
+    client.put(f"/api/issues/{issue['id']}", json={'test_case_ids': 'LEGACY-7'})
+    assert filtered_ids(client, 'LEGACY-12') == []
+    assert filtered_ids(client, 'LEGACY-7') == [issue['id']]
+    with app.app_context():
+        assert [row.test_case_id for row in models.IssueTestCase.query] == ['LEGACY-7']
+
+def test_admin_id_listing_filters_by_test_case_id(admin_client, create_issue):
+    issue = create_issue()
+    create_issue()
+    response = admin_client.get('/api/admin/issues/ids', query_string={'test_case_id': issue['test_case_ids']})
+    assert response.json == {'issue_ids': [issue['id']], 'total': 1}
@@ -0,0 +1,43 @@
+from app import app
+from models import Vote
+
+def vote_rows():
+    with app.app_context():
+        return sorted((vote.target_type, vote.target_id, vote.value) for vote in Vote.query)
+
+def test_repeated_vote_counts_once(client, create_issue):
+    issue = create_issue()
+    for _ in range(3):
+        response = client.post(f"/api/issues/{issue['id']}/upvote")
+        assert response.status_code == 200
+    assert response.json == {'id': issue['id'], 'upvotes': 1, 'downvotes': 0, 'score': 1}
+    assert vote_rows() == [('issue', issue['id'], 1)]
+
+def test_switching_moves_the_vote(client, create_issue):
+    issue = create_issue()
+    client.post(f"/api/issues/{issue['id']}/upvote")
+    response = client.post(f"/api/issues/{issue['id']}/downvote")
+    assert response.json == {'id': issue['id'], 'upvotes': 0, 'downvotes': 1, 'score': -1}
+    response = client.post(f"/api/issues/{issue['id']}/upvote")
+    assert response.json['upvotes'] == 1 and response.json['downvotes'] == 0
+    assert vote_rows() == [('issue', issue['id'], 1)]
+
+def test_each_voter_counts_separately(create_issue):
+    issue = create_issue()
+    voters = [app.test_client() for _ in range(3)]
+    for voter in voters:
+        voter.post(f"/api/issues/{issue['id']}/upvote")
+    response = voters[0].post(f"/api/issues/{issue['id']}/downvote")
+    assert response.json == {'id': issue['id'], 'upvotes': 2, 'downvotes': 1, 'score': 1}
+
+def test_comment_votes_use_their_own_ledger(client, create_issue):
+    issue = create_issue()
+    comment = client.post(f"/api/issues/{issue['id']}/comments", json={'commenter_name': 'bob', 'content': 'Fixed by rebuilding'}).json
+    client.post(f"/api/issues/{issue['id']}/upvote")
+    response = client.post(f"/api/comments/{comment['id']}/downvote")
+    assert response.json == {'id': comment['id'], 'upvotes': 0, 'downvotes': 1, 'score': -1}
+    assert vote_rows() == [('comment', comment['id'], -1), ('issue', issue['id'], 1)]
+
+def test_vote_on_missing_target_is_404(client):
+    assert client.post('/api/issues/999/upvote').status_code == 404
+    assert client.post('/api/comments/999/downvote').status_code == 404
@@ -0,0 +1,182 @@
+"""
+Issue and comment voting.
+
+Every voter (logged-in user, or an anonymous session token) has at most one
+row per target in the votes ledger, enforced by a unique index: repeating a
+vote is a no-op and voting the other way moves the vote across. Counters are
+changed with single `SET upvotes = upvotes + n` statements, so concurrent votes
+never lose updates.
+
+With VOTE_FLUSH_INTERVAL > 0 the counter deltas are buffered in memory and
+applied in batches by a background thread, taking hot issues off the row lock;
+the ledger is still written synchronously.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import uuid
+from flask import session
+from sqlalchemy.exc import IntegrityError
+from app import app, db
+from models import Issue, Comment, Vote
+from cache import invalidate, issue_tag
+
+logger = logging.getLogger(__name__)
+
+VOTE_TARGETS = {'issue': Issue, 'comment': Comment}
+
+def voter_key():
+    """Ledger key for the current request's voter"""
+    if session.get('user_id'):
+        return f"user:{session['user_id']}"
+    if 'voter_id' not in session:
+        session['voter_id'] = uuid.uuid4().hex
+    return f"anon:{session['voter_id']}"
+
+def record_vote(target_type, target_id, voter, value):
+    """
+    Write the vote to the ledger and return the (upvotes, downvotes) delta it
+    causes: (0, 0) for a repeated vote, (+1, -1) or (-1, +1) for a changed one.
+    """
+    try:
+        with db.session.begin_nested():
+            db.session.add(Vote(target_type=target_type, target_id=target_id, voter=voter, value=value))
+        return (1, 0) if value > 0 else (0, 1)
+    except IntegrityError:
+        pass
+    
+    # Conditional update: only one of several concurrent switches succeeds
+    switched = Vote.query.filter(
+        Vote.target_type == target_type, Vote.target_id == target_id,
+        Vote.voter == voter, Vote.value != value
+    ).update({Vote.value: value}, synchronize_session=False)
+    if not switched:
+        return (0, 0)
+    return (1, -1) if value > 0 else (-1, 1)
+
+def apply_vote_deltas(deltas):
+    """
+    Apply counter deltas {(target_type, target_id, issue_id): (up, down)} with one
+    UPDATE per target, in a fixed order to avoid deadlocks. Bumps the versions of
+    the affected issues. Does not commit.
+    """
+    issue_ids = set()
+    for (target_type, target_id, issue_id), (up, down) in sorted(deltas.items()):
+        if not up and not down:
+            continue
+        model = VOTE_TARGETS[target_type]
+        model.query.filter(model.id == target_id).update({
+            model.upvotes: db.func.coalesce(model.upvotes, 0) + up,
+            model.downvotes: db.func.coalesce(model.downvotes, 0) + down
+        }, synchronize_session=False)
+        issue_ids.add(issue_id)
+    if issue_ids:
+        Issue.query.filter(Issue.id.in_(sorted(issue_ids))).update({
+            Issue.version: Issue.version + 1,
+            Issue.updated_at: Issue.updated_at
+        }, synchronize_session=False)
+    return issue_ids
+
+class VoteBuffer(threading.Thread):
+    """Accumulates counter deltas in memory and flushes them every `interval` seconds"""
+    
+    def __init__(self, interval):
+        super().__init__(name='vote-flusher', daemon=True)
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.stop_event = threading.Event()
+    
+    def add(self, key, up, down):
+        with self.lock:
+            current = self.pending.get(key, (0, 0))
+            self.pending[key] = (current[0] + up, current[1] + down)
+    
+    def pending_for(self, key):
+        with self.lock:
+            return self.pending.get(key, (0, 0))
+    
+    def flush(self):
+        with self.lock:
+            deltas, self.pending = self.pending, {}
+        if not deltas:
+            return 0
+        try:
+            with app.app_context():
+                issue_ids = apply_vote_deltas(deltas)
+                db.session.commit()
+        except Exception:
+            logger.exception('Vote flush failed; keeping %d deltas for the next run', len(deltas))
+            for key, (up, down) in deltas.items():
+                self.add(key, up, down)
+            return 0
+        invalidate(*[issue_tag(issue_id) for issue_id in issue_ids])
+        return len(deltas)
+    
+    def stop(self):
+        self.stop_event.set()
+    
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            self.flush()
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+def get_vote_buffer():
+    """Return the process's vote buffer (started on first use), or None when votes are applied immediately"""
+    global _buffer
+    interval = app.config.get('VOTE_FLUSH_INTERVAL', 0)
+    if not interval:
+        return None
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = VoteBuffer(interval)
+                _buffer.start()
+                atexit.register(_buffer.flush)
+    return _buffer
+
+def _reset_after_fork():
+    # The flush thread does not survive fork(); pending deltas stay with the parent
+    global _buffer, _buffer_lock
+    _buffer = None
+    _buffer_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def cast_vote(target_type, target_id, value):
+    """
+    Record a vote by the current voter and return the target's new counts, or
+    None if the target does not exist.
+    """
+    model = VOTE_TARGETS[target_type]
+    parent = Issue.id if target_type == 'issue' else Comment.issue_id
+    row = db.session.query(parent).filter(model.id == target_id).first()
+    if row is None:
+        return None
+    key = (target_type, target_id, row[0])
+    
+    up, down = record_vote(target_type, target_id, voter_key(), value)
+    buffer = get_vote_buffer()
+    if buffer is None:
+        apply_vote_deltas({key: (up, down)})
+        db.session.commit()
+        if up or down:
+            invalidate(issue_tag(row[0]))
+    else:
+        db.session.commit()
+        buffer.add(key, up, down)
+    
+    upvotes, downvotes = db.session.query(model.upvotes, model.downvotes).filter(model.id == target_id).first()
+    if buffer is not None:
+        pending_up, pending_down = buffer.pending_for(key)
+        upvotes, downvotes = (upvotes or 0) + pending_up, (downvotes or 0) + pending_down
+    return {
+        'id': target_id,
+        'upvotes': upvotes or 0,
+        'downvotes': downvotes or 0,
+        'score': (upvotes or 0) - (downvotes or 0)
+    }
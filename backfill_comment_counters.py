@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Backfill/repair script for the comment_count and has_verified_solution columns in issues table
+
+Issues are walked in primary-key ranges (WHERE id > last_id ORDER BY id LIMIT n).
+The rows of a range whose counters drifted are repaired with one
+UPDATE issues SET comment_count = (SELECT COUNT(*) FROM comments WHERE ...)
+statement and one commit per batch, so the counters are computed when the row is
+written and a comment added concurrently is never lost.
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app import app, db
+from models import Issue, Comment
+from indexing import enqueue
+
+def actual_counters():
+    """Correlated subqueries for the comment count and verified solution flag of each issue"""
+    count = db.select(db.func.count(Comment.id)).where(Comment.issue_id == Issue.id).scalar_subquery()
+    verified = db.exists().where(Comment.issue_id == Issue.id, Comment.is_verified_solution.is_(True))
+    return count, verified
+
+def backfill(batch_size, start_id, dry_run):
+    with app.app_context():
+        count, verified = actual_counters()
+        drifted = db.or_(Issue.comment_count != count, Issue.has_verified_solution != verified)
+        
+        last_id = start_id
+        scanned = updated = 0
+        while True:
+            batch = [issue_id for (issue_id,) in db.session.query(Issue.id).filter(
+                Issue.id > last_id
+            ).order_by(Issue.id).limit(batch_size)]
+            if not batch:
+                break
+            first_id, last_id = batch[0], batch[-1]
+            scanned += len(batch)
+            
+            changed = [issue_id for (issue_id,) in db.session.query(Issue.id).filter(
+                Issue.id.between(first_id, last_id), drifted
+            )]
+            if changed and not dry_run:
+                Issue.query.filter(Issue.id.in_(changed)).update({
+                    Issue.comment_count: count,
+                    Issue.has_verified_solution: verified,
+                    Issue.version: Issue.version + 1,
+                    Issue.updated_at: Issue.updated_at  # A repair, not an edit
+                }, synchronize_session=False)
+                enqueue(changed, 'index')
+                db.session.commit()
+            else:
+                db.session.rollback()
+            updated += len(changed)
+            print(f"   {'🔍' if dry_run else '✅'} up to issue {last_id}: {scanned} scanned, {updated} {'to repair' if dry_run else 'repaired'}")
+        
+        if dry_run:
+            print(f"Dry run complete. {updated} of {scanned} issues would be repaired.")
+        else:
+            print(f"Backfill complete. Repaired {updated} of {scanned} issues.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute comment_count and has_verified_solution from the comments table")
+    parser.add_argument('--batch-size', type=int, default=5000, help='issues per batch / transaction')
+    parser.add_argument('--start-id', type=int, default=0, help='resume after this issue ID')
+    parser.add_argument('--dry-run', action='store_true', help='only count the issues that would change')
+    args = parser.parse_args()
+    
+    print("Reconciling comment counters for issues...")
+    backfill(args.batch_size, args.start_id, args.dry_run)
+    print("Done.")
@@ -1,39 +1,66 @@
 #!/usr/bin/env python3
 """
 Backfill script for release and platform columns in issues table
+
+Issues are read in primary-key ranges (WHERE id > last_id ORDER BY id LIMIT n)
+and only rows whose stored values differ from the parsed path are written,
+with one UPDATE ... CASE statement and one commit per batch.
 """
 
 import sys
 import os
-import re
+import argparse
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
 from app import app, db
 from models import Issue
+from indexing import enqueue
 
-def parse_testcase_path(path):
-    if not path:
-        return None, None
-    pattern = r'/lan/fed/etpv5/release/(\d+)/([^/]+)/etautotest/'
-    match = re.match(pattern, path)
-    if match:
-        return match.group(1), match.group(2)
-    return None, None
-
-def backfill():
+def backfill(batch_size, start_id, dry_run):
     with app.app_context():
-        issues = Issue.query.all()
-        updated = 0
-        for issue in issues:
-            release, platform = parse_testcase_path(issue.testcase_path)
-            if release != issue.release or platform != issue.platform:
-                issue.release = release
-                issue.platform = platform
-                updated += 1
-        db.session.commit()
-        print(f"Backfill complete. Updated {updated} issues.")
+        last_id = start_id
+        scanned = updated = 0
+        while True:
+            batch = db.session.query(Issue.id, Issue.testcase_path, Issue.release, Issue.platform).filter(
+                Issue.id > last_id
+            ).order_by(Issue.id).limit(batch_size).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+            scanned += len(batch)
+            
+            changes = {}
+            for issue_id, testcase_path, release, platform in batch:
+                parsed = Issue.parse_testcase_path(testcase_path)
+                if parsed != (release, platform):
+                    changes[issue_id] = parsed
+            
+            if changes and not dry_run:
+                Issue.query.filter(Issue.id.in_(list(changes))).update({
+                    Issue.release: db.case({issue_id: release for issue_id, (release, _) in changes.items()}, value=Issue.id),
+                    Issue.platform: db.case({issue_id: platform for issue_id, (_, platform) in changes.items()}, value=Issue.id),
+                    Issue.version: Issue.version + 1,
+                    Issue.updated_at: Issue.updated_at  # A repair, not an edit
+                }, synchronize_session=False)
+                enqueue(list(changes), 'index')
+                db.session.commit()
+            else:
+                db.session.rollback()
+            updated += len(changes)
+            print(f"   {'🔍' if dry_run else '✅'} up to issue {last_id}: {scanned} scanned, {updated} {'to update' if dry_run else 'updated'}")
+        
+        if dry_run:
+            print(f"Dry run complete. {updated} of {scanned} issues would be updated.")
+        else:
+            print(f"Backfill complete. Updated {updated} of {scanned} issues.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute release and platform from testcase_path")
+    parser.add_argument('--batch-size', type=int, default=5000, help='issues per batch / transaction')
+    parser.add_argument('--start-id', type=int, default=0, help='resume after this issue ID')
+    parser.add_argument('--dry-run', action='store_true', help='only count the issues that would change')
+    args = parser.parse_args()
+    
     print("Backfilling release and platform columns for issues...")
-    backfill()
-    print("Done.") 
\ No newline at end of file
+    backfill(args.batch_size, args.start_id, args.dry_run)
+    print("Done.")
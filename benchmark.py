@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the Tester Talk REST API.
+
+    # 1. Seed the database named by DATABASE_URL (SQLite or MySQL)
+    python benchmark.py seed --issues 100000
+
+    # 2. Drive a mixed workload against a running server (or start one with --serve)
+    python benchmark.py run --serve --concurrency 16 --requests 5000 --output after.json
+
+    # 3. Compare two runs
+    python benchmark.py compare before.json after.json
+
+Seeding and the workload are driven by seeded random generators, so the same
+--seed produces the same data and the same request sequence per worker.
+Seeded rows bypass the search outbox; run run_reindex.py before benchmarking
+with SEARCH_BACKEND=elasticsearch.
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+from datetime import datetime, timedelta
+import requests
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+sys.path.append(BACKEND_DIR)
+
+RELEASES = ['251', '261', '231']
+PLATFORMS = ['lnx86', 'lr', 'rhel7.6', 'centos7.4', 'sles12sp3', 'lop']
+BUILDS = ['Weekly', 'Daily', 'Daily Plus']
+SEVERITIES = (['Low', 'Medium', 'High', 'Critical'], [30, 40, 22, 8])
+STATUSES = (['open', 'in_progress', 'resolved', 'closed', 'ccr'], [50, 15, 25, 8, 2])
+AREAS = ['atpg', 'bist', 'diag', 'compression', 'scan', 'timing', 'power', 'lbist', 'jtag', 'memory', 'analog', 'sim']
+WORDS = [
+    'timeout', 'crash', 'mismatch', 'regression', 'hang', 'segfault', 'license', 'netlist', 'pattern', 'coverage',
+    'fault', 'vector', 'clock', 'reset', 'latch', 'flop', 'chain', 'compare', 'golden', 'log', 'memory', 'leak',
+    'parser', 'syntax', 'warning', 'error', 'assertion', 'threshold', 'performance', 'slow', 'deadlock', 'retry',
+    'checksum', 'diff', 'output', 'missing', 'corrupt', 'unexpected', 'intermittent', 'flaky', 'nightly', 'build'
+]
+TAG_NAMES = ['ui', 'backend', 'regression', 'flaky', 'performance', 'crash', 'license', 'infra', 'parser', 'timing',
+             'memory', 'diag', 'atpg', 'nightly', 'blocker', 'known-issue', 'needs-info', 'duplicate', 'docs', 'tooling']
+REPORTERS = [f'tester{n:02d}' for n in range(40)]
+
+ADMIN_USERNAME = 'bench-admin'
+ADMIN_PASSWORD = 'bench-admin'
+
+# Default share of each operation in the workload (percent)
+DEFAULT_MIX = 'listing=40,search=20,detail=25,vote=10,create=4,bulk_delete=1'
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+def seed_database(issue_count, seed, chunk_size):
+    from app import app, db
+    from models import Issue, IssueTag, IssueTestCase, Comment, Vote, User
+    from tags import resolve_tag_ids
+    
+    rng = random.Random(seed)
+    with app.app_context():
+        db.create_all()
+        tag_ids = resolve_tag_ids(TAG_NAMES)
+        tag_id_list = [tag_ids[name] for name in TAG_NAMES]
+        
+        if not User.query.filter_by(username=ADMIN_USERNAME).first():
+            admin = User(username=ADMIN_USERNAME, email='bench-admin@example.com', role='admin')
+            admin.set_password(ADMIN_PASSWORD)
+            db.session.add(admin)
+            db.session.commit()
+        
+        first_id = (db.session.query(db.func.max(Issue.id)).scalar() or 0) + 1
+        # Issues are spread over the last year in ID order, like real traffic
+        start = datetime.now() - timedelta(days=365)
+        step = timedelta(days=365) / max(issue_count, 1)
+        
+        print(f"🌱 Seeding {issue_count} issues starting at ID {first_id} (seed {seed})")
+        started = time.perf_counter()
+        totals = {'comments': 0, 'votes': 0, 'tags': 0}
+        for chunk_start in range(0, issue_count, chunk_size):
+            issues, test_cases, issue_tags, comments, votes = [], [], [], [], []
+            for offset in range(chunk_start, min(chunk_start + chunk_size, issue_count)):
+                issue_id = first_id + offset
+                created_at = start + step * offset + timedelta(seconds=rng.randint(0, 59))
+                release, platform = rng.choice(RELEASES), rng.choice(PLATFORMS)
+                test_case_id = f'TC-BENCH-{issue_id}'
+                
+                comment_count = rng.choices([0, 1, 2, 3, 5, 8], [35, 25, 15, 12, 8, 5])[0]
+                verified = comment_count > 0 and rng.random() < 0.3
+                for n in range(comment_count):
+                    comments.append({
+                        'issue_id': issue_id,
+                        'commenter_name': rng.choice(REPORTERS),
+                        'content': sentence(rng, rng.randint(8, 40)),
+                        'is_verified_solution': verified and n == comment_count - 1,
+                        'created_at': created_at + timedelta(hours=n + 1),
+                        'updated_at': created_at + timedelta(hours=n + 1),
+                        'upvotes': 0,
+                        'downvotes': 0
+                    })
+                
+                upvotes = downvotes = 0
+                for voter in rng.sample(range(200), rng.choices([0, 1, 2, 5, 12], [40, 25, 15, 12, 8])[0]):
+                    value = 1 if rng.random() < 0.8 else -1
+                    upvotes += value == 1
+                    downvotes += value == -1
+                    votes.append({
+                        'target_type': 'issue', 'target_id': issue_id, 'voter': f'anon:bench-{voter}',
+                        'value': value, 'created_at': created_at, 'updated_at': created_at
+                    })
+                
+                for tag_id in rng.sample(tag_id_list, rng.choices([0, 1, 2, 3, 4], [15, 35, 30, 15, 5])[0]):
+                    issue_tags.append({'issue_id': issue_id, 'tag_id': tag_id})
+                
+                issues.append({
+                    'id': issue_id,
+                    'testcase_title': sentence(rng, rng.randint(4, 10)).capitalize(),
+                    'testcase_path': f'/lan/fed/etpv5/release/{release}/{platform}/etautotest/{rng.choice(AREAS)}/{rng.choice(AREAS)}_{issue_id}',
+                    'severity': rng.choices(*SEVERITIES)[0],
+                    'test_case_ids': test_case_id,
+                    'release': release,
+                    'platform': platform,
+                    'build': rng.choice(BUILDS),
+                    'target': rng.choice(Issue.get_target_options(release) or [None]),
+                    'description': sentence(rng, rng.randint(20, 120)),
+                    'additional_comments': '',
+                    'reporter_name': rng.choice(REPORTERS),
+                    'status': rng.choices(*STATUSES)[0],
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                    'upvotes': upvotes,
+                    'downvotes': downvotes,
+                    'comment_count': comment_count,
+                    'has_verified_solution': verified,
+                    'version': 0
+                })
+                test_cases.append({'issue_id': issue_id, 'test_case_id': test_case_id})
+            
+            db.session.execute(Issue.__table__.insert(), issues)
+            db.session.execute(IssueTestCase.__table__.insert(), test_cases)
+            for table, rows in ((IssueTag.__table__, issue_tags), (Comment.__table__, comments), (Vote.__table__, votes)):
+                if rows:
+                    db.session.execute(table.insert(), rows)
+            db.session.commit()
+            
+            totals['comments'] += len(comments)
+            totals['votes'] += len(votes)
+            totals['tags'] += len(issue_tags)
+            done = min(chunk_start + chunk_size, issue_count)
+            print(f"   {done}/{issue_count} issues ({done / (time.perf_counter() - started):.0f}/s)")
+        
+        print(f"✅ Seeded {issue_count} issues, {totals['comments']} comments, {totals['votes']} votes, {totals['tags']} tag links "
+              f"in {time.perf_counter() - started:.1f}s")
+        print(f"   Admin login for bulk deletes: {ADMIN_USERNAME} / {ADMIN_PASSWORD}")
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+class Workload:
+    """One benchmark worker: its own HTTP session, random generator and delete range"""
+    
+    def __init__(self, api_url, index, workers, seed, id_range, delete_batch):
+        self.api_url = api_url
+        self.rng = random.Random(seed * 1000 + index)
+        self.session = requests.Session()
+        self.min_id, self.max_id = id_range
+        # Each worker deletes its own stripe of the newest issues, so deletes never collide
+        self.delete_ids = list(range(self.max_id - index, self.min_id - 1, -workers))
+        self.delete_batch = delete_batch
+        self.admin_session = None
+    
+    def random_id(self):
+        return self.rng.randint(self.min_id, self.max_id)
+    
+    def listing(self):
+        params = {'page': self.rng.randint(1, 20), 'per_page': 20,
+                  'sort': self.rng.choice(['newest', 'newest', 'most_discussed', 'has_solution'])}
+        if self.rng.random() < 0.5:
+            params['status'] = self.rng.choices(*STATUSES)[0]
+        if self.rng.random() < 0.3:
+            params['release'] = self.rng.choice(RELEASES)
+        if self.rng.random() < 0.2:
+            params['severity'] = self.rng.choices(*SEVERITIES)[0]
+        return self.session.get(f'{self.api_url}/issues', params=params)
+    
+    def search(self):
+        params = {'q': ' '.join(self.rng.sample(WORDS, self.rng.randint(1, 2))), 'size': 20}
+        if self.rng.random() < 0.3:
+            params['tags'] = self.rng.choice(TAG_NAMES)
+        return self.session.get(f'{self.api_url}/search', params=params)
+    
+    def detail(self):
+        return self.session.get(f'{self.api_url}/issues/{self.random_id()}')
+    
+    def vote(self):
+        direction = 'upvote' if self.rng.random() < 0.8 else 'downvote'
+        return self.session.post(f'{self.api_url}/issues/{self.random_id()}/{direction}')
+    
+    def create(self):
+        release, platform = self.rng.choice(RELEASES), self.rng.choice(PLATFORMS)
+        return self.session.post(f'{self.api_url}/issues', json={
+            'testcase_title': sentence(self.rng, 6).capitalize(),
+            'testcase_path': f'/lan/fed/etpv5/release/{release}/{platform}/etautotest/bench/create',
+            'severity': self.rng.choices(*SEVERITIES)[0],
+            'description': sentence(self.rng, 40),
+            'reporter_name': self.rng.choice(REPORTERS),
+            'build': self.rng.choice(BUILDS),
+            'tags': self.rng.sample(TAG_NAMES, 2)
+        })
+    
+    def bulk_delete(self):
+        if self.admin_session is None:
+            self.admin_session = requests.Session()
+            self.admin_session.post(f'{self.api_url}/auth/login',
+                                    json={'username': ADMIN_USERNAME, 'password': ADMIN_PASSWORD}).raise_for_status()
+        batch, self.delete_ids = self.delete_ids[:self.delete_batch], self.delete_ids[self.delete_batch:]
+        return self.admin_session.post(f'{self.api_url}/admin/issues/bulk-delete', json={'issue_ids': batch})
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in ('listing', 'search', 'detail', 'vote', 'create', 'bulk_delete'):
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}'")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+def detect_id_range(api_url):
+    """Lowest and highest issue ID, from the oldest and newest issue of the listing"""
+    response = requests.get(f'{api_url}/issues', params={'per_page': 1, 'sort': 'newest'})
+    response.raise_for_status()
+    data = response.json()
+    if not data['issues']:
+        raise SystemExit("❌ No issues found; run `python benchmark.py seed` first.")
+    max_id = data['issues'][0]['id']
+    last_page = requests.get(f'{api_url}/issues', params={'per_page': 1, 'page': data['pages']}).json()
+    return last_page['issues'][0]['id'], max_id
+
+def run_benchmark(api_url, args):
+    mix = parse_mix(args.mix)
+    id_range = detect_id_range(api_url)
+    operations, weights = list(mix), list(mix.values())
+    per_worker = [args.requests // args.concurrency + (i < args.requests % args.concurrency) for i in range(args.concurrency)]
+    workloads = [Workload(api_url, i, args.concurrency, args.seed, id_range, args.delete_batch) for i in range(args.concurrency)]
+    samples = [[] for _ in workloads]  # (operation, status, seconds) per worker
+    
+    def worker(index):
+        workload, results = workloads[index], samples[index]
+        for _ in range(per_worker[index]):
+            operation = workload.rng.choices(operations, weights)[0]
+            started = time.perf_counter()
+            try:
+                status = getattr(workload, operation)().status_code
+            except requests.RequestException as e:
+                status = type(e).__name__
+            results.append((operation, status, time.perf_counter() - started))
+    
+    print(f"🏁 {args.requests} requests, {args.concurrency} concurrent clients, issue IDs {id_range[0]}-{id_range[1]}")
+    print(f"   Mix: {', '.join(f'{name}={weight:g}' for name, weight in mix.items())}")
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    report = {
+        'label': args.label,
+        'started_at': datetime.now().isoformat(),
+        'url': api_url,
+        'seed': args.seed,
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'mix': mix,
+        'id_range': list(id_range),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(args.requests / elapsed, 1),
+        'operations': {}
+    }
+    for operation in operations:
+        results = [sample for worker_samples in samples for sample in worker_samples if sample[0] == operation]
+        latencies = sorted(seconds * 1000 for _, _, seconds in results)
+        statuses = {}
+        for _, status, _ in results:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 500)
+        report['operations'][operation] = {
+            'count': len(results),
+            'errors': errors,
+            'statuses': statuses,
+            'throughput_rps': round(len(results) / elapsed, 1),
+            'mean_ms': round(sum(latencies) / len(latencies), 2) if latencies else None,
+            'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+            'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+            'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+            'max_ms': round(latencies[-1], 2) if latencies else None
+        }
+    return report
+
+def print_report(report):
+    print(f"\n{'operation':<12} {'count':>7} {'errors':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    print("-" * 76)
+    for operation, stats in report['operations'].items():
+        if not stats['count']:
+            continue
+        print(f"{operation:<12} {stats['count']:>7} {stats['errors']:>6} {stats['throughput_rps']:>8} "
+              f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9} {stats['max_ms']:>9}")
+    print("-" * 76)
+    print(f"Total: {report['requests']} requests in {report['elapsed_s']}s ({report['throughput_rps']} req/s)")
+
+def start_server(port, workers):
+    """Start run_server.py against the current DATABASE_URL and wait until it answers"""
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'run_server.py'),
+         '--bind', f'127.0.0.1:{port}', '--workers', str(workers)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    for _ in range(60):
+        try:
+            requests.get(f'http://127.0.0.1:{port}/api/health', timeout=1)
+            return server
+        except requests.RequestException:
+            time.sleep(0.5)
+    server.terminate()
+    raise SystemExit("❌ Server did not start; check run_server.py and DATABASE_URL.")
+
+def compare_reports(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    
+    def change(old, new):
+        if old is None or new is None:
+            return '-'
+        return f"{old} → {new} ({(new - old) / old * 100:+.1f}%)" if old else f"{old} → {new}"
+    
+    print(f"Comparing {before.get('label') or before_path} → {after.get('label') or after_path}")
+    print(f"Throughput: {change(before['throughput_rps'], after['throughput_rps'])} req/s")
+    for operation, new in after['operations'].items():
+        old = before['operations'].get(operation)
+        if not old or not new['count']:
+            continue
+        print(f"\n{operation}:")
+        for metric in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms'):
+            print(f"   {metric:<15} {change(old[metric], new[metric])}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed data and run load benchmarks against the REST API")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    seed_parser = commands.add_parser('seed', help='add benchmark issues to the database in DATABASE_URL')
+    seed_parser.add_argument('--issues', type=int, default=10000, help='issues to create (e.g. 10000, 100000, 1000000)')
+    seed_parser.add_argument('--seed', type=int, default=42, help='random seed')
+    seed_parser.add_argument('--chunk-size', type=int, default=5000, help='issues per insert transaction')
+    
+    run_parser = commands.add_parser('run', help='drive a mixed workload and report latencies')
+    run_parser.add_argument('--url', default='http://127.0.0.1:8080', help='server base URL')
+    run_parser.add_argument('--serve', action='store_true', help='start run_server.py for the run (uses DATABASE_URL)')
+    run_parser.add_argument('--port', type=int, default=8090, help='port for --serve')
+    run_parser.add_argument('--server-workers', type=int, default=4, help='worker processes for --serve')
+    run_parser.add_argument('--requests', type=int, default=2000, help='total requests')
+    run_parser.add_argument('--concurrency', type=int, default=8, help='concurrent clients')
+    run_parser.add_argument('--mix', default=DEFAULT_MIX, help=f'operation weights (default: {DEFAULT_MIX})')
+    run_parser.add_argument('--delete-batch', type=int, default=10, help='issues per bulk delete request')
+    run_parser.add_argument('--seed', type=int, default=42, help='random seed for the request sequence')
+    run_parser.add_argument('--label', default='', help='name for this run in the JSON output')
+    run_parser.add_argument('--output', help='write the JSON report to this file')
+    
+    compare_parser = commands.add_parser('compare', help='compare two JSON reports')
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'seed':
+        seed_database(args.issues, args.seed, args.chunk_size)
+    elif args.command == 'compare':
+        compare_reports(args.before, args.after)
+    else:
+        server = start_server(args.port, args.server_workers) if args.serve else None
+        base_url = f'http://127.0.0.1:{args.port}' if args.serve else args.url.rstrip('/')
+        try:
+            report = run_benchmark(base_url + '/api', args)
+        finally:
+            if server:
+                server.terminate()
+                server.wait()
+        print_report(report)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"📄 Report written to {args.output}")
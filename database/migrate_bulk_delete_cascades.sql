@@ -0,0 +1,15 @@
+-- Migration for set-based bulk deletes
+-- Bulk delete removes issues with plain DELETE statements and relies on these
+-- ON DELETE CASCADE foreign keys (already present in schema.sql) for the child rows.
+-- Only needed for databases created without them, e.g. by db.create_all() on an older release.
+
+USE testing_platform;
+
+SELECT TABLE_NAME, CONSTRAINT_NAME, DELETE_RULE
+FROM INFORMATION_SCHEMA.REFERENTIAL_CONSTRAINTS
+WHERE CONSTRAINT_SCHEMA = 'testing_platform'
+  AND TABLE_NAME IN ('comments', 'attachments', 'issue_tags', 'issue_test_cases');
+
+-- For every row above whose DELETE_RULE is not CASCADE, recreate the constraint, e.g.:
+-- ALTER TABLE comments DROP FOREIGN KEY comments_ibfk_1;
+-- ALTER TABLE comments ADD CONSTRAINT comments_ibfk_1 FOREIGN KEY (issue_id) REFERENCES issues(id) ON DELETE CASCADE;
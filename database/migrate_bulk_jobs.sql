@@ -0,0 +1,23 @@
+-- Migration to keep bulk job progress in the database, so any server process can report it
+
+USE testing_platform;
+
+CREATE TABLE IF NOT EXISTS bulk_jobs (
+    id VARCHAR(32) PRIMARY KEY,
+    operation VARCHAR(20) NOT NULL,
+    params TEXT,
+    status ENUM('queued', 'running', 'completed', 'failed') NOT NULL DEFAULT 'queued',
+    total INT NOT NULL DEFAULT 0,
+    processed INT NOT NULL DEFAULT 0,
+    affected INT NOT NULL DEFAULT 0,
+    failed INT NOT NULL DEFAULT 0,
+    failed_issue_ids TEXT,
+    errors TEXT,
+    created_at DATETIME,
+    started_at DATETIME,
+    finished_at DATETIME,
+    INDEX ix_bulk_jobs_created_at (created_at)
+);
+
+-- Show the new table structure
+DESCRIBE bulk_jobs;
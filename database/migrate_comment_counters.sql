@@ -0,0 +1,27 @@
+-- Migration to add denormalized comment counters to issues table
+-- Run backfill_comment_counters.py afterwards to reconcile any drift
+
+USE testing_platform;
+
+-- Number of comments on the issue
+ALTER TABLE issues ADD COLUMN comment_count INT NOT NULL DEFAULT 0 COMMENT 'Maintained by the comment routes';
+
+-- Whether one of the issue's comments is marked as the verified solution
+ALTER TABLE issues ADD COLUMN has_verified_solution BOOLEAN NOT NULL DEFAULT FALSE COMMENT 'Maintained by the comment routes';
+
+-- Initial population from the comments table
+UPDATE issues i
+LEFT JOIN (
+    SELECT issue_id, COUNT(*) AS cnt, MAX(is_verified_solution) AS verified
+    FROM comments
+    GROUP BY issue_id
+) c ON c.issue_id = i.id
+SET i.comment_count = COALESCE(c.cnt, 0),
+    i.has_verified_solution = COALESCE(c.verified, FALSE);
+
+-- Indexes for sorting by "most discussed" and "has a solution"
+CREATE INDEX idx_issues_comment_count ON issues(comment_count, created_at);
+CREATE INDEX idx_issues_has_verified_solution ON issues(has_verified_solution, created_at);
+
+-- Show the updated table structure
+DESCRIBE issues;
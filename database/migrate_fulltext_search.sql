@@ -0,0 +1,9 @@
+-- Migration to add the FULLTEXT index used by /api/search
+-- Replaces the leading-wildcard LIKE scans over testcase_title, description and test_case_ids
+
+USE testing_platform;
+
+ALTER TABLE issues ADD FULLTEXT INDEX ft_issues_search (testcase_title, description, test_case_ids);
+
+-- Show the indexes on the issues table
+SHOW INDEX FROM issues;
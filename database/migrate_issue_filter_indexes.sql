@@ -0,0 +1,26 @@
+-- Migration adding composite indexes for the issue filter + sort patterns
+-- Each index is (equality filter columns..., created_at); InnoDB appends the primary key,
+-- so WHERE <filters> ORDER BY created_at DESC, id DESC is a range scan without a filesort.
+-- The most_discussed and has_solution sorts use idx_issues_comment_count and
+-- idx_issues_has_verified_solution (migrate_comment_counters.sql).
+-- Check the result with: python audit_query_plans.py
+
+USE testing_platform;
+
+CREATE INDEX ix_issues_status_created_at ON issues(status, created_at);
+CREATE INDEX ix_issues_status_severity_created_at ON issues(status, severity, created_at);
+CREATE INDEX ix_issues_severity_created_at ON issues(severity, created_at);
+CREATE INDEX ix_issues_release_platform_created_at ON issues(`release`, platform, created_at);
+CREATE INDEX ix_issues_release_target_created_at ON issues(`release`, target, created_at);
+CREATE INDEX ix_issues_platform_created_at ON issues(platform, created_at);
+CREATE INDEX ix_issues_build_created_at ON issues(build, created_at);
+CREATE INDEX ix_issues_target_created_at ON issues(target, created_at);
+CREATE INDEX ix_issues_reporter_name_created_at ON issues(reporter_name, created_at);
+
+-- Keep idx_issues_release, idx_issues_platform, idx_issues_release_platform (run_migration.py)
+-- and idx_issues_build, idx_issues_target (migrate_build_target.sql): with the appended primary
+-- key they are covering indexes for /api/admin/issues/ids (WHERE <filter> ORDER BY id), which
+-- the audit shows as a full table scan without them.
+
+-- Show the indexes on the issues table
+SHOW INDEX FROM issues;
@@ -0,0 +1,9 @@
+-- Migration to add the (tag_id, issue_id) index used by the /api/search tag filter
+-- The primary key (issue_id, tag_id) only serves lookups by issue
+
+USE testing_platform;
+
+ALTER TABLE issue_tags ADD INDEX ix_issue_tags_tag_id_issue_id (tag_id, issue_id);
+
+-- Show the indexes
+SHOW INDEX FROM issue_tags;
@@ -0,0 +1,15 @@
+-- Migration to add the normalized issue_test_cases table (one row per test case ID of an issue)
+-- Populate it afterwards with: python migrate_issue_test_cases.py
+
+USE testing_platform;
+
+CREATE TABLE IF NOT EXISTS issue_test_cases (
+    issue_id INT NOT NULL,
+    test_case_id VARCHAR(200) NOT NULL,
+    PRIMARY KEY (issue_id, test_case_id),
+    INDEX ix_issue_test_cases_test_case_id (test_case_id, issue_id),
+    FOREIGN KEY (issue_id) REFERENCES issues(id) ON DELETE CASCADE
+);
+
+-- Show the new table structure
+DESCRIBE issue_test_cases;
@@ -0,0 +1,9 @@
+-- Migration to add the issue version counter used for ETags
+-- Incremented by the application on every change to an issue, its comments or attachments
+
+USE testing_platform;
+
+ALTER TABLE issues ADD COLUMN version INT NOT NULL DEFAULT 0 COMMENT 'Maintained by the application';
+
+-- Show the updated table structure
+DESCRIBE issues;
@@ -0,0 +1,9 @@
+-- Migration to support keyset pagination on /api/issues and /api/search
+-- InnoDB secondary indexes include the primary key, so this covers ORDER BY created_at DESC, id DESC
+
+USE testing_platform;
+
+CREATE INDEX ix_issues_created_at ON issues(created_at);
+
+-- Show the indexes on the issues table
+SHOW INDEX FROM issues;
@@ -0,0 +1,18 @@
+-- Migration to add the search outbox table drained by the Elasticsearch indexing worker
+
+USE testing_platform;
+
+CREATE TABLE IF NOT EXISTS search_outbox (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    issue_id INT NOT NULL,
+    action ENUM('index', 'delete') NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at DATETIME NOT NULL,
+    last_error TEXT,
+    created_at DATETIME,
+    INDEX ix_search_outbox_issue_id (issue_id),
+    INDEX ix_search_outbox_next_attempt_at (next_attempt_at)
+);
+
+-- Show the new table structure
+DESCRIBE search_outbox;
@@ -0,0 +1,15 @@
+-- Migration for the counter-based test case ID allocator
+-- Replaces the random suffix + LIKE '%...%' existence check in create_issue
+
+USE testing_platform;
+
+CREATE TABLE IF NOT EXISTS test_case_id_counters (
+    day VARCHAR(8) PRIMARY KEY,
+    last_value INT NOT NULL DEFAULT 0
+);
+
+-- IDs already taken by older issues are skipped through the
+-- issue_test_cases (test_case_id, issue_id) index (migrate_issue_test_cases.sql)
+
+-- Show the new table structure
+DESCRIBE test_case_id_counters;
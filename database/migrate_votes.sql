@@ -0,0 +1,17 @@
+-- Migration to add the vote ledger (one vote per voter and issue/comment)
+
+USE testing_platform;
+
+CREATE TABLE IF NOT EXISTS votes (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    target_type ENUM('issue', 'comment') NOT NULL,
+    target_id INT NOT NULL,
+    voter VARCHAR(64) NOT NULL,
+    value SMALLINT NOT NULL,
+    created_at DATETIME,
+    updated_at DATETIME,
+    UNIQUE KEY uq_votes_target_voter (target_type, target_id, voter)
+);
+
+-- Show the new table structure
+DESCRIBE votes;
@@ -245,56 +245,87 @@ async function deleteIssue(issueId) {
     }
 }
 
-async function bulkDeleteIssues() {
+// Issue IDs matching the bulk operation filters
+async function getBulkIssueIds() {
     const status = document.getElementById('bulk-status-filter').value;
     const severity = document.getElementById('bulk-severity-filter').value;
     
-    if (!confirm('Are you sure you want to delete all issues matching the selected filters?')) {
-        return;
-    }
+    let url = '/api/admin/issues/ids';
+    const params = new URLSearchParams();
+    if (status) params.append('status', status);
+    if (severity) params.append('severity', severity);
+    if (params.toString()) url += '?' + params.toString();
     
+    const response = await fetch(url, {
+        credentials: 'include'
+    });
+    if (!response.ok) {
+        throw new Error('Failed to get issue IDs');
+    }
+    const data = await response.json();
+    return data.issue_ids;
+}
+
+// Start a background bulk job and report its progress until it finishes
+async function runBulkJob(operation, params) {
+    const progress = document.getElementById('bulk-issues-list');
     try {
-        // Get issue IDs that match the filters
-        let url = '/api/admin/issues/ids';
-        const params = new URLSearchParams();
-        if (status) params.append('status', status);
-        if (severity) params.append('severity', severity);
-        if (params.toString()) url += '?' + params.toString();
+        const issueIds = await getBulkIssueIds();
+        if (issueIds.length === 0) {
+            alert('No issues found matching the selected filters');
+            return;
+        }
         
-        const response = await fetch(url, {
-            credentials: 'include'
+        const response = await fetch('/api/admin/jobs', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            credentials: 'include',
+            body: JSON.stringify({ operation: operation, issue_ids: issueIds, params: params })
         });
+        let job = await response.json();
+        if (!response.ok) {
+            alert(job.error || 'Failed to start bulk operation');
+            return;
+        }
         
-        if (response.ok) {
-            const data = await response.json();
-            
-            if (data.issue_ids.length === 0) {
-                alert('No issues found matching the selected filters');
-                return;
-            }
-            
-            // Delete the issues
-            const deleteResponse = await fetch('/api/admin/issues/bulk-delete', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                credentials: 'include',
-                body: JSON.stringify({ issue_ids: data.issue_ids })
+        while (job.status === 'queued' || job.status === 'running') {
+            progress.textContent = `${operation}: ${job.processed} / ${job.total} issues (${Math.round(job.progress * 100)}%)`;
+            await new Promise(resolve => setTimeout(resolve, 1000));
+            const jobResponse = await fetch(`/api/admin/jobs/${job.id}`, {
+                credentials: 'include'
             });
-            
-            if (deleteResponse.ok) {
-                const result = await deleteResponse.json();
-                alert(`Successfully deleted ${result.deleted_count} issues`);
-                loadIssuesForAdmin(); // Reload table
-            } else {
-                alert('Failed to delete issues');
+            if (!jobResponse.ok) {
+                throw new Error('Lost track of the bulk job');
             }
+            job = await jobResponse.json();
+        }
+        
+        progress.textContent = `${operation}: ${job.affected} issues updated, ${job.failed} failed`;
+        if (job.failed) {
+            alert(`Bulk ${operation} finished with ${job.failed} failed issues`);
         } else {
-            alert('Failed to get issue IDs');
+            alert(`Bulk ${operation} completed for ${job.affected} issues`);
         }
+        loadIssuesForAdmin(); // Reload table
     } catch (error) {
-        console.error('Error in bulk delete:', error);
-        alert('Error performing bulk delete');
+        console.error(`Error in bulk ${operation}:`, error);
+        alert(`Error performing bulk ${operation}`);
+    }
+}
+
+async function bulkDeleteIssues() {
+    if (!confirm('Are you sure you want to delete all issues matching the selected filters?')) {
+        return;
+    }
+    await runBulkJob('delete', {});
+}
+
+async function bulkChangeStatus() {
+    const newStatus = document.getElementById('bulk-new-status').value;
+    if (!confirm(`Change the status of all issues matching the selected filters to "${newStatus}"?`)) {
+        return;
     }
+    await runBulkJob('status', { status: newStatus });
 }
 
 function editIssue(issueId) {
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Populate issue_test_cases from the comma separated issues.test_case_ids column.
+
+Issues are read in primary-key batches (WHERE id > last_id ORDER BY id LIMIT n),
+so memory stays flat and each batch is its own short transaction. Every batch
+replaces the rows of its issues, so the script can be rerun or resumed safely.
+Several issues may list the same test case ID; each of them gets its row.
+"""
+
+import sys
+import os
+import argparse
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app import app, db
+from models import Issue, IssueTestCase
+
+def migrate(batch_size, start_id):
+    with app.app_context():
+        IssueTestCase.__table__.create(db.engine, checkfirst=True)
+        
+        issue_test_cases = IssueTestCase.__table__
+        last_id = start_id
+        issues = rows = 0
+        start = time.monotonic()
+        while True:
+            batch = db.session.query(Issue.id, Issue.test_case_ids).filter(
+                Issue.id > last_id
+            ).order_by(Issue.id).limit(batch_size).all()
+            if not batch:
+                break
+            
+            first_id, last_id = batch[0][0], batch[-1][0]
+            values = [
+                {'issue_id': issue_id, 'test_case_id': test_case_id}
+                for issue_id, test_case_ids in batch
+                for test_case_id in Issue.split_test_case_ids(test_case_ids)
+            ]
+            db.session.execute(issue_test_cases.delete().where(issue_test_cases.c.issue_id.between(first_id, last_id)))
+            if values:
+                db.session.execute(issue_test_cases.insert(), values)
+            db.session.commit()
+            
+            issues += len(batch)
+            rows += len(values)
+            print(f"   ✅ up to issue {last_id}: {issues} issues, {rows} test case rows ({issues / (time.monotonic() - start):.0f} issues/s)")
+        
+        print(f"\n🎉 Migrated {issues} issues into {rows} issue_test_cases rows")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Split issues.test_case_ids into the issue_test_cases table")
+    parser.add_argument('--batch-size', type=int, default=5000, help='issues per batch / transaction')
+    parser.add_argument('--start-id', type=int, default=0, help='resume after this issue ID')
+    args = parser.parse_args()
+    
+    print("Migrating test case IDs to issue_test_cases...")
+    print("=" * 60)
+    migrate(args.batch_size, args.start_id)
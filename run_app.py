@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
-Simple script to run the Tester Talk application
+Simple script to run the Tester Talk application with the development server.
+Use run_server.py for production (pre-forked worker processes).
 """
 
 import os
@@ -24,4 +25,8 @@ if __name__ == '__main__':
     print("\nPress Ctrl+C to stop the server")
     print("-" * 50)
     
+    # Drain the search outbox in the background when Elasticsearch is configured
+    from indexing import start_indexing_worker
+    start_indexing_worker()
+    
     app.run(debug=True, host='0.0.0.0', port=8080, use_reloader=False) 
\ No newline at end of file
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Run the Elasticsearch indexing worker in the foreground.
+Use this instead of the in-process worker when running several app processes.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app import app
+from indexing import IndexingWorker, indexing_enabled
+
+if __name__ == "__main__":
+    if not indexing_enabled():
+        print("❌ ELASTICSEARCH_URL is not set, nothing to index.")
+        sys.exit(1)
+    
+    print(f"🔄 Draining search outbox into {app.config['ELASTICSEARCH_URL']} (index: {app.config['ELASTICSEARCH_INDEX']})")
+    print("Press Ctrl+C to stop")
+    worker = IndexingWorker()
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+        print("\nStopped.")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Rebuild the Elasticsearch index from the issues, tags and comments tables.
+
+Issues are streamed in primary-key order through a server-side cursor and split
+into chunks; documents for each chunk are built in a process pool and written
+to a fresh index, which then replaces the old one behind the ELASTICSEARCH_INDEX
+alias in a single atomic alias update. Issues whose version changed while the
+rebuild was running are queued for reindexing afterwards; only a count and a
+version sum per chunk are kept for that, so memory does not grow with the table.
+"""
+
+import sys
+import os
+import argparse
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app import app, db
+from models import Issue, Comment, IssueTag, Tag
+from indexing import INDEX_MAPPING, get_es_client, issue_document, enqueue, versioned_index_name
+from sqlalchemy import select
+
+ISSUE_COLUMNS = [
+    Issue.id, Issue.testcase_title, Issue.testcase_path, Issue.severity, Issue.test_case_ids,
+    Issue.release, Issue.platform, Issue.build, Issue.target, Issue.description,
+    Issue.additional_comments, Issue.reporter_name, Issue.status, Issue.comment_count,
+    Issue.has_verified_solution, Issue.created_at, Issue.version
+]
+
+def stream_chunks(chunk_size):
+    """
+    Yield (issue rows, tag rows, comment rows) per chunk of issues in primary-key order.
+    Issues come from one server-side cursor; tags and comments for each chunk are
+    fetched by ID range on a second connection.
+    """
+    with db.engine.connect() as stream_conn, db.engine.connect() as lookup_conn:
+        result = stream_conn.execution_options(stream_results=True).execute(
+            select(*ISSUE_COLUMNS).order_by(Issue.id)
+        )
+        for rows in result.partitions(chunk_size):
+            issues = [dict(row._mapping) for row in rows]
+            first_id, last_id = issues[0]['id'], issues[-1]['id']
+            tags = lookup_conn.execute(
+                select(IssueTag.issue_id, Tag.name).join(Tag, Tag.id == IssueTag.tag_id)
+                .where(IssueTag.issue_id.between(first_id, last_id))
+            ).all()
+            comments = lookup_conn.execute(
+                select(Comment.issue_id, Comment.content)
+                .where(Comment.issue_id.between(first_id, last_id)).order_by(Comment.id)
+            ).all()
+            yield issues, [tuple(row) for row in tags], [tuple(row) for row in comments]
+
+def build_operations(index_name, issues, tags, comments):
+    """Build bulk index operations for one chunk (runs in a worker process)"""
+    tag_names = {issue['id']: [] for issue in issues}
+    for issue_id, name in tags:
+        tag_names[issue_id].append(name)
+    comment_contents = {issue['id']: [] for issue in issues}
+    for issue_id, content in comments:
+        comment_contents[issue_id].append(content)
+    
+    operations = []
+    for issue in issues:
+        operations.append({'index': {'_index': index_name, '_id': issue['id']}})
+        operations.append(issue_document(SimpleNamespace(**issue), tag_names[issue['id']], comment_contents[issue['id']]))
+    return operations
+
+def chunk_fingerprint(first_id, last_id):
+    """(row count, version sum) of the issues in an ID range"""
+    count, version_sum = db.session.query(db.func.count(Issue.id), db.func.sum(Issue.version)).filter(
+        Issue.id.between(first_id, last_id)
+    ).one()
+    return count, int(version_sum or 0)
+
+def replay_changes(chunks):
+    """
+    Queue the issues that changed after their chunk was read, comparing each chunk's
+    (first ID, last ID, count, version sum) with the table now. Versions only grow and
+    new issues get higher IDs, so an unchanged fingerprint means an unchanged chunk.
+    Returns (issues queued for indexing, IDs queued for deletion).
+    """
+    queued = deleted = 0
+    for first_id, last_id, count, version_sum in chunks:
+        current = chunk_fingerprint(first_id, last_id)
+        if current == (count, version_sum):
+            continue
+        ids = [issue_id for (issue_id,) in db.session.query(Issue.id).filter(Issue.id.between(first_id, last_id))]
+        enqueue(ids, 'index')
+        queued += len(ids)
+        if current[0] < count:
+            # Some were deleted; IDs that were never indexed just get a 404 from the outbox worker
+            existing = set(ids)
+            missing = [issue_id for issue_id in range(first_id, last_id + 1) if issue_id not in existing]
+            enqueue(missing, 'delete')
+            deleted += len(missing)
+        db.session.commit()
+    
+    # Issues created during the rebuild
+    last_id = chunks[-1][1] if chunks else 0
+    new_ids = [issue_id for (issue_id,) in db.session.query(Issue.id).filter(Issue.id > last_id).order_by(Issue.id)]
+    enqueue(new_ids, 'index')
+    db.session.commit()
+    return queued + len(new_ids), deleted
+
+def send_bulk(client, operations):
+    """Send one bulk request and return the number of failed items"""
+    response = client.bulk(body=operations)
+    if not response.get('errors'):
+        return 0
+    return sum(1 for item in response['items'] if next(iter(item.values())).get('status', 200) >= 300)
+
+def reindex(chunk_size, workers, keep_old):
+    with app.app_context():
+        client = get_es_client()
+        if client is None:
+            print("❌ ELASTICSEARCH_URL is not set")
+            return False
+        
+        alias = app.config['ELASTICSEARCH_INDEX']
+        if client.indices.exists(index=alias) and not client.indices.exists_alias(name=alias):
+            print(f"❌ '{alias}' is a concrete index, not an alias. Delete or rename it before reindexing.")
+            return False
+        
+        new_index = versioned_index_name(alias)
+        body = dict(INDEX_MAPPING, settings={'index': {'refresh_interval': '-1', 'number_of_replicas': 0}})
+        client.indices.create(index=new_index, body=body)
+        print(f"📝 Created index '{new_index}'")
+        
+        start = time.monotonic()
+        chunks = []  # (first ID, last ID, count, version sum) of every chunk written to the new index
+        indexed = failed = 0
+        
+        # Keep a bounded number of chunks in flight so memory stays flat
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Fork the workers now, before stream_chunks opens its connections, so none inherits a socket
+            list(executor.map(abs, range(workers)))
+            pending = deque()
+            for issues, tags, comments in stream_chunks(chunk_size):
+                chunks.append((issues[0]['id'], issues[-1]['id'], len(issues), sum(issue['version'] for issue in issues)))
+                pending.append((len(issues), executor.submit(build_operations, new_index, issues, tags, comments)))
+                while len(pending) >= workers * 2:
+                    count, future = pending.popleft()
+                    failed += send_bulk(client, future.result())
+                    indexed += count
+                    print(f"   ✅ {indexed} issues indexed ({indexed / (time.monotonic() - start):.0f}/s)")
+            while pending:
+                count, future = pending.popleft()
+                failed += send_bulk(client, future.result())
+                indexed += count
+        
+        if failed:
+            print(f"❌ {failed} documents failed to index; '{alias}' was left unchanged")
+            client.indices.delete(index=new_index)
+            return False
+        
+        client.indices.put_settings(index=new_index, body={'index': {'refresh_interval': '1s', 'number_of_replicas': 1}})
+        client.indices.refresh(index=new_index)
+        
+        # Swap the alias in one request so searches never see a partial index
+        old_indices = list(client.indices.get_alias(name=alias)) if client.indices.exists_alias(name=alias) else []
+        actions = [{'remove': {'index': index, 'alias': alias}} for index in old_indices]
+        actions.append({'add': {'index': new_index, 'alias': alias}})
+        client.indices.update_aliases(body={'actions': actions})
+        print(f"🔀 Alias '{alias}' now points to '{new_index}'")
+        
+        # Replay changes made while the rebuild was running; the outbox worker
+        # wrote those to the old index. Every change to an issue, its tags,
+        # comments or vote counters bumps Issue.version, so compare versions
+        # rather than timestamps.
+        queued, deleted = replay_changes(chunks)
+        print(f"🔁 Queued {queued} issues and {deleted} deleted IDs for replay")
+        
+        if not keep_old:
+            for index in old_indices:
+                client.indices.delete(index=index)
+                print(f"🗑️  Deleted old index '{index}'")
+        
+        print(f"\n🎉 Reindexed {indexed} issues in {time.monotonic() - start:.1f}s")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the search index from the database")
+    parser.add_argument('--chunk-size', type=int, default=2000, help='issues per chunk / bulk request')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='document builder processes')
+    parser.add_argument('--keep-old', action='store_true', help='keep the previous index after the alias swap')
+    args = parser.parse_args()
+    
+    print("Rebuilding search index...")
+    print("=" * 60)
+    success = reindex(args.chunk_size, args.workers, args.keep_old)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Run Tester Talk under gunicorn: a master process that pre-forks worker processes.
+
+The app is imported once in the master so workers share its memory
+copy-on-write. Connection pools, background threads and reserved test case ID
+blocks are not inherited: the master drops its pooled connections before each
+fork and every worker opens its own. The search outbox is drained by a single
+run_indexer.py process that the master starts and stops with the server
+(--no-indexer when it runs elsewhere).
+
+Send SIGHUP to the master for a graceful reload of the workers. Code changes
+need SIGUSR2 followed by SIGQUIT on the old master, because the app is preloaded.
+"""
+
+import os
+import sys
+import argparse
+import multiprocessing
+import subprocess
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Add the backend directory to the Python path
+backend_dir = os.path.join(ROOT_DIR, 'backend')
+sys.path.insert(0, backend_dir)
+
+# Change to backend directory
+os.chdir(backend_dir)
+
+from gunicorn.app.base import BaseApplication
+from app import app, db
+from cache import LRUCache, response_cache
+
+# Workers share request metrics through snapshot files
+if not app.config['METRICS_DIR']:
+    app.config['METRICS_DIR'] = tempfile.mkdtemp(prefix='tester-talk-metrics-')
+
+def on_starting(server):
+    from metrics import clear_snapshots
+    clear_snapshots()
+
+def pre_fork(server, worker):
+    # Pooled connections must not be shared with the child; close them in the master first
+    db.engine.dispose()
+
+_indexer = None
+
+def start_indexer(server):
+    """Run the one search indexer for all workers as a child process of the master"""
+    global _indexer
+    from indexing import indexing_enabled
+    if indexing_enabled():
+        _indexer = subprocess.Popen([sys.executable, os.path.join(ROOT_DIR, 'run_indexer.py')])
+        server.log.info('Started search indexer (pid: %s)', _indexer.pid)
+
+def stop_indexer(server):
+    if _indexer is not None and _indexer.poll() is None:
+        _indexer.terminate()
+        _indexer.wait()
+
+def check_shared_state(workers):
+    """Warn loudly about settings that only work within a single process"""
+    backend = app.config.get('CACHE_BACKEND', 'memory')
+    if workers > 1 and backend != 'redis':
+        message = (
+            f"CACHE_BACKEND={backend} with {workers} workers: the response cache is per process, "
+            "so only entries that expire by TTL (builds, targets, facets, issue details) are cached and other "
+            "reads hit the database. Set CACHE_BACKEND=redis to share the whole cache."
+        )
+        print("=" * 80 + f"\n⚠️  {message}\n" + "=" * 80, file=sys.stderr)
+    if workers > 1 and isinstance(response_cache, LRUCache):
+        # Other workers would never see this worker's invalidations
+        response_cache.ttl_only('CACHE_BACKEND=memory cannot be invalidated across worker processes')
+
+def server_options(args):
+    """gunicorn settings from the SERVER_* config, overridden by command line flags"""
+    workers = args.workers or app.config['SERVER_WORKERS'] or multiprocessing.cpu_count() * 2 + 1
+    threads = args.threads or app.config['SERVER_THREADS']
+    options = {
+        'bind': args.bind or app.config['SERVER_BIND'],
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': True,  # the app is already imported here; workers inherit it
+        'keepalive': app.config['SERVER_KEEPALIVE'],
+        'timeout': app.config['SERVER_TIMEOUT'],
+        'graceful_timeout': app.config['SERVER_GRACEFUL_TIMEOUT'],
+        'max_requests': app.config['SERVER_MAX_REQUESTS'],
+        'max_requests_jitter': app.config['SERVER_MAX_REQUESTS'] // 10,
+        'pidfile': app.config['SERVER_PIDFILE'] or None,
+        'accesslog': '-',
+        'on_starting': on_starting,
+        'pre_fork': pre_fork,
+        'when_ready': start_indexer if args.indexer else None,
+        'on_exit': stop_indexer,
+    }
+    return options
+
+class TesterTalkServer(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+    
+    def load_config(self):
+        for key, value in self.options.items():
+            if value is not None:
+                self.cfg.set(key, value)
+    
+    def load(self):
+        return app
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run Tester Talk with pre-forked gunicorn workers")
+    parser.add_argument('--bind', help='address to listen on (default: SERVER_BIND)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: SERVER_WORKERS)')
+    parser.add_argument('--threads', type=int, help='request threads per worker (default: SERVER_THREADS)')
+    parser.add_argument('--no-indexer', dest='indexer', action='store_false', help='do not start the search indexer (run run_indexer.py elsewhere)')
+    args = parser.parse_args()
+    
+    options = server_options(args)
+    check_shared_state(options['workers'])
+    print(f"🚀 Starting Tester Talk on {options['bind']} with {options['workers']} workers x {options['threads']} threads")
+    TesterTalkServer(options).run()